@@ -0,0 +1,26 @@
+from core.llm.main_client import chat as main_chat, chat_stream as main_chat_stream
+from core.llm.prompts import Prompt
+from core.turn import TurnContext
+from core.utils.json_stream import JsonArrayStream
+
+async def generate(ctx: TurnContext | None, key: str, prompt: Prompt, user: str, **kwargs) -> str:
+    # With a streaming turn, forward tokens as they are generated, and each
+    # element of the `key` array (bullet / ranked item) as soon as it closes.
+    if ctx is not None and ctx.streaming:
+        items = JsonArrayStream(key)
+
+        def on_delta(text: str):
+            ctx.emit("delta", {"text": text})
+            for item in items.feed(text):
+                ctx.emit("item", {"key": key, "value": item})
+
+        kwargs.pop("cache", None)  # streamed replies are never cached
+        return await main_chat_stream(system=prompt.system, user=user, on_delta=on_delta, **kwargs)
+    return await main_chat(system=prompt.system, user=user, **kwargs)
+
+async def regenerate(ctx: TurnContext | None, key: str, prompt: Prompt, user: str, **kwargs) -> str:
+    # Second attempt after an unusable reply. A streaming client is told to
+    # drop the `key` items it already got before the retry streams its own.
+    if ctx is not None and ctx.streaming:
+        ctx.emit("reset", {"key": key})
+    return await generate(ctx, key, prompt, user, cache=False, **kwargs)
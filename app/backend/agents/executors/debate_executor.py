@@ -1,19 +1,34 @@
-from pathlib import Path
 from typing import Dict, Any, List
 from core.schemas import Event, Column, Fallacy, Score
 from agents.tools.fallacies import detect_fallacies
 from agents.tools.scoring import score_claim   # <-- use as backup scorer
-from core.llm.main_client import chat as main_chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
+from core.turn import TurnContext
+from agents.executors.common import generate, regenerate
+from core.utils.scheduler import StepGraph
 from agents.tools.research import gather_sources, classify_sources
 from core.utils.utils import format_bullets, format_ranked, format_fallacies, json_load_safe as _json_load
 
-_EVAL_PROMPT = Path("prompts/evaluation.txt").read_text(encoding="utf-8")
-_OBJ_PROMPT  = Path("prompts/objections.txt").read_text(encoding="utf-8")
-
-def do_fallacy_check_if_needed(claim: str, need: bool) -> List[Fallacy]:
-    return [Fallacy(**f) for f in detect_fallacies(claim)] if need else []
-
-def _coerce_eval_data(raw_out: str, claim: str) -> tuple[list, dict]:
+_EVAL_PROMPT = register(
+    "debate_evaluate",
+    "You provide critique and a strength score. JSON only. Respond as JSON: "
+    "{\"bullets\": [\"...\"], \"score\": {\"value\": 0-100, \"reasons\": [\"...\"]}}",
+    "evaluation.txt", site="executor")
+_OBJ_PROMPT = register(
+    "debate_objections",
+    "You produce ranked counter-arguments. JSON only. Respond as JSON: "
+    "{\"ranked\": [{\"title\": \"...\", \"why\": \"...\"}, ...]}",
+    "objections.txt", site="executor")
+
+async def do_fallacy_check_if_needed(claim: str, need: bool, ctx: TurnContext | None = None) -> List[Fallacy]:
+    if not need:
+        return []
+    found = await (ctx or TurnContext()).once("fallacies", claim, detect_fallacies, claim)
+    return [Fallacy(**f) for f in found]
+
+async def _coerce_eval_data(raw_out: str, claim: str, ctx: TurnContext | None = None) -> tuple[list, dict]:
     """Parse model JSON; on failure retry outside; here just best-effort coerce."""
     data = _json_load(raw_out) or {}
     bullets = data.get("bullets") if isinstance(data, dict) else None
@@ -29,8 +44,10 @@ def _coerce_eval_data(raw_out: str, claim: str) -> tuple[list, dict]:
     if not (isinstance(score_obj, dict) and "value" in score_obj):
         # robust backup
         try:
-            s = score_claim(claim)  # expected to return {"value": int, "reasons": [str,...]}
-            score_obj = s if isinstance(s, dict) else {"value": 0, "reasons": ["backup"]}
+            s = await (ctx or TurnContext()).once("score", claim, score_claim, claim)  # {"bullets": [...], "score": {...}}
+            score_obj = s.get("score") if isinstance(s, dict) else None
+            if not isinstance(score_obj, dict):
+                score_obj = {"value": 0, "reasons": ["backup"]}
         except Exception:
             score_obj = {"value": 0, "reasons": ["backup"]}
     # ensure reasons list
@@ -38,31 +55,51 @@ def _coerce_eval_data(raw_out: str, claim: str) -> tuple[list, dict]:
         score_obj["reasons"] = [str(score_obj.get("reasons", "backup"))]
     return bullets, score_obj
 
-def execute(intent: str, claim: str, need_fallacy: bool) -> Dict[str, Any]:
-    fallacies_models = do_fallacy_check_if_needed(claim, need_fallacy)
+async def _research(claim: str, ctx: TurnContext | None = None) -> list:
+    sources = await gather_sources(claim, max_results=8)
+    return await classify_sources(claim, sources) if sources else []
+
+async def _evaluate(claim: str, ctx: TurnContext | None = None) -> tuple[list, dict]:
+    user = _EVAL_PROMPT.user(CLAIM=claim)
+    out = await generate(ctx, "bullets", _EVAL_PROMPT, user, temperature=0.2, max_tokens=900)
+    data = _json_load(out)
+
+    # retry once if bad JSON
+    if not (isinstance(data, dict) and "score" in data and "bullets" in data):
+        parse_failed(_EVAL_PROMPT.site)
+        out_retry = await regenerate(ctx, "bullets", _EVAL_PROMPT, user, temperature=0.0, max_tokens=900)
+        return await _coerce_eval_data(out_retry or out, claim, ctx)
+    return data.get("bullets") or [], data.get("score") or {"value": 0, "reasons": ["backup"]}
+
+async def _objections(claim: str, ctx: TurnContext | None = None) -> list:
+    out = await generate(ctx, "ranked", _OBJ_PROMPT, _OBJ_PROMPT.user(CLAIM=claim), temperature=0.3, max_tokens=900)
+    data = _json_load(out)
+    if not isinstance(data, dict):
+        parse_failed(_OBJ_PROMPT.site)
+        data = {}
+    return data.get("ranked", []) or []
+
+_WORK = {"research": _research, "evaluate_argument": _evaluate}
+
+@traced("executor")
+async def execute(intent: str, claim: str, need_fallacy: bool, ctx: TurnContext | None = None) -> Dict[str, Any]:
+    # The fallacy check and the main generation are independent LLM calls.
+    graph = StepGraph()
+    graph.add("fallacies", lambda _: do_fallacy_check_if_needed(claim, need_fallacy, ctx))
+    graph.add("work", lambda _: _WORK.get(intent, _objections)(claim, ctx))
+    done = await graph.run()
+    fallacies_models, work = done["fallacies"], done["work"]
 
     events: List[Event] = []
     chat_reply = ""
     score: Score | None = None
 
     if intent == "research":
-        sources = gather_sources(claim, max_results=8)
-        classified = classify_sources(claim, sources) if sources else []
         chat_reply = "I've gathered relevant sources and summarized them."
-        events.append(Event(column=Column.SOURCES, payload={"added": classified}))
+        events.append(Event(column=Column.SOURCES, payload={"added": work}))
 
     elif intent == "evaluate_argument":
-        sys = "You provide critique and a strength score. JSON only. Respond as JSON: {\"bullets\": [\"...\"], \"score\": {\"value\": 0-100, \"reasons\": [\"...\"]}}"
-        out = main_chat(system=sys, user=_EVAL_PROMPT + f"\n\nCLAIM:\n{claim}", temperature=0.2, max_tokens=900)
-        data = _json_load(out)
-
-        # retry once if bad JSON
-        if not (isinstance(data, dict) and "score" in data and "bullets" in data):
-            out_retry = main_chat(system=sys, user=_EVAL_PROMPT + f"\n\nCLAIM:\n{claim}", temperature=0.0, max_tokens=900)
-            bullets, score_obj = _coerce_eval_data(out_retry or out, claim)
-        else:
-            bullets = data.get("bullets") or []
-            score_obj = data.get("score") or {"value": 0, "reasons": ["backup"]}
+        bullets, score_obj = work
 
         critique_text  = format_bullets(bullets)
         fallacies_text = format_fallacies(fallacies_models)
@@ -82,10 +119,7 @@ def execute(intent: str, claim: str, need_fallacy: bool) -> Dict[str, Any]:
         chat_reply = "I've provided a concise critique in the CON column."
 
     else:  # give_objections
-        sys = "You produce ranked counter-arguments. JSON only. Respond as JSON: {\"ranked\": [{\"title\": \"...\", \"why\": \"...\"}, ...]}"
-        out = main_chat(system=sys, user=_OBJ_PROMPT + f"\n\nCLAIM:\n{claim}", temperature=0.3, max_tokens=900)
-        data = _json_load(out) or {}
-        ranked = data.get("ranked", []) or []
+        ranked = work
 
         counters_text  = format_ranked(ranked).strip()
         fallacies_text = format_fallacies(fallacies_models)
@@ -101,5 +135,6 @@ def execute(intent: str, claim: str, need_fallacy: bool) -> Dict[str, Any]:
         "chat_reply": chat_reply,
         "events": events,
         "score": score,
-        "fallacies": [f.model_dump() for f in fallacies_models] if fallacies_models else []
+        "fallacies": [f.model_dump() for f in fallacies_models] if fallacies_models else [],
+        "timings": graph.report(),
     }
@@ -1,19 +1,34 @@
-from pathlib import Path
 from typing import Dict, Any, List
 from core.schemas import Event, Column, Fallacy, Score
 from agents.tools.fallacies import detect_fallacies
 from agents.tools.scoring import score_claim  # backup scorer
 from agents.tools.research import gather_sources, classify_sources
-from core.llm.main_client import chat as main_chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
+from core.turn import TurnContext
+from agents.executors.common import generate, regenerate
+from core.utils.scheduler import StepGraph
 from core.utils.utils import format_bullets, format_ranked, format_fallacies, json_load_safe as _json_load
 
-_EVAL_PROMPT = Path("prompts/impression.txt").read_text(encoding="utf-8")
-_OBJ_PROMPT  = Path("prompts/pitch_objections.txt").read_text(encoding="utf-8")
-
-def do_fallacy_check_if_needed(text: str, need: bool) -> List[Fallacy]:
-    return [Fallacy(**f) for f in detect_fallacies(text)] if need else []
-
-def _coerce_eval_data(raw_out: str, text: str) -> tuple[list, dict]:
+_EVAL_PROMPT = register(
+    "pitch_impression",
+    "You critique a pitch harshly. JSON only. Respond as JSON: "
+    "{\"bullets\": [\"...\"], \"score\": {\"value\": 0-100, \"reasons\": [\"...\"]}}",
+    "impression.txt", site="executor")
+_OBJ_PROMPT = register(
+    "pitch_objections",
+    "You produce ranked objections. JSON only. Respond as JSON: "
+    "{\"ranked\": [{\"title\": \"...\", \"why\": \"...\"}]}",
+    "pitch_objections.txt", site="executor")
+
+async def do_fallacy_check_if_needed(text: str, need: bool, ctx: TurnContext | None = None) -> List[Fallacy]:
+    if not need:
+        return []
+    found = await (ctx or TurnContext()).once("fallacies", text, detect_fallacies, text)
+    return [Fallacy(**f) for f in found]
+
+async def _coerce_eval_data(raw_out: str, text: str, ctx: TurnContext | None = None) -> tuple[list, dict]:
     data = _json_load(raw_out) or {}
     bullets = data.get("bullets") if isinstance(data, dict) else None
     score_obj = data.get("score") if isinstance(data, dict) else None
@@ -23,38 +38,61 @@ def _coerce_eval_data(raw_out: str, text: str) -> tuple[list, dict]:
             bullets = ["No structured critique returned; using fallback."]
     if not (isinstance(score_obj, dict) and "value" in score_obj):
         try:
-            s = score_claim(text)
-            score_obj = s if isinstance(s, dict) else {"value": 0, "reasons": ["backup"]}
+            s = await (ctx or TurnContext()).once("score", text, score_claim, text)  # {"bullets": [...], "score": {...}}
+            score_obj = s.get("score") if isinstance(s, dict) else None
+            if not isinstance(score_obj, dict):
+                score_obj = {"value": 0, "reasons": ["backup"]}
         except Exception:
             score_obj = {"value": 0, "reasons": ["backup"]}
     if not isinstance(score_obj.get("reasons"), list):
         score_obj["reasons"] = [str(score_obj.get("reasons", "backup"))]
     return bullets, score_obj
 
-def execute(intent: str, pitch_text: str, need_fallacy: bool, do_research: bool = False) -> Dict[str, Any]:
-    fallacies_models = do_fallacy_check_if_needed(pitch_text, need_fallacy)
+async def _research(pitch_text: str, ctx: TurnContext | None = None) -> list:
+    sources = await gather_sources(pitch_text, max_results=8)
+    return await classify_sources(pitch_text, sources) if sources else []
+
+async def _impression(pitch_text: str, ctx: TurnContext | None = None) -> tuple[list, dict]:
+    user = _EVAL_PROMPT.user(PITCH=pitch_text)
+    out = await generate(ctx, "bullets", _EVAL_PROMPT, user, temperature=0.5, max_tokens=900)
+    data = _json_load(out)
+
+    if not (isinstance(data, dict) and "score" in data and "bullets" in data):
+        parse_failed(_EVAL_PROMPT.site)
+        out_retry = await regenerate(ctx, "bullets", _EVAL_PROMPT, user, temperature=0.0, max_tokens=900)
+        return await _coerce_eval_data(out_retry or out, pitch_text, ctx)
+    return data.get("bullets") or [], data.get("score") or {"value": 0, "reasons": ["backup"]}
+
+async def _objections(pitch_text: str, ctx: TurnContext | None = None) -> list:
+    out = await generate(ctx, "ranked", _OBJ_PROMPT, _OBJ_PROMPT.user(CLAIM=pitch_text), temperature=0.7,
+                         max_tokens=900)
+    data = _json_load(out)
+    if not isinstance(data, dict):
+        parse_failed(_OBJ_PROMPT.site)
+        data = {}
+    return data.get("ranked", []) or []
+
+_WORK = {"research": _research, "ruthless_impression": _impression}
+
+@traced("executor")
+async def execute(intent: str, pitch_text: str, need_fallacy: bool, do_research: bool = False,
+                  ctx: TurnContext | None = None) -> Dict[str, Any]:
+    graph = StepGraph()
+    graph.add("fallacies", lambda _: do_fallacy_check_if_needed(pitch_text, need_fallacy, ctx))
+    graph.add("work", lambda _: _WORK.get(intent, _objections)(pitch_text, ctx))
+    done = await graph.run()
+    fallacies_models, work = done["fallacies"], done["work"]
 
     events: List[Event] = []
     chat_reply = ""
     score: Score | None = None
 
     if intent == "research":
-        sources = gather_sources(pitch_text, max_results=8)
-        classified = classify_sources(pitch_text, sources) if sources else []
         chat_reply = "I've gathered neutral sources and summarized them."
-        events.append(Event(column=Column.SOURCES, payload={"added": classified}))
+        events.append(Event(column=Column.SOURCES, payload={"added": work}))
 
     elif intent == "ruthless_impression":
-        sys = "You critique a pitch harshly. JSON only. Respond as JSON: {\"bullets\": [\"...\"], \"score\": {\"value\": 0-100, \"reasons\": [\"...\"]}}"
-        out = main_chat(system=sys, user=_EVAL_PROMPT + f"\n\nPITCH:\n{pitch_text}", temperature=0.5, max_tokens=900)
-        data = _json_load(out)
-
-        if not (isinstance(data, dict) and "score" in data and "bullets" in data):
-            out_retry = main_chat(system=sys, user=_EVAL_PROMPT + f"\n\nPITCH:\n{pitch_text}", temperature=0.0, max_tokens=900)
-            bullets, score_obj = _coerce_eval_data(out_retry or out, pitch_text)
-        else:
-            bullets = data.get("bullets") or []
-            score_obj = data.get("score") or {"value": 0, "reasons": ["backup"]}
+        bullets, score_obj = work
 
         critique_text  = format_bullets(bullets)
         fallacies_text = format_fallacies(fallacies_models)
@@ -74,10 +112,7 @@ def execute(intent: str, pitch_text: str, need_fallacy: bool, do_research: bool
         chat_reply = "First impression added."
 
     else:  # objections
-        sys = "You produce ranked objections. JSON only. Respond as JSON: {\"ranked\": [{\"title\": \"...\", \"why\": \"...\"}]}"
-        out = main_chat(system=sys, user=_OBJ_PROMPT + f"\n\nCLAIM:\n{pitch_text}", temperature=0.7, max_tokens=900)
-        data = _json_load(out) or {}
-        ranked = data.get("ranked", []) or []
+        ranked = work
 
         con_text = format_ranked(ranked).strip() or "- No objections were generated."
         fallacies_text = format_fallacies(fallacies_models)
@@ -91,5 +126,6 @@ def execute(intent: str, pitch_text: str, need_fallacy: bool, do_research: bool
         "chat_reply": chat_reply,
         "events": events,
         "score": score,
-        "fallacies": [f.model_dump() for f in fallacies_models] if fallacies_models else []
+        "fallacies": [f.model_dump() for f in fallacies_models] if fallacies_models else [],
+        "timings": graph.report(),
     }
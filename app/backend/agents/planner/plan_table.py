@@ -0,0 +1,67 @@
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+from core.schemas import Intent, Mode
+from agents.supervisor.policies import require_fallacy_first, only_one_executor
+
+# Declarative plans for RUN_PIPELINE. The plan is almost fully determined by
+# (mode, intent); `when` narrows a rule to specific session flag values.
+# supervisor_agent.decide consults this table first and only asks the LLM
+# planner for combinations it does not cover.
+
+class PlanRule(NamedTuple):
+    mode: Mode
+    intent: Intent
+    steps: List[str]
+    when: Mapping[str, object] = MappingProxyType({})  # read-only: the default is shared by every rule
+
+PLAN_RULES: List[PlanRule] = [
+    PlanRule(Mode.debate_counter, Intent.evaluate_argument,
+             ["FALLACY_CHECK", "EXECUTOR:evaluate_argument", "SCORE", "SUGGEST_NEXT"]),
+    PlanRule(Mode.debate_counter, Intent.give_objections,
+             ["FALLACY_CHECK", "EXECUTOR:give_objections", "SUGGEST_NEXT"]),
+    PlanRule(Mode.debate_counter, Intent.research,
+             ["EXECUTOR:research", "SUGGEST_NEXT"]),
+    PlanRule(Mode.pitch_objections, Intent.evaluate_argument,
+             ["FALLACY_CHECK", "EXECUTOR:ruthless_impression", "SCORE", "SUGGEST_NEXT"]),
+    PlanRule(Mode.pitch_objections, Intent.give_objections,
+             ["FALLACY_CHECK", "EXECUTOR:objections", "SUGGEST_NEXT"]),
+    PlanRule(Mode.pitch_objections, Intent.research,
+             ["EXECUTOR:research", "SUGGEST_NEXT"]),
+]
+
+_PLAIN_STEPS = {"FALLACY_CHECK", "SCORE", "SUGGEST_NEXT"}
+_EXECUTORS = {
+    Mode.debate_counter: {"evaluate_argument", "give_objections", "research"},
+    Mode.pitch_objections: {"ruthless_impression", "objections", "research"},
+}
+
+def _validate(rule: PlanRule) -> None:
+    where = f"plan rule ({rule.mode.value}, {rule.intent.value}, {rule.when})"
+    for s in rule.steps:
+        if s in _PLAIN_STEPS:
+            continue
+        if not (s.startswith("EXECUTOR:") and s.split(":", 1)[1] in _EXECUTORS[rule.mode]):
+            raise ValueError(f"{where}: unknown step {s!r}")
+    if sum(s.startswith("EXECUTOR:") for s in rule.steps) != 1:
+        raise ValueError(f"{where}: needs exactly one EXECUTOR step")
+    # the table must already satisfy the guardrails the LLM plan is forced through
+    if only_one_executor(require_fallacy_first(list(rule.steps), rule.intent)) != rule.steps:
+        raise ValueError(f"{where}: violates plan policies")
+
+def compile_plan_table(rules: List[PlanRule]) -> Dict[Tuple[str, str], List[PlanRule]]:
+    table: Dict[Tuple[str, str], List[PlanRule]] = {}
+    for rule in rules:
+        _validate(rule)
+        table.setdefault((rule.mode.value, rule.intent.value), []).append(rule)
+    # most specific `when` first so a flag-specific rule shadows the default
+    for bucket in table.values():
+        bucket.sort(key=lambda r: -len(r.when))
+    return table
+
+_TABLE = compile_plan_table(PLAN_RULES)
+
+def lookup_plan(mode: str, intent: str, flags: dict) -> Optional[List[str]]:
+    for rule in _TABLE.get((mode, intent), ()):
+        if all(flags.get(k) == v for k, v in rule.when.items()):
+            return list(rule.steps)
+    return None
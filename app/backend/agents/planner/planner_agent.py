@@ -1,18 +1,15 @@
 import json
-from pathlib import Path
 from core.llm.main_client import chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
 
-_PLANNER_PROMPT = Path("prompts/planner.txt").read_text(encoding="utf-8")
+_PROMPT = register("planner", "You are PLANNER. Return JSON ONLY.", "planner.txt")
 
-def plan_steps(mode: str, intent: str, flags: dict) -> list[str]:
-    sys = "You are PLANNER. Return JSON ONLY."
-    user = f"""{_PLANNER_PROMPT}
-
-MODE: {mode}
-INTENT: {intent}
-FLAGS: {json.dumps(flags)}
-"""
-    out = chat(system=sys, user=user, temperature=0.0, max_tokens=200)
+@traced("planner")
+async def plan_steps(mode: str, intent: str, flags: dict) -> list[str]:
+    user = _PROMPT.user(MODE=mode, INTENT=intent, FLAGS=json.dumps(flags))
+    out = await chat(system=_PROMPT.system, user=user, temperature=0.0, max_tokens=200, site=_PROMPT.site)
     try:
         data = json.loads(out)
         steps = data.get("plan_steps", [])
@@ -20,5 +17,6 @@ FLAGS: {json.dumps(flags)}
             return steps
     except Exception:
         pass
+    parse_failed(_PROMPT.site)
     # Safe minimal default if planner failed (still LLM-first design elsewhere)
     return ["EXECUTOR:offer_actions"]
@@ -1,23 +1,41 @@
 import json
-from pathlib import Path
 from core.llm.main_client import chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
 from agents.triage.triage_agent import classify_intent
 from agents.planner.planner_agent import plan_steps
+from agents.planner.plan_table import lookup_plan
 from agents.tools.parsing import extract_claim_or_empty
 from core.schemas import Intent, Mode
+from core.turn import TurnContext
 from agents.supervisor.policies import require_fallacy_first, only_one_executor
 
-_PROMPT = Path("prompts/supervisor.txt").read_text(encoding="utf-8")
+_PROMPT = register("supervisor", "You are Supervisor. Output JSON command ONLY.", "supervisor.txt")
 
-def decide(mode: Mode, last_user_text: str, session_flags: dict) -> dict:
+async def advisory_claim(tri: dict, last_user_text: str, ctx: TurnContext) -> dict:
+    # Try to extract (LLM). This is only advisory; chat_loop already does authoritative
+    # extraction of the same text, so within a turn this shares its result.
+    if not tri.get("has_new_claim"):
+        return {}
+    return await ctx.once("extract", last_user_text, extract_claim_or_empty, last_user_text)
+
+@traced("decide")
+async def decide(mode: Mode, last_user_text: str, session_flags: dict,
+                 tri: dict | None = None, claim: dict | None = None,
+                 ctx: TurnContext | None = None) -> dict:
+    """`tri` / `claim` may be precomputed by the caller's step graph, which
+    runs them alongside chat_loop's own extraction instead of after it."""
+    ctx = ctx or TurnContext()
 
     # TRIAGE (LLM)
-    tri = classify_intent(mode.value, last_user_text)
+    if tri is None:
+        tri = await ctx.once("triage", (mode.value, last_user_text), classify_intent, mode.value, last_user_text)
     intent = tri.get("intent","none")
     has_new_claim = bool(tri.get("has_new_claim", False))
 
-    # Try to extract (LLM). This is only advisory; chat_loop already does authoritative extraction.
-    claim = extract_claim_or_empty(last_user_text) if has_new_claim else {}
+    if claim is None:
+        claim = await advisory_claim(tri, last_user_text, ctx)
 
     flags = dict(session_flags)
     flags.update({
@@ -27,24 +45,23 @@ def decide(mode: Mode, last_user_text: str, session_flags: dict) -> dict:
     })
 
     # Supervisor raw command
-    sys = "You are Supervisor. Output JSON command ONLY."
-    user = f"""{_PROMPT}
-
-SESSION_FLAGS: {json.dumps(flags, ensure_ascii=False)}
-"""
-    raw = chat(system=sys, user=user, temperature=0.0, max_tokens=300)
+    user = _PROMPT.user(SESSION_FLAGS=json.dumps(flags, ensure_ascii=False))
+    raw = await chat(system=_PROMPT.system, user=user, temperature=0.0, max_tokens=300, site=_PROMPT.site)
     try:
         cmd = json.loads(raw)
     except Exception:
+        parse_failed(_PROMPT.site)
         cmd = {"command":"OFFER_ACTIONS","reason":"fallback"}
 
     # If a new claim was present but supervisor didn't choose a plan, force UPDATE_PRO_ONLY.
     if has_new_claim and cmd.get("command") in {None, "", "OFFER_ACTIONS", "NUDGE"}:
         cmd = {"command": "UPDATE_PRO_ONLY", "reason": "new claim captured"}
 
-    # If RUN_PIPELINE -> ask PLANNER (LLM) for plan and enforce policies
+    # If RUN_PIPELINE -> static plan table, else ask PLANNER (LLM); enforce policies either way
     if cmd.get("command") == "RUN_PIPELINE":
-        steps = plan_steps(mode.value, intent, flags)
+        steps = lookup_plan(mode.value, intent, flags)
+        if steps is None:
+            steps = await plan_steps(mode.value, intent, flags)
         steps = require_fallacy_first(steps, Intent(intent))
         steps = only_one_executor(steps)
         cmd["plan_steps"] = steps
@@ -1,16 +1,44 @@
 import json
-from pathlib import Path
+from typing import List, Sequence
+from agents.tools.packing import pack_items, run_packed
+from core.config import settings
 from core.llm.main_client import chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
 
-_PROMPT = Path("prompts/fallacies.txt").read_text(encoding="utf-8")
+_PROMPT = register("fallacies", "You detect fallacies. Reply JSON ONLY as a list.", "fallacies.txt")
+_PACKED_PROMPT = register(
+    "fallacies_packed",
+    "You detect fallacies in each of several texts independently. Reply JSON ONLY as "
+    '{"results": [{"i": <index>, "fallacies": [...]}]} with one entry per text.',
+    "fallacies.txt", site="fallacies")
 
-def detect_fallacies(text: str) -> list[dict]:
-    sys = "You detect fallacies. Reply JSON ONLY as a list."
-    out = chat(system=sys, user=_PROMPT + "\n\nTEXT:\n" + text, temperature=0.0, max_tokens=400)
+@traced("fallacies")
+async def detect_fallacies(text: str) -> list[dict]:
+    out = await chat(system=_PROMPT.system, user=_PROMPT.user(TEXT=text), temperature=0.0, max_tokens=400,
+                     site=_PROMPT.site)
     try:
         data = json.loads(out)
         if isinstance(data, list):
             return data
     except Exception:
         pass
+    parse_failed(_PROMPT.site)
     return []
+
+async def _detect_packed(texts: Sequence[str]) -> str:
+    user = _PACKED_PROMPT.user(**{"TEXTS (JSON, keyed by i)": pack_items(texts)})
+    return await chat(system=_PACKED_PROMPT.system, user=user, temperature=0.0,
+                      max_tokens=min(4000, 400 * len(texts)), site=_PACKED_PROMPT.site)
+
+def _parse_packed(row: dict) -> list[dict]:
+    found = row["fallacies"]
+    if not isinstance(found, list) or not all(isinstance(f, dict) for f in found):
+        raise ValueError("fallacies is not a list of objects")
+    return found
+
+async def detect_fallacies_many(texts: Sequence[str], k: int | None = None) -> List[list[dict]]:
+    """detect_fallacies for many texts, K per request (settings.LLM_PACK_SIZE)."""
+    return await run_packed("fallacies", list(texts), k or settings.LLM_PACK_SIZE,
+                            _detect_packed, _parse_packed, detect_fallacies)
@@ -0,0 +1,67 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from core.telemetry.calls import parse_failed
+from core.telemetry.metrics import registry
+from core.utils.utils import json_load_safe
+
+# Several claims in one request: the shared instructions are paid once per
+# pack instead of once per claim. The model answers {"results": [{"i": n, ...}]};
+# items it drops or answers malformed fall back to the single-claim call.
+
+PACKED_ITEMS = registry.counter("llm_packed_items_total", "Items sent through packed LLM calls",
+                                labels=("tool", "outcome"))
+
+def pack_items(texts: Sequence[str]) -> str:
+    return json.dumps([{"i": i, "text": t} for i, t in enumerate(texts)], ensure_ascii=False)
+
+def unpack_results(out: str, n: int) -> List[Optional[dict]]:
+    """Per-item result objects by index; None where the model gave nothing usable."""
+    data = json_load_safe(out)
+    rows = data.get("results") if isinstance(data, dict) else data
+    got: List[Optional[dict]] = [None] * n
+    for row in rows if isinstance(rows, list) else []:
+        i = row.get("i") if isinstance(row, dict) else None
+        if isinstance(i, int) and 0 <= i < n and got[i] is None:
+            got[i] = row
+    return got
+
+async def run_packed(tool: str, items: Sequence[str], k: int,
+                     packed: Callable[[Sequence[str]], Awaitable[str]],
+                     parse: Callable[[dict], Any],
+                     single: Callable[[str], Awaitable[Any]]) -> List[Any]:
+    """Results for `items` in order, via ceil(n/k) packed calls plus one
+    single call per item the packed answer did not cover. `parse(row)` turns
+    a result row into the tool's value, raising ValueError if it is unusable."""
+    k = max(1, k)
+
+    async def _chunk(chunk: Sequence[str]) -> List[Any]:
+        if len(chunk) == 1:
+            PACKED_ITEMS.inc(tool=tool, outcome="single")
+            return [await single(chunk[0])]
+        try:
+            rows = unpack_results(await packed(chunk), len(chunk))
+        except Exception:
+            rows = [None] * len(chunk)
+        out: List[Any] = []
+        for text, row in zip(chunk, rows):
+            try:
+                if row is None:
+                    raise ValueError("missing")
+                out.append(parse(row))
+                PACKED_ITEMS.inc(tool=tool, outcome="packed")
+            except (ValueError, TypeError, KeyError):
+                out.append(None)
+        retry = [i for i, (row, v) in enumerate(zip(rows, out)) if v is None]
+        if retry:
+            PACKED_ITEMS.inc(len(retry), tool=tool, outcome="retried")
+            parse_failed(tool, len(retry))
+            singles = await asyncio.gather(*(single(chunk[i]) for i in retry))
+            for i, v in zip(retry, singles):
+                out[i] = v
+        return out
+
+    chunks = [items[i:i + k] for i in range(0, len(items), k)]
+    done = await asyncio.gather(*(_chunk(c) for c in chunks))
+    return [v for part in done for v in part]
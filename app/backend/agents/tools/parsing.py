@@ -1,16 +1,21 @@
 import json
 from core.llm.main_client import chat
-from pathlib import Path
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
 
-_PROMPT = Path("prompts/extract_claims.txt").read_text(encoding="utf-8")
+_PROMPT = register("extract", "Extract the claim/pitch from user's text. Reply JSON only.", "extract_claims.txt")
 
-def extract_claim_or_empty(user_text: str) -> dict:
-    sys = "Extract the claim/pitch from user's text. Reply JSON only."
-    out = chat(system=sys, user=_PROMPT + "\n\nUSER:\n" + user_text, temperature=0.0, max_tokens=300)
+@traced("extract")
+async def extract_claim_or_empty(user_text: str) -> dict:
+    out = await chat(system=_PROMPT.system, user=_PROMPT.user(USER=user_text), temperature=0.0, max_tokens=300,
+                     site=_PROMPT.site)
     try:
         data = json.loads(out)
-        if isinstance(data, dict) and data.get("original_text"):
-            return data
+        if isinstance(data, dict):
+            # {} is the prompt's "no claim" answer, not a failure
+            return data if data.get("original_text") else {}
     except Exception:
         pass
+    parse_failed(_PROMPT.site)
     return {}
@@ -1,38 +1,83 @@
+import re
 from typing import List, Dict, Any
-from integrations.tavily_client import search as tavily_search
-from integrations.wikipedia_client import search_titles, get_summary
+from integrations.research_fetcher import fetch_sources
 import json
-from pathlib import Path
+from core.config import settings
+from core.schemas import EvidenceTag, Source, SourceReliability
 from core.llm.main_client import chat as main_chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
+from core.utils.swr import SWRCache
 
-_CLASSIFY_PROMPT = Path("prompts/research_classify.txt").read_text(encoding="utf-8")
-
-def gather_sources(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
-    results = tavily_search(query, max_results=max_results//2) if query else []
-    titles = search_titles(query, limit=max_results//2) if query else []
-    wiki = [get_summary(t) for t in titles]
-    # Deduplicate by URL
-    seen = set()
-    merged = []
-    for it in (results + wiki):
-        url = it.get("url")
-        if not url or url in seen:
-            continue
-        seen.add(url)
-        merged.append(it)
-    return merged
+_PROMPT = register("classify", "Classify sources relative to claim. Reply JSON list.", "research_classify.txt")
+
+# Motions repeat across sessions ("Ban cash", "ban CASH!", "cash should be banned"),
+# so research is cached on a normalized form of the query. Raw sources and the
+# classified verdicts are cached separately: the same sources can be classified
+# against a differently worded claim.
+_STOPWORDS = frozenset("""
+a an the and or but of to in on at for by with from as is are was were be been being it its this that these
+those should would could must will shall can may might do does did not no we our you your they their i my me
+""".split())
+_TOKEN = re.compile(r"\w+")
+
+def normalize_query(text: str) -> str:
+    tokens = {t for t in _TOKEN.findall((text or "").casefold()) if t not in _STOPWORDS}
+    return " ".join(sorted(tokens))
+
+_raw_cache = SWRCache("research_sources", settings.RESEARCH_CACHE_SIZE,
+                      settings.RESEARCH_CACHE_FRESH_S, settings.RESEARCH_CACHE_STALE_S)
+_classified_cache = SWRCache("research_classified", settings.RESEARCH_CACHE_SIZE,
+                             settings.RESEARCH_CACHE_FRESH_S, settings.RESEARCH_CACHE_STALE_S)
+
+def cache_stats() -> Dict[str, Any]:
+    return {"sources": _raw_cache.stats(), "classified": _classified_cache.stats()}
 
-def classify_sources(claim: str, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+@traced("gather_sources")
+async def gather_sources(query: str, max_results: int = 8) -> List[Dict[str, Any]]:
+    # Tavily and Wikipedia run concurrently under settings.RESEARCH_DEADLINE_S
+    key = normalize_query(query)
+    if not key:
+        return await fetch_sources(query, max_results)
+    return await _raw_cache.get((key, max_results), lambda: fetch_sources(query, max_results))
+
+@traced("classify_sources")
+async def classify_sources(claim: str, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not sources:
         return []
+    key = (normalize_query(claim), tuple(sorted(s.get("url", "") for s in sources)))
+    return await _classified_cache.get(key, lambda: _classify(claim, sources))
+
+async def _classify(claim: str, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     blob = json.dumps([{"url": s.get("url",""), "title": s.get("title",""), "snippet": s.get("snippet","")} for s in sources], ensure_ascii=False)
-    sys = "Classify sources relative to claim. Reply JSON list."
-    user = f"{_CLASSIFY_PROMPT}\n\nCLAIM:\n{claim}\n\nSOURCES:\n{blob}"
-    out = main_chat(system=sys, user=user, temperature=0.0, max_tokens=1200)
+    out = await main_chat(system=_PROMPT.system, user=_PROMPT.user(CLAIM=claim, SOURCES=blob), temperature=0.0,
+                          max_tokens=1200, site=_PROMPT.site)
     try:
         data = json.loads(out)
         if isinstance(data, list):
             return data
     except Exception:
         pass
+    parse_failed(_PROMPT.site)
     return []
+
+_TAGS = {"✅": EvidenceTag.corroborated, "❌": EvidenceTag.refuted, "⚠️": EvidenceTag.disputed, "🕳": EvidenceTag.unverifiable}
+
+def to_sources(classified: List[Dict[str, Any]]) -> List[Source]:
+    """Classifier output (see prompts/research_classify.txt) as registry Sources."""
+    out = []
+    for it in classified:
+        url = (it.get("url") or "").strip() if isinstance(it, dict) else ""
+        if not url:
+            continue
+        fields: Dict[str, Any] = {"title": it.get("title") or url, "url": url}
+        if it.get("note"):
+            fields["note"] = it["note"]
+        if it.get("reliability") in SourceReliability.__members__:
+            fields["reliability"] = it["reliability"]
+        tag = _TAGS.get(it.get("tag")) or (it.get("tag") if it.get("tag") in EvidenceTag.__members__ else None)
+        if tag:
+            fields["tag"] = tag
+        out.append(Source(**fields))
+    return out
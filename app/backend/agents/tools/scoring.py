@@ -1,22 +1,49 @@
 import json
-from pathlib import Path
+from typing import List, Sequence
+from agents.tools.packing import pack_items, run_packed
+from core.config import settings
 from core.llm.main_client import chat as main_chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
 
-_EVAL_PROMPT = Path("prompts/evaluation.txt").read_text(encoding="utf-8")
+_PROMPT = register("score", "Evaluate strength concisely. Return JSON with bullets + score.", "evaluation.txt")
+_PACKED_PROMPT = register(
+    "score_packed",
+    "Evaluate the strength of each of several claims independently and concisely. Reply JSON ONLY as "
+    '{"results": [{"i": <index>, "bullets": [...], "score": {"value": 0-100, "reasons": [...]}}]}.',
+    "evaluation.txt", site="score")
 
-def score_claim(claim: str, context_hint: str = "") -> dict:
-    sys = "Evaluate strength concisely. Return JSON with bullets + score."
-    user = f"{_EVAL_PROMPT}\n\nCLAIM:\n{claim}\n\nCONTEXT:\n{context_hint}"
-    out = main_chat(system=sys, user=user, temperature=0.2, max_tokens=800)
+@traced("score")
+async def score_claim(claim: str, context_hint: str = "") -> dict:
+    user = _PROMPT.user(CLAIM=claim, CONTEXT=context_hint)
+    out = await main_chat(system=_PROMPT.system, user=user, temperature=0.2, max_tokens=800, site=_PROMPT.site)
     try:
-        data = json.loads(out)
-        sc = data.get("score") or {}
-        bullets = data.get("bullets") or []
-        # Validate score value
-        value = sc.get("value", 50)
-        if not isinstance(value, int) or not (0 <= value <= 100):
-            value = 50
-        reasons = sc.get("reasons", ["fallback"])
-        return {"bullets": bullets, "score": {"value": value, "reasons": reasons}}
+        return _normalize(json.loads(out))
     except Exception:
+        parse_failed(_PROMPT.site)
         return {"bullets": [], "score": {"value": 50, "reasons": ["fallback"]}}
+
+def _normalize(data: dict) -> dict:
+    sc = data.get("score") or {}
+    bullets = data.get("bullets") or []
+    # Validate score value
+    value = sc.get("value", 50)
+    if not isinstance(value, int) or not (0 <= value <= 100):
+        value = 50
+    reasons = sc.get("reasons", ["fallback"])
+    return {"bullets": bullets, "score": {"value": value, "reasons": reasons}}
+
+async def _score_packed(claims: Sequence[str]) -> str:
+    user = _PACKED_PROMPT.user(**{"CLAIMS (JSON, keyed by i)": pack_items(claims)})
+    return await main_chat(system=_PACKED_PROMPT.system, user=user, temperature=0.2,
+                           max_tokens=min(4000, 800 * len(claims)), site=_PACKED_PROMPT.site)
+
+def _parse_packed(row: dict) -> dict:
+    if not isinstance(row.get("score"), dict) or "value" not in row["score"]:
+        raise ValueError("no score")
+    return _normalize(row)
+
+async def score_claims(claims: Sequence[str], k: int | None = None) -> List[dict]:
+    """score_claim for many claims, K per request (settings.LLM_PACK_SIZE)."""
+    return await run_packed("score", list(claims), k or settings.LLM_PACK_SIZE, _score_packed, _parse_packed, score_claim)
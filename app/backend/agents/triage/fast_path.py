@@ -0,0 +1,54 @@
+import re
+
+# Deterministic pre-triage for bare commands ("evaluate", "objections please",
+# "research it"). Only answers when every word is command or filler vocabulary;
+# anything carrying other content (a claim, a question) returns None and goes
+# through the LLM triage/supervisor/planner path.
+
+_INTENT_WORDS = {
+    "evaluate_argument": {"evaluate", "evaluation", "evaluate_argument", "critique", "score", "review",
+                          "assess", "rate", "ruthless_impression", "ruthless", "impression", "feedback"},
+    "give_objections": {"give_objections", "objections", "objection", "object", "counter", "counters",
+                        "counterarguments", "counterargument", "refute", "rebut", "rebuttal", "rebuttals"},
+    "research": {"research", "sources", "source", "references", "evidence", "gather", "look_up", "find_sources"},
+}
+
+# Generic words ("look", "find", "up") only count as research inside these phrases.
+_PHRASES = [
+    (re.compile(r"\blook (?:it |this |that )?up\b"), "look_up"),
+    (re.compile(r"\bfind (?:(?:me|some) )*(?:sources?|evidence|references)\b"), "find_sources"),
+]
+
+_FILLER = {"please", "pls", "it", "this", "that", "my", "the", "a", "an", "me", "give", "do", "now",
+           "ok", "okay", "can", "could", "you", "go", "ahead", "some", "for", "on", "of", "and", "just",
+           "argument", "claim", "pitch", "idea", "first", "again", "let's", "lets", "run", "get", "to"}
+
+_MAX_WORDS = 8
+_WORD = re.compile(r"[a-z_']+")
+
+def fast_intent(user_text: str) -> str | None:
+    text = (user_text or "").strip().lower()
+    if not text or len(text) > 80 or re.search(r"\d|:", text):
+        return None
+    words = _WORD.findall(text)
+    if not words or len(words) > _MAX_WORDS:
+        return None
+    # anything but letters, spaces and light punctuation means content, not a command
+    if re.sub(r"[a-z_'\s.,!?-]", "", text):
+        return None
+    for pattern, token in _PHRASES:
+        text = pattern.sub(token, text)
+    words = _WORD.findall(text)
+    content = [w for w in words if w not in _FILLER]
+    hits = {intent for intent, vocab in _INTENT_WORDS.items() for w in content if w in vocab}
+    if len(hits) != 1 or any(w not in _INTENT_WORDS[next(iter(hits))] for w in content):
+        return None
+    return hits.pop()
+
+def fast_decide(user_text: str) -> dict | None:
+    """Supervisor-shaped command for a confident bare command, else None."""
+    intent = fast_intent(user_text)
+    if not intent:
+        return None
+    return {"command": "RUN_PIPELINE", "reason": "fast path", "intent": intent,
+            "plan_steps": ["FALLACY_CHECK"], "fast_path": True}
@@ -1,22 +1,20 @@
 import json
-from pathlib import Path
 from core.llm.main_client import chat
+from core.llm.prompts import register
+from core.telemetry.calls import parse_failed
+from core.telemetry.tracing import traced
 
-_TRIAGE_PROMPT = Path("prompts/triage.txt").read_text(encoding="utf-8")
+_PROMPT = register("triage", "You are TRIAGE. Reply JSON ONLY.", "triage.txt")
 
-def classify_intent(mode: str, user_text: str) -> dict:
-    sys = "You are TRIAGE. Reply JSON ONLY."
-    user = f"""{_TRIAGE_PROMPT}
-
-MODE: {mode}
-USER:
-{user_text}
-"""
-    out = chat(system=sys, user=user, temperature=0.0, max_tokens=300)
+@traced("triage")
+async def classify_intent(mode: str, user_text: str) -> dict:
+    user = _PROMPT.user(MODE=mode, USER=user_text)
+    out = await chat(system=_PROMPT.system, user=user, temperature=0.0, max_tokens=300, site=_PROMPT.site)
     try:
         data = json.loads(out)
         if isinstance(data, dict) and "intent" in data and "has_new_claim" in data:
             return data
     except Exception:
         pass
+    parse_failed(_PROMPT.site)
     return {"intent":"none","has_new_claim":False}
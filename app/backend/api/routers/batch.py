@@ -0,0 +1,19 @@
+import json
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from core.schemas import BatchEvaluateIn
+from services.batch_eval import evaluate_batch
+
+router = APIRouter(tags=["batch"])
+
+@router.post("/batch/evaluate")
+async def batch_evaluate(payload: BatchEvaluateIn):
+    """Evaluate many claims/pitches; NDJSON, one line per item in completion
+    order ({index, id, ok, score, con, fallacies, ms} or {..., ok: false, error}),
+    then a {done: true, ...} summary line."""
+    async def lines():
+        async for res in evaluate_batch(payload.mode, payload.items, payload.fallacy_check, payload.concurrency):
+            yield json.dumps(res, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
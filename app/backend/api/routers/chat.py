@@ -1,17 +1,60 @@
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from core.schemas import ChatIn, ChatOut
+from core.turn import TurnContext
 from services.chat_loop import run_chat_turn
 from core.state import SessionStore, session_store
 
 router = APIRouter(tags=["chat"])
 
+def _error_reply(e: Exception) -> ChatOut:
+    # For hackathon we return safe error; logs contain stacktrace
+    return ChatOut(chat_reply=f"""Something went wrong: {type(e).__name__}: {e}""", events=[])
+
 @router.post("/chat", response_model=ChatOut)
-def chat(payload: ChatIn, store: SessionStore = Depends(lambda: session_store)):
+async def chat(payload: ChatIn, store: SessionStore = Depends(lambda: session_store)):
     try:
-        out = run_chat_turn(payload, store)
+        out = await run_chat_turn(payload, store)
         return out
     except KeyError:
         raise HTTPException(status_code=404, detail="Session not found")
     except Exception as e:
-        # For hackathon we return safe error; logs contain stacktrace
-        return ChatOut(chat_reply=f"""Something went wrong: {type(e).__name__}: {e}""", events=[])
+        return _error_reply(e)
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_stream(payload: ChatIn, store: SessionStore = Depends(lambda: session_store)):
+    """Same turn as /chat, as server-sent events: `pro`, `decision`, `delta`
+    (generation tokens), `item` (each critique bullet / ranked objection once
+    complete), `reset` (drop the items streamed so far: the reply is being
+    retried), `con`, `score`, and finally `chat` carrying ChatOut."""
+    try:
+        store.get(payload.session_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    ctx = TurnContext(emit=lambda event, data: queue.put_nowait((event, data)))
+
+    async def turn():
+        try:
+            out = await run_chat_turn(payload, store, ctx)
+        except Exception as e:
+            out = _error_reply(e)
+        queue.put_nowait(("chat", out.model_dump(mode="json")))
+        queue.put_nowait(None)
+
+    async def events():
+        task = asyncio.create_task(turn())
+        try:
+            while (item := await queue.get()) is not None:
+                yield _sse(*item)
+        finally:
+            task.cancel()  # client went away mid-turn
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
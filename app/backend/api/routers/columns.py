@@ -1,17 +1,81 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
+import asyncio
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from core.pubsub import RESYNC, SessionHub, hub
 from core.state import SessionStore, session_store
-from core.schemas import Event, Column
+from core.schemas import ColumnsSnapshot
 
 router = APIRouter(tags=["columns"])
 
-@router.get("/columns")
-def get_columns(session_id: str = Query(...), store: SessionStore = Depends(lambda: session_store)):
-    st = store.get(session_id)
-    if not st:
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+@router.get("/columns", response_model=ColumnsSnapshot)
+def get_columns(request: Request, response: Response, session_id: str = Query(...),
+                since: int = Query(0, ge=0), store: SessionStore = Depends(lambda: session_store)):
+    try:
+        st = store.settled(session_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Session not found")
+    # `seq` moves on every stored event/source change, so it versions the payload
+    etag = f'"{st.seq}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return store.export_columns(session_id, since=since)
+
+KEEPALIVE_S = 15.0
+
+def _frame(data: str) -> str:
+    return f"event: columns\ndata: {data}\n\n"
+
+async def column_updates(store: SessionStore, hub: SessionHub, session_id: str, since: int = 0,
+                         keepalive_s: float = KEEPALIVE_S):
+    """SSE frames for one viewer: the columns since `since`, then each stored change."""
+    # subscribe first so nothing lands between the snapshot and the first push
+    sub = hub.subscribe(session_id)
+    try:
+        # off the loop: export_columns may wait for this worker's flusher
+        snap = await asyncio.to_thread(store.export_columns, session_id, since)
+        last = snap.seq
+        yield _frame(snap.model_dump_json())
+        while True:
+            try:
+                item = await asyncio.wait_for(sub.get(), keepalive_s)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if item is RESYNC:
+                # too slow to keep up: one delta from the last seq it got replaces the backlog
+                try:
+                    snap = await asyncio.to_thread(store.export_columns, session_id, last)
+                except KeyError:
+                    return  # session evicted
+                if snap.seq > last:
+                    last = snap.seq
+                    yield _frame(snap.model_dump_json())
+                continue
+            seq, data = item
+            if seq > last:
+                last = seq
+                yield _frame(data)
+    finally:
+        hub.unsubscribe(sub)
+
+@router.get("/columns/stream")
+async def stream_columns(session_id: str = Query(...), since: int = Query(0, ge=0),
+                         store: SessionStore = Depends(lambda: session_store)):
+    """Server-sent `columns` events shaped like GET /columns?since=: first
+    everything after `since`, then every PRO/CON event and source change as it
+    is stored, for as many viewers of the session as connect."""
+    try:
+        store.get(session_id)
+    except KeyError:
         raise HTTPException(status_code=404, detail="Session not found")
-    columns = {"PRO": [], "CON": [], "SOURCES": []}
-    for ev in st.events:
-        if ev.column in columns:
-            columns[ev.column].append(ev)
-    
-    return columns 
\ No newline at end of file
+    return StreamingResponse(column_updates(store, store.hub or hub, session_id, since),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,120 @@
+# bench/fake_llm.py
+# In-process stand-in for the AsyncOpenAI client: canned JSON per agent, fixed latency,
+# optional provider-side concurrency cap that answers 429 like a rate-limited API.
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+def _triage(user: str) -> dict:
+    text = user.split("USER:", 1)[-1].lower()
+    for word, intent in (("evaluate", "evaluate_argument"), ("objection", "give_objections"), ("research", "research")):
+        if word in text:
+            return {"intent": intent, "has_new_claim": False}
+    return {"intent": "none", "has_new_claim": "claim:" in text or "pitch:" in text}
+
+def _supervisor(user: str) -> dict:
+    try:
+        flags = json.loads(user.split("SESSION_FLAGS:", 1)[1].strip())
+    except Exception:
+        flags = {}
+    if flags.get("triage_intent") in ("evaluate_argument", "give_objections", "research"):
+        return {"command": "RUN_PIPELINE", "reason": "do action"}
+    if flags.get("has_new_claim"):
+        return {"command": "UPDATE_PRO_ONLY", "reason": "new claim"}
+    return {"command": "OFFER_ACTIONS", "reason": "no intent"}
+
+def _extract(user: str):
+    text = user.split("USER:\n", 1)[-1].strip()
+    if not any(text.lower().startswith(p) for p in ("my claim:", "pitch:")):
+        return {}
+    return {"original_text": text, "normalized": text.split(":", 1)[1].strip()}
+
+def reply_for(system: str, user: str) -> str:
+    s = system.lower()
+    if "triage" in s:
+        data = _triage(user)
+    elif "planner" in s:
+        data = {"plan_steps": ["FALLACY_CHECK", "EXECUTOR:run", "SCORE"]}
+    elif "supervisor" in s:
+        data = _supervisor(user)
+    elif "extract" in s:
+        data = _extract(user)
+    elif "fallac" in s:
+        data = [{"code": "false_cause", "label": "False cause", "emoji": "🔗", "why": "Correlation is not causation."}]
+    elif "classify sources" in s:
+        data = []
+    elif "ranked" in s:
+        data = {"ranked": [{"title": "Displacement", "why": "Crime moves elsewhere."},
+                           {"title": "Exclusion", "why": "Unbanked people lose access."}]}
+    else:
+        data = {"bullets": ["Causal link is asserted, not shown."],
+                "score": {"value": 55, "reasons": ["thin evidence"]}}
+    return json.dumps(data)
+
+def usage_for(messages, content: str, prefixes: set) -> dict:
+    """OpenAI-shaped usage: ~4 chars per token; a system message seen before
+    (recorded in `prefixes`) counts as a cached prefix."""
+    system = messages[0]["content"]
+    cached = len(system) // 4 if system in prefixes else 0
+    prefixes.add(system)
+    prompt, completion = sum(len(m["content"]) for m in messages) // 4, len(content) // 4
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion,
+            "prompt_tokens_details": {"cached_tokens": cached}}
+
+class _Completions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    async def create(self, model, messages, temperature=0.7, max_tokens=1600, stream=False, **kwargs):
+        owner = self._owner
+        owner.calls += 1
+        if owner.fail_first > 0 or (owner.max_concurrency and owner.active >= owner.max_concurrency):
+            owner.fail_first = max(0, owner.fail_first - 1)
+            owner.throttled += 1
+            raise owner.rate_limit_error()
+        owner.active += 1
+        owner.peak = max(owner.peak, owner.active)
+        try:
+            await asyncio.sleep(owner.model_latency_s.get(model, owner.latency_s))
+        finally:
+            owner.active -= 1
+        content = reply_for(messages[0]["content"], messages[-1]["content"])
+        usage = owner.usage(messages, content)
+        if stream:
+            return self._chunks(content, usage)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+    async def _chunks(self, content: str, usage, size: int = 8):
+        for i in range(0, len(content), size):
+            await asyncio.sleep(0)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + size]))])
+        yield SimpleNamespace(choices=[], usage=usage)  # what stream_options={"include_usage": True} sends
+
+class FakeAsyncLLM:
+    """Duck-types `AsyncOpenAI` for `core.llm.main_client.client`."""
+    def __init__(self, latency_s: float = 0.05, max_concurrency: int = 0, fail_first: int = 0,
+                 retry_after_s: float | None = None):
+        self.latency_s = latency_s
+        self.max_concurrency = max_concurrency  # 0 = unlimited
+        self.fail_first = fail_first            # answer the first N calls with 429
+        self.retry_after_s = retry_after_s
+        self.model_latency_s: dict = {}         # per-model override of latency_s
+        self.calls = 0
+        self.throttled = 0
+        self.active = 0
+        self.peak = 0
+        self._prefixes = set()
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def usage(self, messages, content: str) -> SimpleNamespace:
+        u = usage_for(messages, content, self._prefixes)
+        return SimpleNamespace(prompt_tokens=u["prompt_tokens"], completion_tokens=u["completion_tokens"],
+                               prompt_tokens_details=SimpleNamespace(**u["prompt_tokens_details"]))
+
+    def rate_limit_error(self) -> openai.RateLimitError:
+        headers = {"retry-after": str(self.retry_after_s)} if self.retry_after_s is not None else {}
+        response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://fake-llm/chat"))
+        return openai.RateLimitError("rate limited", response=response, body=None)
@@ -0,0 +1,141 @@
+# bench/fake_openai.py
+# Local OpenAI-compatible chat completions server for load tests: canned agent
+# replies (bench.fake_llm.reply_for), seeded latency distributions, a token
+# rate for streamed and non-streamed replies, and injected 429/5xx errors.
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench.fake_llm import reply_for, usage_for
+
+class Latency:
+    """"const:S" | "uniform:LO,HI" | "lognormal:MEDIAN,SIGMA" (seconds)."""
+
+    def __init__(self, spec: str = "const:0"):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        self.args = [float(x) for x in args.split(",") if x]
+        if kind not in ("const", "uniform", "lognormal") or len(self.args) != (1 if kind == "const" else 2):
+            raise ValueError(f"bad latency spec {spec!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "const":
+            return self.args[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.args)
+        median, sigma = self.args
+        return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency: str = "const:0", tokens_per_s: float = 0, rate_limit_rate: float = 0,
+                 error_rate: float = 0, seed: int = 0, model_latency=None):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = Latency(latency)  # time to first token
+        self.model_latency = {m: Latency(s) for m, s in (model_latency or {}).items()}
+        self.tokens_per_s = tokens_per_s  # 0 = the whole reply at once
+        self.rate_limit_rate = rate_limit_rate  # share of requests answered 429
+        self.error_rate = error_rate  # share answered 500
+        self.seed = seed
+        self.calls = 0
+        self.by_model = {}
+        self.statuses = {}
+        self._prefixes = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address):
+        pass
+
+    def _admit(self, model: str):
+        """(rng, status) for the next request; counters under the lock."""
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+            self.by_model[model] = self.by_model.get(model, 0) + 1
+        rng = random.Random(f"{self.seed}:{n}")
+        roll = rng.random()
+        status = 429 if roll < self.rate_limit_rate else 500 if roll < self.rate_limit_rate + self.error_rate else 200
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        return rng, status
+
+    def usage(self, messages, content: str) -> dict:
+        with self._lock:
+            return usage_for(messages, content, self._prefixes)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status: int, body: dict, headers=()):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _chunk(self, data: str):
+        raw = data.encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+        self.wfile.flush()
+
+    def do_POST(self):
+        srv = self.server
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        model, messages = req.get("model") or "", req.get("messages") or [{"content": ""}]
+        rng, status = srv._admit(model)
+        time.sleep(srv.model_latency.get(model, srv.latency).sample(rng))
+        if status == 429:
+            return self._json(429, {"error": {"message": "rate limited", "type": "rate_limit_error"}},
+                              headers=[("retry-after", "0")])
+        if status != 200:
+            return self._json(status, {"error": {"message": "upstream failed", "type": "server_error"}})
+        content = reply_for(messages[0]["content"], messages[-1]["content"])
+        usage = srv.usage(messages, content)
+        base = {"id": f"chatcmpl-{srv.calls}", "created": int(time.time()), "model": model}
+        if not req.get("stream"):
+            if srv.tokens_per_s:
+                time.sleep(usage["completion_tokens"] / srv.tokens_per_s)
+            return self._json(200, {**base, "object": "chat.completion", "usage": usage, "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        base["object"] = "chat.completion.chunk"
+        step = 8  # characters per chunk, ~2 tokens
+        for i in range(0, len(content), step):
+            if srv.tokens_per_s:
+                time.sleep(step / 4 / srv.tokens_per_s)
+            delta = {"content": content[i:i + step]}
+            self._chunk("data: " + json.dumps({**base, "choices": [{"index": 0, "delta": delta}]}) + "\n\n")
+        if (req.get("stream_options") or {}).get("include_usage"):
+            self._chunk("data: " + json.dumps({**base, "choices": [], "usage": usage}) + "\n\n")
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
@@ -0,0 +1,101 @@
+# bench/fake_research.py
+# Local stand-in for the Tavily and Wikipedia HTTP APIs, for tests and benches.
+# Every title resolves to a page; `delays` adds per-route latency and `gates`
+# hold a route's replies until an event is set (deterministic ordering in tests).
+import collections
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+def page_url(title: str) -> str:
+    return "https://en.wikipedia.org/wiki/" + title.replace(" ", "_")
+
+class FakeResearchServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, titles=("Alpha", "Beta", "Gamma"), delays=None):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.titles = list(titles)  # opensearch result for any query
+        self.delays = dict(delays or {})  # "tavily" | "opensearch" | "query" | "summary" | <title> -> seconds
+        self.gates = {}  # route -> threading.Event the reply waits for
+        self.arrived = collections.defaultdict(threading.Event)  # route -> set once a request came in
+        self.requests = []  # (route, client (host, port)); a repeated port is a reused connection
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def routes(self):
+        return [r for r, _ in self.requests]
+
+    def start(self) -> "FakeResearchServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.release()
+        self.shutdown()
+        self.server_close()
+
+    def configure(self, settings) -> None:
+        """Point the integrations at this server (mutates `settings`)."""
+        settings.TAVILY_API_KEY = settings.TAVILY_API_KEY or "fake"
+        settings.TAVILY_API_URL = self.base_url + "/search"
+        settings.WIKIPEDIA_API_URL = self.base_url + "/w/api.php"
+        settings.WIKIPEDIA_REST_URL = self.base_url + "/api/rest_v1"
+
+    def release(self) -> None:
+        """Open every gate, so held handlers finish before shutdown."""
+        for gate in list(self.gates.values()):
+            gate.set()
+
+    def handle_error(self, request, client_address):
+        pass  # clients cut off by a deadline hang up mid-reply
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, route, body, delay_keys=()):
+        self.server.requests.append((route, self.client_address))
+        self.server.arrived[route].set()
+        gate = self.server.gates.get(route)
+        if gate is not None:
+            gate.wait(timeout=10)
+        time.sleep(max([self.server.delays.get(route, 0)] + [self.server.delays.get(k, 0) for k in delay_keys]))
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        q = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}").get("query", "")
+        self._reply("tavily", {"results": [
+            {"title": f"{q} report", "url": f"https://t.example/{len(q)}", "content": f"tavily on {q}"},
+            {"title": self.server.titles[0], "url": page_url(self.server.titles[0]), "content": "tavily copy"},
+        ][:2 if self.server.titles else 1]})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/w/api.php":
+            params = parse_qs(url.query)
+            if params.get("action") == ["opensearch"]:
+                limit = int(params.get("limit", ["10"])[0])
+                self._reply("opensearch", [params["search"][0], self.server.titles[:limit], [], []])
+            else:
+                titles = params["titles"][0].split("|")
+                pages = [{"pageid": i + 1, "ns": 0, "title": t, "extract": f"about {t}", "fullurl": page_url(t)}
+                         for i, t in enumerate(titles)]
+                self._reply("query", {"batchcomplete": True, "query": {"pages": pages}}, titles)
+        else:
+            title = unquote(url.path.rsplit("/", 1)[1]).replace("_", " ")
+            self._reply("summary", {"title": title, "extract": f"about {title}",
+                                    "content_urls": {"desktop": {"page": page_url(title)}}}, (title,))
@@ -0,0 +1,40 @@
+# bench/fast_path.py
+# Skip rate and accuracy of the deterministic fast path over a labelled corpus.
+# Labels are the intents the LLM triage path settles on for each message.
+#
+#   cd app/backend && python -m bench.fast_path
+import argparse
+import json
+import time
+
+from agents.triage.fast_path import fast_intent
+
+# extract + triage + supervisor + planner are all skipped for a bare command
+_LLM_CALLS_SKIPPED = 4
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default="bench/data/triage_corpus.jsonl")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args()
+
+    rows = [json.loads(ln) for ln in open(args.corpus, encoding="utf-8") if ln.strip()]
+    t0 = time.perf_counter()
+    preds = [fast_intent(r["text"]) for r in rows]
+    dt = time.perf_counter() - t0
+
+    skipped = [(r, p) for r, p in zip(rows, preds) if p]
+    correct = sum(1 for r, p in skipped if p == r["intent"])
+    commands = [r for r in rows if r["intent"] != "none"]
+    for r, p in zip(rows, preds):
+        if args.verbose or (p and p != r["intent"]):
+            print(f"{'MISS' if p and p != r['intent'] else '    '} {str(p):<18} {r['intent']:<18} {r['text']}")
+
+    print(f"corpus:            {len(rows)} messages ({len(commands)} with an action intent)")
+    print(f"fast-path skips:   {len(skipped)} ({len(skipped) / len(rows):.1%} of all, {len(skipped) / max(1, len(commands)):.1%} of actions)")
+    print(f"accuracy on skips: {correct}/{len(skipped)} ({correct / max(1, len(skipped)):.1%}) vs LLM labels")
+    print(f"llm calls saved:   {len(skipped) * _LLM_CALLS_SKIPPED}")
+    print(f"classifier cost:   {dt / len(rows) * 1e6:.1f} µs/message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# bench/json_parsing.py
+# JsonArrayStream (incremental) vs core.utils.utils.json_load_safe on large and
+# pathological model replies.
+#
+#   cd app/backend && python -m bench.json_parsing
+import json
+import time
+
+from core.utils.json_stream import JsonArrayStream
+from core.utils.utils import json_load_safe
+
+def _reply(n: int) -> str:
+    return json.dumps({"bullets": [f"Point {i}: the {{claim}} assumes [x] without evidence." for i in range(n)],
+                       "score": {"value": 41, "reasons": ["thin evidence"]}})
+
+CASES = {
+    "valid, 2k bullets": _reply(2000),
+    "prose-wrapped, 2k bullets": "Here is my review {draft}:\n" + _reply(2000) + "\nHope this helps {you}.",
+    "truncated, 2k bullets": _reply(2000)[:-40],
+    "unclosed braces x5k": "Thinking " + "{ [ " * 5000 + "no json here",
+}
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def _stream(text: str, chunk: int = 16) -> int:
+    p = JsonArrayStream("bullets")
+    for i in range(0, len(text), chunk):
+        p.feed(text[i:i + chunk])
+    return len(p.items)
+
+def _prefix_reparse(text: str, chunk: int = 512) -> None:
+    # what emitting bullets while streaming costs without an incremental parser
+    for i in range(chunk, len(text) + chunk, chunk):
+        json_load_safe(text[:i])
+
+def main():
+    print(f"{'case':<28} {'chars':>8} {'json_load_safe':>15} {'items':>6} {'stream(16)':>11} {'items':>6} {'prefix-reparse':>15}")
+    for name, text in CASES.items():
+        t_safe = _time(lambda: json_load_safe(text))
+        safe_items = len((json_load_safe(text) or {}).get("bullets", []))
+        t_stream = _time(lambda: _stream(text))
+        t_prefix = _time(lambda: _prefix_reparse(text), repeat=1)
+        print(f"{name:<28} {len(text):>8} {t_safe * 1e3:>13.2f}ms {safe_items:>6} {t_stream * 1e3:>9.2f}ms "
+              f"{_stream(text):>6} {t_prefix * 1e3:>13.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# bench/load.py
+# End-to-end load test: replays scripted debate/pitch sessions through the
+# FastAPI app against local fake OpenAI and Tavily/Wikipedia servers, then
+# reports turn latency percentiles, throughput, LLM calls per turn and RSS.
+# Results can be saved as a JSON baseline and later runs compared against it.
+#
+#   cd app/backend && python -m bench.load --sessions 200 --concurrency 32 --save bench/baselines/default.json
+#   python -m bench.load --sessions 200 --concurrency 32 --compare bench/baselines/default.json
+#   python -m bench.load --latency lognormal:0.2,0.5 --tokens-per-s 300 --rate-limit 0.05 --stream
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("AIML_API_KEY", "bench")
+
+import httpx
+from openai import AsyncOpenAI
+
+from bench.fake_openai import FakeOpenAIServer
+from bench.fake_research import FakeResearchServer
+from agents.triage.fast_path import fast_intent
+from core.config import settings
+from core.llm import main_client
+from core.llm.cache import llm_cache
+from core.telemetry.logger import logger
+
+SESSIONS_FILE = Path(__file__).parent / "data" / "sessions.jsonl"
+# metric -> direction that counts as worse; checked by --compare
+_HIGHER_IS_WORSE = {"p50_s": True, "p95_s": True, "p99_s": True, "turns_per_s": False,
+                    "llm_calls_per_turn": True, "rss_mb": True, "error_rate": True}
+
+def load_sessions(path=SESSIONS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    return xs[max(0, min(len(xs), math.ceil(q / 100 * len(xs))) - 1)]
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+async def _turn(http: httpx.AsyncClient, sid: str, text: str, stream: bool) -> bool:
+    body = {"session_id": sid, "user_text": text}
+    if not stream:
+        return (await http.post("/api/chat", json=body)).status_code == 200
+    async with http.stream("POST", "/api/chat/stream", json=body) as r:
+        async for _ in r.aiter_bytes():
+            pass
+        return r.status_code == 200
+
+def _personalize(text: str, n: int) -> str:
+    # replayed scripts would otherwise send identical prompts that the gateway
+    # coalesces across sessions; real users' claims differ. Bare commands stay as is.
+    return text if fast_intent(text) else f"{text} (case {n})"
+
+async def _session(http, n, script, sem, stream, latencies, errors):
+    async with sem:
+        r = await http.post(f"/api/session?mode={script['mode']}")
+        sid = r.json()["session_id"]
+        for text in script["turns"]:
+            text = _personalize(text, n)
+            t0 = time.perf_counter()
+            try:
+                ok = await _turn(http, sid, text, stream)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - t0)
+            errors[0] += not ok
+
+async def drive(app, scripts, sessions: int, concurrency: int, seed: int = 0, stream: bool = False) -> dict:
+    """Replay `sessions` scripts drawn (seeded, by weight) from `scripts`,
+    at most `concurrency` sessions in flight."""
+    rng = random.Random(seed)
+    picks = rng.choices(scripts, weights=[s.get("weight", 1) for s in scripts], k=sessions)
+    latencies, errors = [], [0]
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        t0 = time.perf_counter()
+        await asyncio.gather(*[_session(http, n, s, sem, stream, latencies, errors) for n, s in enumerate(picks)])
+        wall = time.perf_counter() - t0
+    return {"turns": len(latencies), "errors": errors[0], "wall_s": wall, "latencies": latencies,
+            "mix": {name: sum(s["name"] == name for s in picks) for name in dict.fromkeys(s["name"] for s in picks)}}
+
+def summarize(run: dict, llm_calls: int) -> dict:
+    lat, turns = run["latencies"], run["turns"] or 1
+    return {
+        "turns": run["turns"],
+        "p50_s": round(percentile(lat, 50), 4),
+        "p95_s": round(percentile(lat, 95), 4),
+        "p99_s": round(percentile(lat, 99), 4),
+        "turns_per_s": round(run["turns"] / run["wall_s"], 2) if run["wall_s"] else 0.0,
+        "llm_calls_per_turn": round(llm_calls / turns, 3),
+        "rss_mb": round(rss_mb(), 1),
+        "error_rate": round(run["errors"] / turns, 4),
+    }
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics worse than the baseline by more than `tolerance` (relative)."""
+    out = []
+    for key, higher_is_worse in _HIGHER_IS_WORSE.items():
+        new, old = result["metrics"].get(key), baseline["metrics"].get(key)
+        if new is None or old is None:
+            continue
+        delta = (new - old) / old if old else (1.0 if new else 0.0)
+        if (delta if higher_is_worse else -delta) > tolerance:
+            out.append((key, old, new, delta))
+    return out
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--scripts", default=str(SESSIONS_FILE), help="JSONL of {name, mode, weight, turns}")
+    ap.add_argument("--latency", default="uniform:0.02,0.08", help="const:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA")
+    ap.add_argument("--model-latency", default="{}", help='per-model latency specs, e.g. {"smol": "const:0.01"}')
+    ap.add_argument("--tokens-per-s", type=float, default=0, help="completion token rate (0 = instant)")
+    ap.add_argument("--rate-limit", type=float, default=0, help="share of LLM requests answered 429")
+    ap.add_argument("--error-rate", type=float, default=0, help="share of LLM requests answered 500")
+    ap.add_argument("--research-delay", type=float, default=0.02)
+    ap.add_argument("--stream", action="store_true", help="drive /api/chat/stream instead of /api/chat")
+    ap.add_argument("--cache", action="store_true", help="keep the LLM response cache on")
+    ap.add_argument("--save", help="write the result JSON here (a baseline)")
+    ap.add_argument("--compare", help="baseline JSON to compare against; exit 1 on regression")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="relative slack before a metric regresses")
+    args = ap.parse_args(argv)
+
+    logger.setLevel(logging.WARNING)
+    llm_cache.enabled = args.cache
+    llm = FakeOpenAIServer(latency=args.latency, tokens_per_s=args.tokens_per_s, rate_limit_rate=args.rate_limit,
+                           error_rate=args.error_rate, seed=args.seed,
+                           model_latency=json.loads(args.model_latency)).start()
+    research = FakeResearchServer(delays={"tavily": args.research_delay}).start()
+    research.configure(settings)
+    settings.SMOL_MODEL, settings.CHEAP_MODEL, settings.MAIN_MODEL = "smol", "cheap", "main"
+    main_client.client = AsyncOpenAI(base_url=llm.base_url, api_key="bench", max_retries=0,
+                                     http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=None)))
+    from main import app
+
+    try:
+        run = asyncio.run(drive(app, load_sessions(args.scripts), args.sessions, args.concurrency,
+                                seed=args.seed, stream=args.stream))
+    finally:
+        llm.stop()
+        research.stop()
+    result = {
+        "config": {**{k: v for k, v in vars(args).items() if k not in ("save", "compare", "tolerance")},
+                   "scripts": Path(args.scripts).name},
+        "metrics": summarize(run, llm.calls),
+        "llm": {"requests": llm.calls, "by_model": llm.by_model, "statuses": {str(k): v for k, v in llm.statuses.items()}},
+        "research_requests": len(research.requests),
+        "mix": run["mix"],
+    }
+    print(json.dumps(result, indent=2))
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline.get("config") != result["config"]:
+            print("warning: baseline was recorded with a different config", file=sys.stderr)
+        worse = compare(result, baseline, args.tolerance)
+        for key, old, new, delta in worse:
+            print(f"REGRESSION {key}: {old} -> {new} ({delta:+.0%})", file=sys.stderr)
+        return 1 if worse else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# bench/text_utils.py
+# core.utils.utils helpers (json_load_safe, format_bullets, format_ranked) and
+# core.utils.text.trim against the previous implementations, on realistic and
+# adversarial model replies. Outputs must match byte for byte; tests reuse CASES.
+#
+#   cd app/backend && python -m bench.text_utils
+import json
+import re
+import time
+from typing import Iterable, List, Union
+
+from core.utils.text import trim
+from core.utils.utils import format_bullets, format_ranked, json_load_safe
+
+# --- previous implementations (the reference for output equality) -----------
+
+def legacy_json_load_safe(s: str) -> Union[dict, list]:
+    if not s:
+        return {}
+    t = s.strip()
+    if t.startswith("```"):
+        t = re.sub(r"^```(?:json)?\s*|\s*```$", "", t, flags=re.IGNORECASE | re.DOTALL).strip()
+    try:
+        return json.loads(t)
+    except Exception:
+        pass
+    m = re.search(r"(\{.*\}|\[.*\])", t, flags=re.DOTALL)
+    if m:
+        try:
+            return json.loads(m.group(1))
+        except Exception:
+            return {}
+    return {}
+
+def _legacy_clean_bullet_text(text: str) -> str:
+    if not text:
+        return ""
+    t = text.strip()
+    for prefix in ("- ", "• ", "* ", "– ", "— "):
+        if t.startswith(prefix):
+            t = t[len(prefix):].lstrip()
+    return t
+
+def legacy_format_bullets(bullets: Iterable[str]) -> str:
+    if not bullets:
+        return ""
+    cleaned = [_legacy_clean_bullet_text(b) for b in bullets if _legacy_clean_bullet_text(b)]
+    if not cleaned:
+        return ""
+    return "".join(f"- {b}\n" for b in cleaned)
+
+def legacy_format_ranked(ranked: List[dict]) -> str:
+    text = ""
+    for c in ranked or []:
+        title = (c.get("title") or "").strip()
+        why = (c.get("why") or "").strip()
+        if not (title or why):
+            continue
+        text += f"{title}: {why}\n" if title and why else f"{why}\n"
+    return text
+
+# --- inputs ----------------------------------------------------------------
+
+def _reply(n: int) -> str:
+    return json.dumps({"bullets": [f"Point {i}: the {{claim}} assumes [x] without evidence." for i in range(n)],
+                       "score": {"value": 41, "reasons": ["thin evidence"]}})
+
+REPLIES = {
+    "typical fenced reply": "```json\n" + _reply(6) + "\n```",
+    "valid, 2k bullets": _reply(2000),
+    "prose-wrapped, 2k bullets": "Here is my review {draft}:\n" + _reply(2000) + "\nHope this helps {you}.",
+    "truncated, 2k bullets": _reply(2000)[:-40],
+    "unclosed braces x5k": "Thinking " + "{ [ " * 5000 + "no json here",
+    "nested 50k deep": "[" * 50_000 + "]" * 50_000,
+    "fenced, 20k-space gap": "```json\n{\"bullets\": [" + " " * 20_000 + "\"x\"",
+    "huge prose, no json": "The argument is weak. " * 20_000,
+}
+
+_MARKS = ("- ", "• ", "* ", "– ", "— ", "", "  - ", "-- ")
+
+BULLETS = {
+    "8 bullets": [f"{_MARKS[i % len(_MARKS)]}Assumes point {i} holds." for i in range(8)],
+    "5k marked bullets": [f"{_MARKS[i % len(_MARKS)]}Assumes point {i} holds. " for i in range(5000)],
+    "5k with blanks": ["", "  ", "- ", "plain"] * 1250,
+}
+
+RANKED = {
+    "3 objections": [{"title": "Displacement", "why": "Crime moves."}, {"title": "", "why": "Exclusion."},
+                     {"title": "  ", "why": None}],
+    "5k objections": [{"title": f"Objection {i}", "why": "Because." * (i % 5)} for i in range(5000)],
+}
+
+TEXTS = {"short": "A claim. ", "50k chars": "word " * 10_000}
+
+# --- timing ----------------------------------------------------------------
+
+def _time(fn, budget_s: float = 0.2) -> float:
+    # best of as many runs as fit the budget (at least one)
+    best, spent = float("inf"), 0.0
+    while spent < budget_s:
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best, spent = min(best, dt), spent + dt
+    return best
+
+def rows():
+    for name, text in REPLIES.items():
+        yield "json_load_safe", name, (lambda: legacy_json_load_safe(text)), (lambda: json_load_safe(text))
+    for name, bullets in BULLETS.items():
+        yield "format_bullets", name, (lambda: legacy_format_bullets(bullets)), (lambda: format_bullets(bullets))
+    for name, ranked in RANKED.items():
+        yield "format_ranked", name, (lambda: legacy_format_ranked(ranked)), (lambda: format_ranked(ranked))
+
+def main():
+    print(f"{'function':<15} {'case':<26} {'before':>11} {'after':>11} {'speedup':>8}")
+    for fn, name, old, new in rows():
+        assert repr(old()) == repr(new()), (fn, name)
+        t_old, t_new = _time(old), _time(new)
+        print(f"{fn:<15} {name:<26} {t_old * 1e6:>9.1f}us {t_new * 1e6:>9.1f}us {t_old / t_new:>7.1f}x")
+    for name, text in TEXTS.items():
+        print(f"{'trim':<15} {name:<26} {'':>11} {_time(lambda: trim(text)) * 1e6:>9.1f}us")
+
+if __name__ == "__main__":
+    main()
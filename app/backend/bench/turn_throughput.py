@@ -0,0 +1,72 @@
+# bench/turn_throughput.py
+# Turns/sec of the async chat pipeline against a stubbed LLM, at rising concurrency.
+#
+#   cd app/backend && python -m bench.turn_throughput --latency 0.05 --turns 400
+#   python -m bench.turn_throughput --tiers   # smol/cheap models 4x faster; prints the tier report
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+os.environ.setdefault("AIML_API_KEY", "bench")
+
+from bench.fake_llm import FakeAsyncLLM
+from core.llm import main_client
+from core.config import settings
+from core.llm.cache import llm_cache
+from core.llm.tiers import tier_report
+from core.schemas import ChatIn, Mode
+from core.state import InMemorySessionStore
+from core.telemetry.logger import logger
+from services.chat_loop import run_chat_turn
+
+_SCRIPT = ["My claim: banning cash will reduce crime.", "evaluate it", "give objections"]
+
+async def _session(store: InMemorySessionStore, sem: asyncio.Semaphore) -> int:
+    sid = store.create(mode=Mode.debate_counter)
+    for text in _SCRIPT:
+        async with sem:
+            await run_chat_turn(ChatIn(session_id=sid, user_text=text), store)
+    return len(_SCRIPT)
+
+async def _run(concurrency: int, turns: int) -> float:
+    store = InMemorySessionStore()
+    sem = asyncio.Semaphore(concurrency)
+    t0 = time.perf_counter()
+    done = sum(await asyncio.gather(*[_session(store, sem) for _ in range(max(1, turns // len(_SCRIPT)))]))
+    return done / (time.perf_counter() - t0)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.05, help="seconds per stubbed LLM call")
+    ap.add_argument("--turns", type=int, default=300)
+    ap.add_argument("--levels", default="1,8,32,128,512")
+    ap.add_argument("--cache", action="store_true", help="keep the LLM response cache on (replayed turns hit it)")
+    ap.add_argument("--tiers", action="store_true", help="distinct smol/cheap/main models with per-tier latency")
+    ap.add_argument("--prices", default='{"nano": [0.1, 0.4], "mini": [0.4, 1.6], "heavy": [2.5, 10]}',
+                    help="USD per million input/output tokens by model, for the tier report")
+    args = ap.parse_args()
+
+    logger.setLevel(logging.WARNING)  # per-turn step reports would swamp the table
+    llm_cache.enabled = args.cache
+    fake = FakeAsyncLLM(latency_s=args.latency)
+    main_client.client = fake
+    if args.tiers:
+        settings.SMOL_MODEL, settings.CHEAP_MODEL, settings.MAIN_MODEL = "nano", "mini", "heavy"
+        settings.LLM_PRICES = args.prices
+        fake.model_latency_s = {"nano": args.latency / 4, "mini": args.latency / 2}
+
+    print(f"{'concurrency':>11} {'turns/s':>10} {'speedup':>8}")
+    base = None
+    for level in (int(x) for x in args.levels.split(",")):
+        rate = asyncio.run(_run(level, args.turns))
+        base = base or rate
+        print(f"{level:>11} {rate:>10.1f} {rate / base:>7.1f}x")
+    print(f"llm calls: {fake.calls}")
+    if args.tiers:
+        print(json.dumps(tier_report(), indent=2))
+
+if __name__ == "__main__":
+    main()
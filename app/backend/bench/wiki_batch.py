@@ -0,0 +1,51 @@
+# bench/wiki_batch.py
+# Wikipedia summaries for a research turn: one REST call per title vs one
+# batched action=query call, and the same turn with a warm title cache.
+# Runs against bench.fake_research with a fixed per-request latency.
+#
+#   cd app/backend && python -m bench.wiki_batch --titles 4 --latency 0.08
+import argparse
+import time
+
+from bench.fake_research import FakeResearchServer
+from core.config import settings
+from integrations import wikipedia_client
+
+def _turn(srv, titles, fn):
+    srv.requests.clear()
+    t0 = time.perf_counter()
+    out = fn(titles)
+    return time.perf_counter() - t0, len(srv.requests), sum(1 for s in out if s)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--titles", type=int, default=4)
+    ap.add_argument("--latency", type=float, default=0.08, help="seconds per mock request")
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    titles = [f"Topic {i}" for i in range(args.titles)]
+    srv = FakeResearchServer(titles=titles, delays={"summary": args.latency, "query": args.latency}).start()
+    srv.configure(settings)
+    modes = {
+        "per-title loop": lambda ts: [wikipedia_client.get_summary(t) for t in ts],
+        "batched": lambda ts: list(wikipedia_client.get_summaries(ts).values()),
+    }
+    try:
+        print(f"{args.titles} titles, {args.latency * 1000:.0f} ms per request, best of {args.rounds}")
+        for name, fn in modes.items():
+            runs = []
+            for _ in range(args.rounds):
+                wikipedia_client.clear_caches()
+                runs.append(_turn(srv, titles, fn))
+            dt, reqs, found = min(runs)
+            print(f"  {name:<16} {dt * 1000:8.1f} ms  {reqs:3d} requests  {found} summaries")
+        wikipedia_client.clear_caches()
+        wikipedia_client.get_summaries(titles)
+        dt, reqs, found = _turn(srv, titles, lambda ts: list(wikipedia_client.get_summaries(ts).values()))
+        print(f"  {'batched, warm':<16} {dt * 1000:8.1f} ms  {reqs:3d} requests  {found} summaries")
+    finally:
+        srv.stop()
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,75 @@ class Settings(BaseModel):
     AIMLAPI_API_KEY: str | None = os.getenv("AIML_API_KEY")
     # External search provider
     TAVILY_API_KEY: str | None = os.getenv("TAVILY_API_KEY")  
+    TAVILY_API_URL: str = os.getenv("TAVILY_API_URL", "https://api.tavily.com/search")
+    WIKIPEDIA_API_URL: str = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+    WIKIPEDIA_REST_URL: str = os.getenv("WIKIPEDIA_REST_URL", "https://en.wikipedia.org/api/rest_v1")
+    WIKIPEDIA_CACHE_SIZE: int = int(os.getenv("WIKIPEDIA_CACHE_SIZE", "4096"))
+    WIKIPEDIA_CACHE_TTL_S: float = float(os.getenv("WIKIPEDIA_CACHE_TTL_S", str(6 * 3600)))
+    # Whole-operation budget for one research fetch; late providers are dropped, not awaited
+    RESEARCH_DEADLINE_S: float = float(os.getenv("RESEARCH_DEADLINE_S", "8"))
+    # Research results by normalized query: fresh hits, then served stale while refreshing
+    RESEARCH_CACHE_SIZE: int = int(os.getenv("RESEARCH_CACHE_SIZE", "1024"))
+    RESEARCH_CACHE_FRESH_S: float = float(os.getenv("RESEARCH_CACHE_FRESH_S", "3600"))
+    RESEARCH_CACHE_STALE_S: float = float(os.getenv("RESEARCH_CACHE_STALE_S", str(7 * 86400)))
 
     # Models
-    SMOL_MODEL: str = os.getenv("AIML_MODEL_NANO")
-    CHEAP_MODEL: str = os.getenv("AIML_MODEL_NANO")
+    SMOL_MODEL: str | None = os.getenv("AIML_MODEL_NANO")
+    CHEAP_MODEL: str | None = os.getenv("AIML_MODEL_CHEAP", os.getenv("AIML_MODEL_NANO"))
     MAIN_MODEL: str = os.getenv("AIML_MODEL_HEAVY")
+    # Per-tier caps (core/llm/tiers.py); an unset tier model falls back to the next tier up
+    SMOL_MAX_TOKENS: int = int(os.getenv("SMOL_MAX_TOKENS", "400"))
+    CHEAP_MAX_TOKENS: int = int(os.getenv("CHEAP_MAX_TOKENS", "4000"))
+    MAIN_MAX_TOKENS: int = int(os.getenv("MAIN_MAX_TOKENS", "4000"))
+    SMOL_TIMEOUT_S: float = float(os.getenv("SMOL_TIMEOUT_S", "15"))
+    CHEAP_TIMEOUT_S: float = float(os.getenv("CHEAP_TIMEOUT_S", "45"))
+    MAIN_TIMEOUT_S: float = float(os.getenv("MAIN_TIMEOUT_S", "90"))
+    # Call-site overrides, e.g. "classify=main,score=cheap"
+    LLM_SITE_TIERS: str = os.getenv("LLM_SITE_TIERS", "")
+    # USD per million tokens for the tier report: {"model": [input, output]}
+    LLM_PRICES: str = os.getenv("LLM_PRICES", "{}")
+
+    # LLM gateway (core/llm/gateway.py): 0 disables a bucket
+    LLM_RPS: float = float(os.getenv("LLM_RPS", "0"))
+    LLM_BURST: float = float(os.getenv("LLM_BURST", "20"))
+    LLM_TPM: float = float(os.getenv("LLM_TPM", "0"))
+    LLM_CONCURRENCY: int = int(os.getenv("LLM_CONCURRENCY", "16"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_BACKOFF_S: float = float(os.getenv("LLM_BACKOFF_S", "0.5"))
+    LLM_BACKOFF_MAX_S: float = float(os.getenv("LLM_BACKOFF_MAX_S", "8"))
+    LLM_LATENCY_TARGET_S: float = float(os.getenv("LLM_LATENCY_TARGET_S", "30"))
+
+    # LLM response cache (deterministic calls only; see core/llm/cache.py)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "4096"))
+    LLM_CACHE_MAX_BYTES: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    LLM_CACHE_TTL_S: float = float(os.getenv("LLM_CACHE_TTL_S", "86400"))
+    LLM_CACHE_SQLITE_PATH: str | None = os.getenv("LLM_CACHE_SQLITE_PATH")
+
+    # Session store: "memory" (single process) or "sqlite" (shared by workers on one host)
+    SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "memory")
+    SESSION_SQLITE_PATH: str = os.getenv("SESSION_SQLITE_PATH", "sessions.sqlite")
+    SESSION_HOT_SIZE: int = int(os.getenv("SESSION_HOT_SIZE", "1024"))
+    SESSION_FLUSH_INTERVAL_S: float = float(os.getenv("SESSION_FLUSH_INTERVAL_S", "0.05"))
+    # In-memory eviction: idle sessions expire, and the LRU ones go once the byte estimate is over budget
+    SESSION_IDLE_TTL_S: float = float(os.getenv("SESSION_IDLE_TTL_S", str(6 * 3600)))
+    SESSION_MAX_BYTES: int = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+    SESSION_SWEEP_INTERVAL_S: float = float(os.getenv("SESSION_SWEEP_INTERVAL_S", "30"))
+
+    # Batch evaluation: starting and maximum concurrent items, adapted to provider 429s
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+    BATCH_MAX_ATTEMPTS: int = int(os.getenv("BATCH_MAX_ATTEMPTS", "4"))
+    BATCH_BACKOFF_S: float = float(os.getenv("BATCH_BACKOFF_S", "0.5"))
+
+    # Claims per packed fallacy/score request in bulk jobs
+    LLM_PACK_SIZE: int = int(os.getenv("LLM_PACK_SIZE", "8"))
+
+    # Per-turn traces kept in memory (GET /api/_debug/traces/{turn_id}); optional OpenTelemetry export
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "256"))
+    TRACE_MAX_SPANS: int = int(os.getenv("TRACE_MAX_SPANS", "1000"))
+    TRACE_OTEL_ENABLED: bool = os.getenv("TRACE_OTEL_ENABLED", "0") == "1"
 
     # Server
     APP_HOST: str = os.getenv("APP_HOST", "0.0.0.0")
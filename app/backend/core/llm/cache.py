@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Protocol
+
+from core.config import settings
+from core.utils.lru import TTLLRU
+
+def cache_key(model: str, system: str, user: str, temperature: float, max_tokens: int) -> str:
+    blob = json.dumps([model, system, user, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class CacheBackend(Protocol):
+    name: str
+    blocking: bool  # True -> called off the event loop
+
+    def get(self, key: str) -> Optional[str]: ...
+    def set(self, key: str, value: str) -> None: ...
+
+class MemoryBackend:
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_s: float):
+        self._lru = TTLLRU(max_entries=max_entries, max_bytes=max_bytes, ttl_s=ttl_s,
+                           sizeof=lambda v: len(v.encode("utf-8")))
+
+    def get(self, key: str) -> Optional[str]:
+        return self._lru.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._lru.set(key, value)
+
+class SqliteBackend:
+    """On-disk tier shared by every worker on the host."""
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: str, ttl_s: float):
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (k TEXT PRIMARY KEY, v TEXT NOT NULL, expires REAL NOT NULL)")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT v, expires FROM llm_cache WHERE k = ?", (key,)).fetchone()
+        if not row or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO llm_cache (k, v, expires) VALUES (?, ?, ?)",
+                             (key, value, time.time() + self.ttl_s))
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._db.execute("DELETE FROM llm_cache WHERE expires < ?", (time.time(),)).rowcount
+
+class LLMCache:
+    """Tiered response cache: first tier that has the key wins and fills the tiers above it."""
+
+    def __init__(self, tiers: List[CacheBackend], enabled: bool = True):
+        self.tiers = tiers
+        self.enabled = enabled
+        self.counters: Counter = Counter()
+
+    async def _call(self, tier: CacheBackend, fn, *args):
+        return await asyncio.to_thread(fn, *args) if tier.blocking else fn(*args)
+
+    async def get(self, key: str) -> Optional[str]:
+        for i, tier in enumerate(self.tiers):
+            value = await self._call(tier, tier.get, key)
+            if value is not None:
+                self.counters[f"hit_{tier.name}"] += 1
+                for upper in self.tiers[:i]:
+                    await self._call(upper, upper.set, key, value)
+                return value
+        self.counters["miss"] += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.counters["store"] += 1
+        for tier in self.tiers:
+            await self._call(tier, tier.set, key, value)
+
+    def stats(self) -> dict:
+        hits = sum(v for k, v in self.counters.items() if k.startswith("hit_"))
+        lookups = hits + self.counters["miss"]
+        return {
+            "enabled": self.enabled,
+            "tiers": [t.name for t in self.tiers],
+            "counters": dict(self.counters),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+def _build() -> LLMCache:
+    tiers: List[CacheBackend] = [MemoryBackend(settings.LLM_CACHE_MAX_ENTRIES,
+                                               settings.LLM_CACHE_MAX_BYTES,
+                                               settings.LLM_CACHE_TTL_S)]
+    if settings.LLM_CACHE_SQLITE_PATH:
+        tiers.append(SqliteBackend(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_TTL_S))
+    return LLMCache(tiers, enabled=settings.LLM_CACHE_ENABLED)
+
+llm_cache = _build()
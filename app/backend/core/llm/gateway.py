@@ -0,0 +1,191 @@
+import asyncio
+import random
+import weakref
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.llm.cache import cache_key
+from core.llm.prompts import PROMPT_TOKENS
+from core.telemetry.calls import instrument, record_retry, record_tokens
+from core.telemetry.metrics import registry
+from core.utils.limiter import AdaptiveLimiter, TokenBucket, is_rate_limited, is_transient, retry_after_s
+
+LLM_REQUESTS = registry.counter("llm_requests_total", "Upstream LLM requests by outcome", labels=("tier", "outcome"))
+LLM_COALESCED = registry.counter("llm_coalesced_total", "LLM calls served by an identical in-flight request")
+LLM_LATENCY = registry.histogram("llm_request_seconds", "Upstream LLM request latency", labels=("tier",))
+LLM_TOKENS = registry.counter("llm_tokens_total", "Tokens billed by tier (estimated when usage is absent)",
+                              labels=("tier", "kind"))
+LLM_QUEUE = registry.histogram("llm_admission_wait_seconds", "Time spent waiting for rate limits and a slot")
+LLM_LIMIT = registry.gauge("llm_concurrency_limit", "Adaptive upstream LLM concurrency")
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    # ~4 characters per token for the prompt, plus the completion budget
+    return sum(len(m.get("content") or "") for m in messages) // 4 + max_tokens
+
+class StreamInterrupted(Exception):
+    """A streaming call failed after deltas were delivered. Not transient:
+    a retry would hand `on_delta` the reply again from the start."""
+
+class _LoopState:
+    def __init__(self, gw: "LLMGateway"):
+        self.limiter = AdaptiveLimiter(initial=gw.initial_concurrency, max_limit=gw.max_concurrency,
+                                       cooldown_s=gw.cooldown_s, on_change=LLM_LIMIT.set)
+        self.requests = TokenBucket(gw.rps, gw.burst) if gw.rps > 0 else None
+        self.tokens = TokenBucket(gw.tpm / 60.0, gw.tpm) if gw.tpm > 0 else None
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+class LLMGateway:
+    """Client-side admission control in front of the chat completions API.
+
+    Every upstream request passes a request token bucket and a token bucket
+    (prompt estimate + max_tokens), then an AIMD concurrency limit. The limit
+    halves on 429s and shrinks on calls slower than `latency_target_s`.
+    Transient failures are retried with full-jitter exponential backoff (or
+    the provider's Retry-After). Identical concurrent non-streaming requests
+    share one upstream call.
+    """
+
+    def __init__(self, client_fn: Callable[[], Any], rps: float = 0, burst: float = 1, tpm: float = 0,
+                 initial_concurrency: int = 8, max_concurrency: int = 32, max_retries: int = 4,
+                 backoff_s: float = 0.5, backoff_max_s: float = 8.0, latency_target_s: float = 0,
+                 cooldown_s: float = 1.0):
+        self._client_fn = client_fn
+        self.rps, self.burst, self.tpm = rps, burst, tpm
+        self.initial_concurrency, self.max_concurrency = initial_concurrency, max_concurrency
+        self.max_retries = max_retries
+        self.backoff_s, self.backoff_max_s = backoff_s, backoff_max_s
+        self.latency_target_s = latency_target_s
+        self.cooldown_s = cooldown_s
+        # asyncio primitives belong to one loop; production has one, tests many
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        st = self._states.get(loop)
+        if st is None:
+            st = self._states[loop] = _LoopState(self)
+        return st
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        return self._state().limiter
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                       max_tokens: int, timeout_s: Optional[float] = None, tier: str = "main",
+                       site: str = "") -> str:
+        st = self._state()
+        key = cache_key(model, messages[0]["content"], messages[-1]["content"], temperature, max_tokens)
+        fut = st.inflight.get(key)
+        if fut is not None:
+            LLM_COALESCED.inc()
+        else:
+            fut = st.inflight[key] = asyncio.ensure_future(self._with_retries(
+                st, model, messages, temperature, max_tokens, timeout_s, tier, site))
+            fut.add_done_callback(lambda f, k=key: st.inflight.pop(k, None) if st.inflight.get(k) is f else None)
+        # shield: one caller going away must not cancel the others' request
+        return await asyncio.shield(fut)
+
+    async def stream(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+                     on_delta: Callable[[str], None], timeout_s: Optional[float] = None, tier: str = "main",
+                     site: str = "") -> str:
+        """Streaming completion; retried only until the first chunk arrives.
+        A failure after that raises StreamInterrupted."""
+        async def call(client):
+            parts, usage = [], None
+            stream = await client.chat.completions.create(model=model, messages=messages, temperature=temperature,
+                                                          max_tokens=max_tokens, stream=True,
+                                                          stream_options={"include_usage": True},
+                                                          **_timeout(timeout_s))
+            try:
+                async for chunk in stream:
+                    usage = getattr(chunk, "usage", None) or usage
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        on_delta(delta)
+            except Exception as e:
+                if parts:
+                    raise StreamInterrupted(f"stream failed after {len(parts)} chunks: {e!r}") from e
+                raise
+            return "".join(parts), usage
+        return await self._with_retries(self._state(), model, messages, temperature, max_tokens, timeout_s, tier,
+                                        site, call=call)
+
+    async def _admit(self, st: _LoopState, tokens: int) -> None:
+        t0 = perf_counter()
+        if st.requests is not None:
+            await st.requests.take(1)
+        if st.tokens is not None:
+            await st.tokens.take(tokens)
+        await st.limiter.acquire()
+        LLM_QUEUE.observe(perf_counter() - t0)
+
+    def _backoff(self, attempt: int, e: BaseException) -> float:
+        hinted = retry_after_s(e)
+        if hinted is not None:
+            return min(hinted, self.backoff_max_s)
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_s * (2 ** attempt)))
+
+    async def _with_retries(self, st: _LoopState, model: str, messages: List[Dict[str, str]],
+                            temperature: float, max_tokens: int, timeout_s: Optional[float], tier: str,
+                            site: str, call: Optional[Callable] = None) -> str:
+        tokens = estimate_tokens(messages, max_tokens)
+        for attempt in range(self.max_retries + 1):
+            await self._admit(st, tokens)
+            throttled = slow = False
+            try:
+                with instrument(site or tier, model) as rec:
+                    client = self._client_fn()
+                    if call is not None:
+                        out, usage = await call(client)
+                    else:
+                        resp = await client.chat.completions.create(model=model, messages=messages,
+                                                                    temperature=temperature, max_tokens=max_tokens,
+                                                                    **_timeout(timeout_s))
+                        out, usage = resp.choices[0].message.content, getattr(resp, "usage", None)
+                    prompt, completion, cached = _count_tokens(tier, site or tier, model, messages, out, usage)
+                    rec.span.set(attempt=attempt, prompt_tokens=prompt, completion_tokens=completion,
+                                 cached_tokens=cached)
+                LLM_LATENCY.observe(rec.seconds, tier=tier)
+                slow = bool(self.latency_target_s) and rec.seconds > self.latency_target_s
+                LLM_REQUESTS.inc(tier=tier, outcome="ok")
+                return out
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                if not is_transient(e) or attempt == self.max_retries:
+                    LLM_REQUESTS.inc(tier=tier, outcome="throttled" if throttled else "error")
+                    raise
+                record_retry(site or tier, "429" if throttled else "transient")
+                delay = self._backoff(attempt, e)
+            finally:
+                await st.limiter.release(throttled=throttled, slow=slow)
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+def _timeout(timeout_s: Optional[float]) -> dict:
+    return {"timeout": timeout_s} if timeout_s else {}
+
+def _count_tokens(tier: str, site: str, model: str, messages: List[Dict[str, str]], out: Optional[str],
+                  usage: Any) -> Tuple[int, int, int]:
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+    if prompt is None:
+        prompt = estimate_tokens(messages, 0)
+    if completion is None:
+        completion = len(out or "") // 4
+    LLM_TOKENS.inc(prompt, tier=tier, kind="prompt")
+    LLM_TOKENS.inc(completion, tier=tier, kind="completion")
+    LLM_TOKENS.inc(cached, tier=tier, kind="cached")
+    record_tokens(site, model, prompt, completion, cached)
+    # the system message is the static prefix (core/llm/prompts.py)
+    PROMPT_TOKENS.inc(estimate_tokens(messages[:1], 0), site=site, part="prefix")
+    PROMPT_TOKENS.inc(estimate_tokens(messages[1:], 0), site=site, part="suffix")
+    return prompt, completion, cached
+
+def build_gateway(client_fn: Callable[[], Any]) -> LLMGateway:
+    return LLMGateway(client_fn, rps=settings.LLM_RPS, burst=settings.LLM_BURST, tpm=settings.LLM_TPM,
+                      initial_concurrency=settings.LLM_CONCURRENCY, max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                      max_retries=settings.LLM_MAX_RETRIES, backoff_s=settings.LLM_BACKOFF_S,
+                      backoff_max_s=settings.LLM_BACKOFF_MAX_S, latency_target_s=settings.LLM_LATENCY_TARGET_S)
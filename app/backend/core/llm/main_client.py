@@ -1,21 +1,62 @@
 import os
-from openai import OpenAI
-from core.config import settings
+from typing import Callable
+from openai import AsyncOpenAI
+from core.llm.cache import llm_cache, cache_key
+from core.llm.gateway import build_gateway
+from core.llm.tiers import route
 
-client = OpenAI(
+client = AsyncOpenAI(
     base_url=os.getenv("AIML_BASE_URL"),
     api_key=os.getenv("AIML_API_KEY"),
+    max_retries=0,  # the gateway retries, with backoff shared across callers
 )
 
-def chat(system: str, user: str, temperature: float = 0.7, max_tokens: int = 1600) -> str:
-    response = client.chat.completions.create(
-        model=settings.MAIN_MODEL,
-        messages=[
+# resolves `client` per call so benches/tests can swap it
+gateway = build_gateway(lambda: client)
+
+async def chat(system: str, user: str, temperature: float = 0.7, max_tokens: int = 1600,
+               cache: bool | None = None, site: str = "executor") -> str:
+    # `site` picks the model tier (core/llm/tiers.py).
+    # Deterministic (temperature 0) calls are cached by default; pass cache=False to opt out.
+    r = route(site, max_tokens)
+    use_cache = llm_cache.enabled and (temperature == 0.0 if cache is None else cache)
+    if use_cache:
+        key = cache_key(r.model, system, user, temperature, r.max_tokens)
+        hit = await llm_cache.get(key)
+        if hit is not None:
+            return hit
+
+    content = await gateway.complete(
+        r.model,
+        [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
         ],
         temperature=temperature,
-        max_tokens=max_tokens,
+        max_tokens=r.max_tokens,
+        timeout_s=r.timeout_s,
+        tier=r.tier.value,
+        site=site,
     )
+    if use_cache and content:
+        await llm_cache.set(key, content)
+    return content
 
-    return response.choices[0].message.content
+async def chat_stream(system: str, user: str, on_delta: Callable[[str], None],
+                      temperature: float = 0.7, max_tokens: int = 1600, site: str = "executor") -> str:
+    """Streaming completion: `on_delta` gets each content chunk as it arrives;
+    the full reply is returned at the end. Never cached."""
+    r = route(site, max_tokens)
+    return await gateway.stream(
+        r.model,
+        [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        temperature=temperature,
+        max_tokens=r.max_tokens,
+        on_delta=on_delta,
+        timeout_s=r.timeout_s,
+        tier=r.tier.value,
+        site=site,
+    )
@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from core.telemetry.calls import CALL_TOKENS
+from core.telemetry.metrics import registry
+
+# Static instructions go in the system message, built once at import so the
+# prefix is byte-identical on every call and provider prefix caches can match
+# it. Only the per-call variables (the claim, the flags) go in the user message.
+
+_DIR = Path("prompts")
+
+PROMPT_TOKENS = registry.counter("llm_prompt_tokens_total", "Estimated prompt tokens by call site: system prefix / user suffix",
+                                 labels=("site", "part"))
+
+class Prompt(NamedTuple):
+    name: str
+    site: str
+    system: str
+
+    def user(self, **sections: str) -> str:
+        return "\n\n".join(f"{k}:\n{v}" for k, v in sections.items())
+
+_PROMPTS: Dict[str, Prompt] = {}
+
+def register(name: str, role: str, file: Optional[str] = None, site: Optional[str] = None) -> Prompt:
+    """`role` plus the contents of prompts/<file> become the system prefix."""
+    system = role if file is None else role + "\n\n" + (_DIR / file).read_text(encoding="utf-8").strip()
+    p = Prompt(name, site or name, system)
+    if _PROMPTS.setdefault(name, p) != p:
+        raise ValueError(f"prompt {name!r} already registered with different text")
+    return p
+
+def get(name: str) -> Prompt:
+    return _PROMPTS[name]
+
+def prompt_report() -> dict:
+    """Per call site: estimated prefix/suffix split and provider-reported cached tokens."""
+    parts: Dict[str, Dict[str, int]] = {}
+    for (site, part), v in PROMPT_TOKENS.samples().items():
+        parts.setdefault(site, {})[part] = int(v)
+    for (site, _, kind), v in CALL_TOKENS.samples().items():
+        if kind in ("prompt", "cached") and site in parts:
+            key = "billed" if kind == "prompt" else kind
+            parts[site][key] = parts[site].get(key, 0) + int(v)
+    for row in parts.values():
+        est = row.get("prefix", 0) + row.get("suffix", 0)
+        row["prefix_share"] = round(row.get("prefix", 0) / est, 3) if est else None
+        row["cached_share"] = round(row.get("cached", 0) / row["billed"], 3) if row.get("billed") else None
+    return {"sites": parts,
+            "prompts": {p.name: {"site": p.site, "prefix_chars": len(p.system)} for p in _PROMPTS.values()}}
@@ -0,0 +1,86 @@
+import json
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
+from core.config import settings
+from core.llm.gateway import LLM_LATENCY, LLM_TOKENS
+from core.telemetry.metrics import registry
+
+# Every chat() call names its call site; the site picks a tier and the tier
+# picks the model, a max_tokens cap and the request timeout. Short structured
+# steps (routing, extraction) go to the smallest model, list-shaped judgements
+# to the cheap one, user-facing prose stays on the main model.
+
+class Tier(str, Enum):
+    smol = "smol"
+    cheap = "cheap"
+    main = "main"
+
+SITE_TIERS: Dict[str, Tier] = {
+    "triage": Tier.smol,
+    "planner": Tier.smol,
+    "supervisor": Tier.smol,
+    "extract": Tier.smol,
+    "fallacies": Tier.cheap,
+    "classify": Tier.cheap,
+    "score": Tier.main,
+    "executor": Tier.main,
+}
+
+class Route(NamedTuple):
+    site: str
+    tier: Tier
+    model: str
+    max_tokens: int
+    timeout_s: float
+
+LLM_ROUTED = registry.counter("llm_routed_total", "chat() calls by call site and tier", labels=("site", "tier"))
+
+def _overrides() -> Dict[str, Tier]:
+    out = {}
+    for part in filter(None, (p.strip() for p in settings.LLM_SITE_TIERS.split(","))):
+        site, _, tier = part.partition("=")
+        out[site.strip()] = Tier(tier.strip())
+    return out
+
+def tier_model(tier: Tier) -> str:
+    chain = {Tier.smol: (settings.SMOL_MODEL, settings.CHEAP_MODEL),
+             Tier.cheap: (settings.CHEAP_MODEL,),
+             Tier.main: ()}[tier]
+    return next((m for m in chain if m), settings.MAIN_MODEL)
+
+def route(site: str, max_tokens: Optional[int] = None) -> Route:
+    """Resolve a call site; unknown sites run on the main tier."""
+    tier = _overrides().get(site) or SITE_TIERS.get(site, Tier.main)
+    cap = getattr(settings, f"{tier.name.upper()}_MAX_TOKENS")
+    LLM_ROUTED.inc(site=site, tier=tier.value)
+    return Route(site, tier, tier_model(tier), min(max_tokens or cap, cap),
+                 getattr(settings, f"{tier.name.upper()}_TIMEOUT_S"))
+
+def _cost(model: str, prompt: float, completion: float, prices: dict) -> Optional[float]:
+    price = prices.get(model)
+    if price is None:
+        return None
+    return round((prompt * price[0] + completion * price[1]) / 1e6, 6)
+
+def tier_report() -> dict:
+    """Upstream calls, latency, tokens and cost per tier, with what the same
+    tokens would have cost on the main model."""
+    prices = json.loads(settings.LLM_PRICES or "{}")
+    tiers = {}
+    for tier in Tier:
+        n = LLM_LATENCY.count(tier=tier.value)
+        prompt = LLM_TOKENS.value(tier=tier.value, kind="prompt")
+        completion = LLM_TOKENS.value(tier=tier.value, kind="completion")
+        model = tier_model(tier)
+        row = {"model": model, "calls": n,
+               "mean_latency_s": round(LLM_LATENCY.sum(tier=tier.value) / n, 4) if n else None,
+               "prompt_tokens": int(prompt), "completion_tokens": int(completion),
+               "cached_tokens": int(LLM_TOKENS.value(tier=tier.value, kind="cached")),
+               "cost_usd": _cost(model, prompt, completion, prices),
+               "cost_on_main_usd": _cost(settings.MAIN_MODEL, prompt, completion, prices)}
+        if row["cost_usd"] is not None and row["cost_on_main_usd"] is not None:
+            row["savings_usd"] = round(row["cost_on_main_usd"] - row["cost_usd"], 6)
+        tiers[tier.value] = row
+    sites = {f"{site}:{tier}": int(v) for (site, tier), v in LLM_ROUTED.samples().items()}
+    return {"tiers": tiers, "sites": sites}
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from core.telemetry.metrics import registry
+
+SUBSCRIBERS = registry.gauge("column_subscribers", "Open column-update subscriptions")
+PUBLISHED = registry.counter("column_updates_published_total", "Column updates published to sessions with viewers")
+LAGGED = registry.counter("column_subscriber_lag_total", "Times a slow subscriber overflowed and was resynced")
+
+# Marker a lagging subscriber receives instead of the updates it missed.
+RESYNC = object()
+
+class Subscriber:
+    """One viewer of a session. Updates are (seq, json) pairs; when the
+    bounded queue overflows the backlog is dropped and the consumer gets
+    RESYNC, so it can catch up from its last seq in one read instead of the
+    publisher buffering without limit."""
+
+    def __init__(self, sid: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.sid = sid
+        self.loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    def offer(self, item: Tuple[int, str]) -> None:
+        if self.lagged:
+            return  # the resync will cover it
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.lagged = True
+            LAGGED.inc()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC)
+
+    async def get(self):
+        item = await self._queue.get()
+        if item is RESYNC:
+            self.lagged = False
+        return item
+
+class SessionHub:
+    """Fan-out of column updates to the subscribers of each session.
+
+    `publish` may be called from any thread; the update is serialized once by
+    the caller and the same string is handed to every subscriber on its own loop.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subs: Dict[str, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def has_subscribers(self, sid: str) -> bool:
+        return sid in self._subs
+
+    def subscribe(self, sid: str) -> Subscriber:
+        sub = Subscriber(sid, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subs.setdefault(sid, set()).add(sub)
+        SUBSCRIBERS.inc()
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.sid)
+            if subs is None or sub not in subs:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.sid]
+        SUBSCRIBERS.dec()
+
+    def publish(self, sid: str, seq: int, data: str) -> None:
+        with self._lock:
+            subs = list(self._subs.get(sid, ()))
+        if not subs:
+            return
+        PUBLISHED.inc()
+        try:
+            current: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for sub in subs:
+            if sub.loop is current:
+                sub.offer((seq, data))
+            elif not sub.loop.is_closed():
+                sub.loop.call_soon_threadsafe(sub.offer, (seq, data))
+
+hub = SessionHub()
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+from collections import OrderedDict
 from enum import Enum
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
@@ -37,6 +38,7 @@ class Source(BaseModel):
     note: Optional[str] = None
     reliability: SourceReliability = SourceReliability.medium
     tag: Optional[EvidenceTag] = None
+    seq: int = 0  # session sequence number of the last add/update
 
 class Fallacy(BaseModel):
     code: str
@@ -53,6 +55,7 @@ class Event(BaseModel):
     ts: datetime = Field(default_factory=datetime.utcnow)
     column: Column
     payload:  Union[Dict[str, Any], str]
+    seq: int = 0  # session sequence number, set when stored
 
 class SessionState(BaseModel):
     mode: Mode
@@ -65,6 +68,12 @@ class SessionState(BaseModel):
     last_plan: Optional[List[str]] = None
     did_fallacy_on_this_claim: bool = False
     has_new_claim_this_turn: bool = False
+    seq: int = 0  # bumped by every stored event and source add/update
+    # canonical URL -> index into `sources`, source sid -> index, and source
+    # indexes in order of last change; see core/state.py
+    _source_by_url: Optional[Dict[str, int]] = PrivateAttr(default=None)
+    _source_by_sid: Optional[Dict[str, int]] = PrivateAttr(default=None)
+    _source_changes: Optional["OrderedDict[int, None]"] = PrivateAttr(default=None)
 
 class CreateSessionOut(BaseModel):
     session_id: str
@@ -78,8 +87,21 @@ class ChatOut(BaseModel):
     events: List[Event]
     score: Optional[Score] = None
     fallacies: Optional[List[Fallacy]] = None
+    turn_id: Optional[str] = None  # GET /api/_debug/traces/{turn_id}
 
 class ColumnsSnapshot(BaseModel):
     PRO: List[Event]
     CON: List[Event]
     SOURCES: List[Source]
+    seq: int = 0    # pass back as ?since= to get only what changed after this
+    since: int = 0  # 0: full snapshot; otherwise PRO/CON are new and SOURCES added or updated after `since`
+
+class BatchItem(BaseModel):
+    id: Optional[str] = None  # echoed back so callers can match results
+    text: str = Field(min_length=1)
+
+class BatchEvaluateIn(BaseModel):
+    mode: Mode
+    items: List[BatchItem] = Field(min_length=1, max_length=1000)
+    fallacy_check: bool = True  # debate mode only, as in chat
+    concurrency: Optional[int] = Field(default=None, ge=1)
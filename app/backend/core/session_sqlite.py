@@ -0,0 +1,365 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Tuple, Union
+
+from core.schemas import SessionState, Mode, Event, Column, Source
+from core.state import SessionStore
+from core.telemetry.logger import logger
+from core.utils.lru import TTLLRU
+
+# Fields stored as one JSON blob per session; pro/con/sources are rebuilt from the log.
+_LOG_FIELDS = {"pro", "con", "sources"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    sid     TEXT PRIMARY KEY,
+    mode    TEXT NOT NULL,
+    state   TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    seq     INTEGER NOT NULL DEFAULT 0,  -- last seq handed out; only advanced inside flush
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_log (
+    id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    sid    TEXT NOT NULL,
+    kind   TEXT NOT NULL,  -- 'event' | 'sources'
+    body   TEXT NOT NULL,
+    origin TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_log_sid ON session_log (sid, id);
+"""
+
+_MAX_RETRY_S = 5.0
+
+class _Hot:
+    __slots__ = ("state", "upto", "version")
+
+    def __init__(self, state: SessionState, upto: int, version: int):
+        self.state = state
+        self.upto = upto        # highest log id applied to `state`
+        self.version = version  # sessions.version when `state` was last synced
+
+# a queued log row: an Event, or the Source inputs of one add_sources call
+# with the registry sid each one landed on
+_Pending = Union[Event, Tuple[List[Source], List[str]]]
+
+class SqliteSessionStore(SessionStore):
+    """Embedded SQLite (WAL) backend that several workers can share.
+
+    PRO/CON events and sources are appended to `session_log` rather than
+    rewriting the whole SessionState. Appends and state saves are applied to
+    a hot in-process copy immediately and written behind in batches by a
+    flusher thread. A `get` checks the session's version row (one indexed
+    point read) and replays only log rows written by other workers since.
+    Other workers therefore see a write within about `flush_interval_s`.
+
+    Sequence numbers are handed out by the flush transaction from the
+    session row, so workers never reuse one and each session's log is in seq
+    order. Until then the hot copy numbers its own writes provisionally;
+    `settled` (columns reads, ETags) waits up to `settle_timeout_s` for the
+    flusher to write them, and column pushes go out after the flush.
+
+    Request paths never open a write transaction: a contended write lock
+    only ever stalls the flusher thread. A hot copy with unflushed writes is
+    kept aside until they are on disk, so evicting it needs no flush.
+    """
+
+    def __init__(self, path: str, hot_sessions: int = 1024, flush_interval_s: float = 0.05,
+                 max_batch: int = 512, settle_timeout_s: float = 5.0):
+        self.path = path
+        self.origin = uuid.uuid4().hex[:12]
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self.settle_timeout_s = settle_timeout_s
+        self._hot = TTLLRU(max_entries=hot_sessions)
+        self._wdb = self._connect()
+        self._wdb.executescript(_SCHEMA)
+        self._migrate()
+        self._rdb = self._connect()
+        self._wlock = threading.Lock()
+        self._rlock = threading.Lock()
+        self._plock = threading.Lock()
+        self._pending_log: List[Tuple[str, str, _Pending]] = []
+        self._pending_state: Dict[str, str] = {}
+        self._dirty: Dict[str, _Hot] = {}  # hot copies with writes not yet committed
+        self._failed = 0
+        self._settle = threading.Condition(self._plock)
+        self._wake = threading.Event()
+        self._hurry = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="session-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _migrate(self) -> None:
+        cols = {row[1] for row in self._wdb.execute("PRAGMA table_info(sessions)")}
+        if "seq" not in cols:  # files from before the seq column: start from the stored state's seq
+            self._wdb.execute("ALTER TABLE sessions ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            self._wdb.execute("UPDATE sessions SET seq = COALESCE(json_extract(state, '$.seq'), 0)")
+
+    # --- SessionStore -------------------------------------------------------
+
+    def create(self, mode: Mode) -> str:
+        sid = uuid.uuid4().hex
+        st = SessionState(mode=mode)
+        # write-through: another worker may get this id on the very next request
+        with self._wlock:
+            self._wdb.execute("INSERT INTO sessions (sid, mode, state, version, updated) VALUES (?, ?, ?, 0, ?)",
+                              (sid, mode.value, self._state_blob(st), time.time()))
+        self._hot.set(sid, _Hot(st, 0, 0))
+        return sid
+
+    def get(self, sid: str) -> SessionState:
+        return self._get_hot(sid).state
+
+    def append_event(self, sid: str, ev: Event):
+        hot = self._get_hot(sid)
+        self._apply_event(hot.state, ev)
+        if ev.column != Column.SOURCES:
+            self._enqueue_log(sid, "event", ev, hot)
+
+    def add_sources(self, sid: str, sources: List[Source]) -> List[str]:
+        hot = self._get_hot(sid)
+        sids, _ = self._apply_sources(hot.state, sources)
+        # log every input: replaying merges duplicates the same way
+        self._enqueue_log(sid, "sources", (list(sources), sids), hot)
+        return sids
+
+    def settled(self, sid: str) -> SessionState:
+        # the flusher's own pushes come after its flush: nothing to wait for
+        if threading.current_thread() is not self._flusher:
+            with self._settle:
+                if sid in self._dirty:
+                    failed = self._failed
+                    self._hurry.set()
+                    self._wake.set()
+                    # a failed flush is retried behind; readers get the provisional seqs meanwhile
+                    self._settle.wait_for(lambda: sid not in self._dirty or self._failed != failed,
+                                          self.settle_timeout_s)
+        return self.get(sid)
+
+    def save(self, sid: str, st: SessionState) -> None:
+        hot = self._hot.get(sid)
+        with self._plock:
+            self._pending_state[sid] = self._state_blob(st)
+            if hot is not None and hot.state is st:
+                self._dirty[sid] = hot
+        self._wake.set()
+
+    def __len__(self) -> int:
+        return len(self._hot)
+
+    # --- loading ------------------------------------------------------------
+
+    def _get_hot(self, sid: str) -> _Hot:
+        hot = self._hot.get(sid)
+        with self._rlock:
+            row = self._rdb.execute("SELECT version FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        if row is None:
+            self._hot.pop(sid)
+            raise KeyError(sid)
+        if hot is None:
+            with self._plock:
+                hot = self._dirty.get(sid)
+            if hot is None:
+                return self._load(sid)
+            # evicted with writes not yet on disk: the copy that holds them comes back
+            self._hot.set(sid, hot)
+        if row[0] != hot.version and not self._has_pending(sid):
+            self._catch_up(sid, hot)
+        return hot
+
+    @staticmethod
+    def _state_blob(st: SessionState) -> str:
+        return st.model_dump_json(exclude=_LOG_FIELDS)
+
+    def _replay(self, st: SessionState, rows) -> int:
+        upto = 0
+        for log_id, kind, body in rows:
+            if kind == "event":
+                self._apply_event(st, Event.model_validate_json(body))
+            else:
+                self._apply_sources(st, [Source(**s) for s in json.loads(body)])
+            upto = log_id
+        return upto
+
+    def _load(self, sid: str) -> _Hot:
+        with self._rlock:
+            self._rdb.execute("BEGIN")
+            try:
+                state, version, seq = self._rdb.execute(
+                    "SELECT state, version, seq FROM sessions WHERE sid = ?", (sid,)).fetchone()
+                rows = self._rdb.execute(
+                    "SELECT id, kind, body FROM session_log WHERE sid = ? ORDER BY id", (sid,)).fetchall()
+            finally:
+                self._rdb.execute("COMMIT")
+        st = SessionState.model_validate_json(state)
+        hot = _Hot(st, self._replay(st, rows), version)
+        st.seq = seq
+        self._hot.set(sid, hot)
+        return hot
+
+    def _catch_up(self, sid: str, hot: _Hot) -> None:
+        with self._rlock:
+            self._rdb.execute("BEGIN")
+            try:
+                state, version, seq = self._rdb.execute(
+                    "SELECT state, version, seq FROM sessions WHERE sid = ?", (sid,)).fetchone()
+                rows = self._rdb.execute(
+                    "SELECT id, kind, body, origin FROM session_log WHERE sid = ? AND id > ? ORDER BY id",
+                    (sid, hot.upto)).fetchall()
+            finally:
+                self._rdb.execute("COMMIT")
+        # rows we wrote ourselves are already applied to the hot copy; foreign
+        # ones may sort before them and are inserted in seq order
+        foreign = [(i, k, b) for i, k, b, o in rows if o != self.origin]
+        self._replay(hot.state, foreign)
+        # scalars are last-writer-wins; update in place so callers' references stay live
+        fresh = SessionState.model_validate_json(state)
+        for field in SessionState.model_fields:
+            if field not in _LOG_FIELDS and field != "seq":
+                setattr(hot.state, field, getattr(fresh, field))
+        hot.state.seq = seq  # the hot copy now holds every row up to it
+        hot.upto = rows[-1][0] if rows else hot.upto
+        hot.version = version
+
+    # --- write-behind -------------------------------------------------------
+
+    def _enqueue_log(self, sid: str, kind: str, item: _Pending, hot: _Hot) -> None:
+        with self._plock:
+            self._pending_log.append((sid, kind, item))
+            self._dirty[sid] = hot
+            if len(self._pending_log) >= self.max_batch:
+                self._hurry.set()
+        self._wake.set()
+
+    def _has_pending(self, sid: str) -> bool:
+        with self._plock:
+            return sid in self._pending_state or any(p[0] == sid for p in self._pending_log)
+
+    def flush(self) -> int:
+        """Number pending log rows and write them with the state saves in one transaction."""
+        with self._wlock:
+            with self._plock:
+                log, self._pending_log = self._pending_log, []
+                states, self._pending_state = self._pending_state, {}
+                self._hurry.clear()  # whoever hurried us is served by this batch
+            if not log and not states:
+                return 0
+            now = time.time()
+            touched = list({sid: None for sid, _, _ in log} | dict.fromkeys(states))
+            marks = ",".join("?" * len(touched))
+            try:
+                self._wdb.execute("BEGIN IMMEDIATE")  # may wait out another worker's flush, then fail
+                # the write lock serializes every worker's flush, so the session
+                # row is the one place seqs come from
+                seqs = dict(self._wdb.execute(f"SELECT sid, seq FROM sessions WHERE sid IN ({marks})", touched))
+                before = dict(seqs)
+                rows = [(sid, kind, self._number(sid, kind, item, seqs), self.origin) for sid, kind, item in log
+                        if sid in seqs]
+                self._wdb.executemany("INSERT INTO session_log (sid, kind, body, origin) VALUES (?, ?, ?, ?)", rows)
+                for sid, blob in states.items():
+                    self._wdb.execute("UPDATE sessions SET state = ? WHERE sid = ?", (blob, sid))
+                self._wdb.executemany("UPDATE sessions SET version = version + 1, seq = ?, updated = ? WHERE sid = ?",
+                                      [(seqs[sid], now, sid) for sid in touched if sid in seqs])
+                synced = {sid: (v, upto) for sid, v, upto in self._wdb.execute(
+                    "SELECT sid, version, (SELECT MAX(id) FROM session_log l WHERE l.sid = s.sid) "
+                    f"FROM sessions s WHERE sid IN ({marks})", touched)}
+                self._wdb.execute("COMMIT")
+            except Exception:
+                if self._wdb.in_transaction:
+                    self._wdb.execute("ROLLBACK")
+                with self._plock:  # put the batch back in front for the next attempt
+                    self._pending_log[:0] = log
+                    for sid, blob in states.items():
+                        self._pending_state.setdefault(sid, blob)
+                    self._failed += 1
+                    self._settle.notify_all()
+                raise
+            for sid, (version, upto) in synced.items():
+                hot = self._hot.get(sid)
+                # if nobody else wrote in between, the hot copy is exactly what is on disk;
+                # otherwise the next get() replays the other rows in front of ours
+                if hot is not None and version == hot.version + 1:
+                    hot.version, hot.upto = version, upto or hot.upto
+                    hot.state.seq = max(hot.state.seq, seqs[sid])
+            with self._plock:
+                pending = {p[0] for p in self._pending_log} | set(self._pending_state)
+                for sid in touched:
+                    if sid not in pending:
+                        self._dirty.pop(sid, None)
+                self._settle.notify_all()
+        try:
+            self._push(touched, before)
+        except Exception:
+            # the batch is committed; a push that fails is not a failed flush
+            logger.exception("column push failed")
+        return len(log) + len(states)
+
+    def _number(self, sid: str, kind: str, item: _Pending, seqs: Dict[str, int]) -> str:
+        """Give a queued row its final seqs (in place, so the hot copy agrees) and serialize it."""
+        if kind == "event":
+            seqs[sid] += 1
+            item.seq = seqs[sid]
+            return item.model_dump_json()
+        sources, reg_sids = item
+        hot = self._hot.get(sid) or self._dirty.get(sid)
+        by_sid = self._source_index(hot.state)[1] if hot is not None else {}
+        for src, reg in zip(sources, reg_sids):
+            seqs[sid] += 1
+            src.seq = seqs[sid]
+            i = by_sid.get(reg)
+            if i is not None:  # a duplicate merged into an existing registry entry
+                cur = hot.state.sources[i]
+                cur.seq = max(cur.seq, src.seq)
+        return json.dumps([{**s.model_dump(mode="json", exclude_unset=True), "sid": s.sid, "seq": s.seq}
+                           for s in sources], ensure_ascii=False)
+
+    def _push(self, sids: List[str], before: Dict[str, int]) -> None:
+        # pushes carry final seqs, so they go out once a flush has numbered them
+        if self.hub is None:
+            return
+        for sid in sids:
+            if sid in before and self.hub.has_subscribers(sid):
+                try:
+                    snap = self.export_columns(sid, since=before[sid])
+                except KeyError:
+                    continue
+                if snap.seq > before[sid]:
+                    self.hub.publish(sid, snap.seq, snap.model_dump_json())
+
+    def _flush_loop(self) -> None:
+        retry_s = 0.0
+        while not self._closed:
+            # after a failure, come back on our own: no new write may ever wake us
+            self._wake.wait(retry_s or None)
+            self._wake.clear()
+            # let a burst of writes coalesce into one batch, unless a reader is waiting
+            self._hurry.wait(self.flush_interval_s)
+            try:
+                self.flush()
+                retry_s = 0.0
+            except Exception:
+                # the batch was requeued (e.g. SQLITE_BUSY, disk full); back off and retry.
+                # Anything escaping here would end write-behind for good.
+                retry_s = min(max(2 * retry_s, self.flush_interval_s), _MAX_RETRY_S)
+                logger.exception("session flush failed; retrying in %.2fs", retry_s)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._hurry.set()
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
@@ -1,39 +1,319 @@
-from typing import Dict, List
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple
 import uuid
+from core.config import settings
+from core.pubsub import SessionHub, hub
+from core.telemetry.logger import logger
+from core.telemetry.metrics import registry
+from core.utils.urls import canonical_url
 from core.schemas import SessionState, Mode, Event, Column, Source, ColumnsSnapshot
 
-class SessionStore:
-    def __init__(self):
-        self._by_id: Dict[str, SessionState] = {}
+SESSIONS_LIVE = registry.gauge("sessions_live", "Sessions held by this process")
+SESSIONS_EVICTED = registry.counter("sessions_evicted_total", "Sessions evicted from memory", labels=("reason",))
+SESSION_BYTES = registry.gauge("session_bytes", "Approximate bytes held by in-memory sessions")
 
-    def create(self, mode: Mode) -> str:
-        sid = uuid.uuid4().hex
-        self._by_id[sid] = SessionState(mode=mode)
-        return sid
+class SessionStore(ABC):
+    """Backend interface for session state. `get` raises KeyError for unknown ids.
 
-    def get(self, sid: str) -> SessionState:
-        return self._by_id[sid]
+    Routers and chat_loop mutate the `SessionState` returned by `get` in place;
+    `save` hands those scalar changes back to the backend at the end of a turn.
+    """
 
-    def append_event(self, sid: str, ev: Event):
-        st = self._by_id[sid]
-        if ev.column == Column.PRO:
-            st.pro.append(ev)
-        elif ev.column == Column.CON:
-            st.con.append(ev)
+    @abstractmethod
+    def create(self, mode: Mode) -> str: ...
+
+    @abstractmethod
+    def get(self, sid: str) -> SessionState: ...
+
+    @abstractmethod
+    def append_event(self, sid: str, ev: Event): ...
+
+    @abstractmethod
+    def add_sources(self, sid: str, sources: List[Source]) -> List[str]: ...
+
+    # set by _build_store; receives every stored change for push subscribers
+    hub: Optional[SessionHub] = None
+
+    def save(self, sid: str, st: SessionState) -> None:
+        pass
+
+    def settled(self, sid: str) -> SessionState:
+        """The session as readers may see it: every stored item carries its
+        final seq. Backends that number writes later settle pending ones first."""
+        return self.get(sid)
+
+    def _publish(self, sid: str, st: SessionState, since: int,
+                 events: List[Event] = (), source_sids: List[str] = ()) -> None:
+        if self.hub is None or not self.hub.has_subscribers(sid) or st.seq == since:
+            return
+        by_sid = self._source_index(st)[1] if source_sids else {}
+        delta = ColumnsSnapshot(PRO=[e for e in events if e.column == Column.PRO],
+                                CON=[e for e in events if e.column == Column.CON],
+                                SOURCES=[st.sources[by_sid[s]] for s in dict.fromkeys(source_sids)],
+                                seq=st.seq, since=since)
+        self.hub.publish(sid, st.seq, delta.model_dump_json())
+
+    def export_columns(self, sid: str, since: int = 0) -> ColumnsSnapshot:
+        """Full columns, or with `since` only what changed after that seq.
+
+        A `since` ahead of the session (a client that saw another history)
+        gets a full snapshot, which the reply marks with `since=0`.
+        """
+        st = self.settled(sid)
+        if since <= 0 or since > st.seq:
+            return ColumnsSnapshot(PRO=st.pro, CON=st.con, SOURCES=st.sources, seq=st.seq)
+        return ColumnsSnapshot(PRO=_after(st.pro, since), CON=_after(st.con, since),
+                               SOURCES=self._sources_since(st, since), seq=st.seq, since=since)
+
+    @staticmethod
+    def _next_seq(st: SessionState, seq: int) -> int:
+        # replayed items keep the seq they were stored with
+        if seq:
+            st.seq = max(st.seq, seq)
+            return seq
+        st.seq += 1
+        return st.seq
+
+    @staticmethod
+    def _apply_event(st: SessionState, ev: Event):
+        if ev.column in (Column.PRO, Column.CON):
+            col = st.pro if ev.column == Column.PRO else st.con
+            ev.seq = SessionStore._next_seq(st, ev.seq)
+            if col and ev.seq < col[-1].seq:
+                # replayed from another worker behind our own: keep the column in seq order
+                bisect.insort(col, ev, key=lambda e: e.seq)
+            else:
+                col.append(ev)
         elif ev.column == Column.SOURCES:
             # We keep sources as structured list via add_sources().
             # SOURCE events (meta like added_sids) are still useful for the UI log,
             # but they are NOT appended into CON (bug fix). We simply ignore here.
             return
 
+    def get_source(self, sid: str, source_sid: str) -> Optional[Source]:
+        st = self.get(sid)
+        i = self._source_index(st)[1].get(source_sid)
+        return st.sources[i] if i is not None else None
+
+    @staticmethod
+    def _source_index(st: SessionState) -> Tuple[Dict[str, int], Dict[str, int]]:
+        # built lazily: states loaded from JSON or replayed from a log start without one
+        if st._source_by_url is None or len(st._source_by_sid) != len(st.sources):
+            st._source_by_url, st._source_by_sid = {}, {}
+            for i, src in enumerate(st.sources):
+                st._source_by_url.setdefault(canonical_url(src.url), i)
+                st._source_by_sid[src.sid] = i
+            st._source_changes = OrderedDict.fromkeys(sorted(range(len(st.sources)), key=lambda i: st.sources[i].seq))
+        return st._source_by_url, st._source_by_sid
+
+    @staticmethod
+    def _sources_since(st: SessionState, since: int) -> List[Source]:
+        SessionStore._source_index(st)
+        out = []
+        # newest change last: walk back until we reach what the client has seen
+        for i in reversed(st._source_changes):
+            if st.sources[i].seq <= since:
+                break
+            out.append(st.sources[i])
+        out.reverse()
+        return out
+
+    @staticmethod
+    def _apply_sources(st: SessionState, sources: List[Source]) -> Tuple[List[str], List[Source]]:
+        """Merge by canonical URL. Returns the registry sid of every input source
+        (the existing one for a duplicate) and the sources that were new."""
+        by_url, by_sid = SessionStore._source_index(st)
+        top = st.sources[next(reversed(st._source_changes))].seq if st._source_changes else 0
+        sids, added, reorder = [], [], False
+        for src in sources:
+            key = canonical_url(src.url)
+            i = by_url.get(key)
+            src.seq = SessionStore._next_seq(st, src.seq)
+            late = src.seq < top  # replayed from another worker behind our own changes
+            if i is None:
+                if late:
+                    bisect.insort(st.sources, src, key=lambda s: s.seq)
+                    st._source_by_url = None  # indices moved
+                    by_url, by_sid = SessionStore._source_index(st)
+                    i = by_sid[src.sid]
+                else:
+                    i = by_url[key] = by_sid[src.sid] = len(st.sources)
+                    st.sources.append(src)
+                added.append(src)
+                sids.append(src.sid)
+            else:
+                cur = st.sources[i]
+                # a later classification of the same page refines the verdict
+                if src.seq >= cur.seq:
+                    for field in ("note", "reliability", "tag"):
+                        if field in src.model_fields_set and getattr(src, field) is not None:
+                            setattr(cur, field, getattr(src, field))
+                    cur.seq = src.seq
+                sids.append(cur.sid)
+            reorder = reorder or late
+            top = max(top, src.seq)
+            st._source_changes[i] = None
+            st._source_changes.move_to_end(i)
+        if reorder:
+            st._source_changes = OrderedDict.fromkeys(sorted(st._source_changes, key=lambda i: st.sources[i].seq))
+        return sids, added
+
+def _after(events: List[Event], since: int) -> List[Event]:
+    # events are appended in seq order
+    return events[bisect.bisect_right(events, since, key=lambda ev: ev.seq):]
+
+_STATE_BASE_BYTES = 2048  # empty SessionState plus the dict slot, roughly
+
+class _Entry:
+    __slots__ = ("state", "log_bytes", "scalar_bytes", "seen")
+
+    def __init__(self, state: SessionState, now: float):
+        self.state = state
+        self.log_bytes = 0
+        self.scalar_bytes = _STATE_BASE_BYTES
+        self.seen = now
+
+    @property
+    def bytes(self) -> int:
+        return self.log_bytes + self.scalar_bytes
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store bounded by idle TTL and an approximate byte budget.
+
+    The request path only touches its own entry (GIL-atomic dict reads and
+    attribute writes), never a store-wide lock. A sweeper thread drops
+    sessions idle for `idle_ttl_s`, then evicts least recently used sessions
+    while the estimated total exceeds `max_bytes`. Sizes are estimated from
+    the serialized events/sources as they are appended.
+    """
+
+    def __init__(self, idle_ttl_s: Optional[float] = None, max_bytes: Optional[int] = None,
+                 sweep_interval_s: Optional[float] = None, clock: Callable[[], float] = monotonic):
+        self.idle_ttl_s = idle_ttl_s
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._by_id: Dict[str, _Entry] = {}
+        self._bytes = 0
+        self._bytes_lock = threading.Lock()  # request threads add, the sweeper reconciles
+        self._wake = threading.Event()
+        if sweep_interval_s and (idle_ttl_s or max_bytes):
+            self._sweep_interval_s = sweep_interval_s
+            threading.Thread(target=self._sweep_loop, name="session-sweep", daemon=True).start()
+
+    def _entry(self, sid: str) -> _Entry:
+        e = self._by_id[sid]
+        e.seen = self._clock()
+        return e
+
+    def create(self, mode: Mode) -> str:
+        sid = uuid.uuid4().hex
+        self._by_id[sid] = _Entry(SessionState(mode=mode), self._clock())
+        self._grew(_STATE_BASE_BYTES)
+        return sid
+
+    def get(self, sid: str) -> SessionState:
+        return self._entry(sid).state
+
+    def append_event(self, sid: str, ev: Event):
+        e = self._entry(sid)
+        since = e.state.seq
+        self._apply_event(e.state, ev)
+        if ev.column != Column.SOURCES:
+            n = len(ev.model_dump_json())
+            e.log_bytes += n
+            self._grew(n)
+        self._publish(sid, e.state, since, events=[ev])
+
     def add_sources(self, sid: str, sources: List[Source]) -> List[str]:
-        st = self._by_id[sid]
-        st.sources.extend(sources)
-        return [s.sid for s in sources]
+        e = self._entry(sid)
+        since = e.state.seq
+        sids, added = self._apply_sources(e.state, sources)
+        n = sum(len(s.model_dump_json()) for s in added)
+        e.log_bytes += n
+        self._grew(n)
+        self._publish(sid, e.state, since, source_sids=sids)
+        return sids
+
+    def save(self, sid: str, st: SessionState) -> None:
+        e = self._by_id.get(sid)
+        if e is not None:
+            e.scalar_bytes = _STATE_BASE_BYTES + len(st.last_user_claim_raw or "") + 256 * len(st.fallacies_seen)
+
+    def _grew(self, n: int) -> None:
+        # an estimate between sweeps; the sweeper recomputes it exactly
+        with self._bytes_lock:
+            self._bytes += n
+        if self.max_bytes and self._bytes > self.max_bytes:
+            self._wake.set()
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def sweep(self) -> int:
+        """Evict idle sessions, then LRU sessions over the byte budget. Returns the number evicted."""
+        now = self._clock()
+        with self._bytes_lock:
+            before = self._bytes
+        entries = list(self._by_id.items())  # snapshot; requests keep running meanwhile
+        evicted = 0
+        live = []
+        for sid, e in entries:
+            if self.idle_ttl_s and now - e.seen > self.idle_ttl_s and self._evict(sid, e, "idle"):
+                evicted += 1
+            else:
+                live.append((sid, e))
+        total = sum(e.bytes for _, e in live)
+        if self.max_bytes and total > self.max_bytes:
+            live.sort(key=lambda item: item[1].seen)
+            for sid, e in live:
+                if total <= self.max_bytes:
+                    break
+                if self._evict(sid, e, "memory"):
+                    total -= e.bytes
+                    evicted += 1
+        with self._bytes_lock:
+            # keep growth reported while we were counting; it may be counted
+            # twice until the next sweep, which only errs towards evicting early
+            self._bytes = total + (self._bytes - before)
+            SESSION_BYTES.set(self._bytes)
+        return evicted
+
+    def _evict(self, sid: str, e: _Entry, reason: str) -> bool:
+        # only drop the entry we looked at; a concurrent create cannot reuse the id
+        if self._by_id.get(sid) is not e:
+            return False
+        del self._by_id[sid]
+        SESSIONS_EVICTED.inc(reason=reason)
+        return True
+
+    def _sweep_loop(self) -> None:
+        while True:
+            self._wake.wait(self._sweep_interval_s)
+            self._wake.clear()
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("session sweep failed")
 
-    def export_columns(self, sid: str) -> ColumnsSnapshot:
-        st = self._by_id[sid]
-        return ColumnsSnapshot(PRO=st.pro, CON=st.con, SOURCES=st.sources)
 
+def _build_store() -> SessionStore:
+    if settings.SESSION_BACKEND == "sqlite":
+        from core.session_sqlite import SqliteSessionStore
+        return SqliteSessionStore(settings.SESSION_SQLITE_PATH,
+                                  hot_sessions=settings.SESSION_HOT_SIZE,
+                                  flush_interval_s=settings.SESSION_FLUSH_INTERVAL_S)
+    return InMemorySessionStore(idle_ttl_s=settings.SESSION_IDLE_TTL_S,
+                                max_bytes=settings.SESSION_MAX_BYTES,
+                                sweep_interval_s=settings.SESSION_SWEEP_INTERVAL_S)
 
-session_store = SessionStore()
\ No newline at end of file
+session_store = _build_store()
+session_store.hub = hub
+SESSIONS_LIVE.set_function(lambda: len(session_store))
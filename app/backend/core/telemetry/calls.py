@@ -0,0 +1,61 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Iterator
+
+from core.telemetry.logger import logger
+from core.telemetry.metrics import Timer, registry
+from core.telemetry.tracing import span
+from core.utils.limiter import is_rate_limited
+
+# One set of series for every outbound call, keyed by call site: LLM sites
+# (triage, planner, supervisor, extract, fallacies, score, executor, classify)
+# and HTTP integrations (tavily, wiki). `model` is empty for HTTP calls.
+
+CALL_SECONDS = registry.histogram("call_seconds", "Outbound LLM/HTTP call latency by call site",
+                                  labels=("site", "model", "outcome"))
+CALL_TOKENS = registry.counter("call_tokens_total", "LLM tokens by call site (prompt, completion, cached)",
+                               labels=("site", "model", "kind"))
+CALL_RETRIES = registry.counter("call_retries_total", "Outbound calls retried after a transient error",
+                                labels=("site", "reason"))
+PARSE_FAILURES = registry.counter("llm_parse_failures_total", "LLM replies that did not parse into the expected shape",
+                                  labels=("site",))
+
+class CallRecord:
+    __slots__ = ("site", "model", "outcome", "seconds", "span")
+
+    def __init__(self, site: str, model: str, span):
+        self.site, self.model = site, model
+        self.outcome = "ok"
+        self.seconds = 0.0
+        self.span = span  # current trace span, or a no-op
+
+@contextmanager
+def instrument(site: str, model: str = "") -> Iterator[CallRecord]:
+    """Time one outbound call (as a trace span too); an exception marks it
+    `throttled` (429), `cancelled` or `error`."""
+    timer = Timer()
+    with span("llm" if model else "http", site=site, **({"model": model} if model else {})) as s:
+        rec = CallRecord(site, model, s)
+        try:
+            with timer:
+                yield rec
+        except BaseException as e:
+            rec.outcome = ("cancelled" if isinstance(e, asyncio.CancelledError)
+                           else "throttled" if is_rate_limited(e) else "error")
+            raise
+        finally:
+            rec.seconds = timer.dt
+            s.set(outcome=rec.outcome)
+            CALL_SECONDS.observe(timer.dt, site=site, model=model, outcome=rec.outcome)
+        logger.debug("call site=%s model=%s outcome=%s seconds=%.3f", site, model, rec.outcome, timer.dt)
+
+def record_tokens(site: str, model: str, prompt: float, completion: float, cached: float = 0) -> None:
+    CALL_TOKENS.inc(prompt, site=site, model=model, kind="prompt")
+    CALL_TOKENS.inc(completion, site=site, model=model, kind="completion")
+    CALL_TOKENS.inc(cached, site=site, model=model, kind="cached")
+
+def record_retry(site: str, reason: str) -> None:
+    CALL_RETRIES.inc(site=site, reason=reason)
+
+def parse_failed(site: str, n: int = 1) -> None:
+    PARSE_FAILURES.inc(n, site=site)
@@ -1,4 +1,7 @@
+import bisect
+import threading
 from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 class Timer:
     def __enter__(self):
@@ -6,3 +9,187 @@ class Timer:
         return self
     def __exit__(self, exc_type, exc, tb):
         self.dt = perf_counter() - self.t0
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str = "", labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name}: expected labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[k]) for k in self.labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def collect(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """(sample name, label pairs, value) for every series."""
+        for key, v in self.samples().items():
+            yield self.name, tuple(zip(self.labels, key)), v
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, n: float = 1, **labels) -> None:
+        if n < 0:
+            raise ValueError(f"{self.name}: counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str = "", labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._fn: Optional[Callable[[], float]] = None
+
+    def set(self, v: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = v
+
+    def inc(self, n: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+    def dec(self, n: float = 1, **labels) -> None:
+        self.inc(-n, **labels)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the value from `fn` at collection time (unlabelled gauges only)."""
+        self._fn = fn
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        if self._fn is not None:
+            return {(): self._fn()}
+        return super().samples()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", labels: Tuple[str, ...] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per series: [count per bucket (+Inf last)], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, v: float, **labels) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, v)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[i] += 1
+            total[0] += v
+
+    def time(self, **labels) -> "_HistogramTimer":
+        return _HistogramTimer(self, labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def sum(self, **labels) -> float:
+        series = self._series.get(self._key(labels))
+        return series[1][0] if series else 0.0
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return {k: sum(c) for k, (c, _) in self._series.items()}
+
+    def collect(self):
+        with self._lock:
+            series = {k: (list(c), t[0]) for k, (c, t) in self._series.items()}
+        for key, (counts, total) in series.items():
+            pairs = tuple(zip(self.labels, key))
+            running = 0
+            for le, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                yield self.name + "_bucket", pairs + (("le", "+Inf" if le == float("inf") else repr(le)),), running
+            yield self.name + "_count", pairs, running
+            yield self.name + "_sum", pairs, total
+
+class _HistogramTimer:
+    def __init__(self, hist: Histogram, labels: Dict[str, str]):
+        self.hist = hist
+        self.labels = labels
+    def __enter__(self):
+        self.t0 = perf_counter()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.dt = perf_counter() - self.t0
+        self.hist.observe(self.dt, **self.labels)
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help: str, labels: Tuple[str, ...], **kw):
+        # idempotent: modules re-imported in tests get the same metric back
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = cls(name, help, labels, **kw)
+            elif not isinstance(m, cls) or m.labels != tuple(labels):
+                raise ValueError(f"metric {name} already registered with another type or labels")
+            return m
+
+    def counter(self, name: str, help: str = "", labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", labels: Tuple[str, ...] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labels, buckets=buckets)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def exposition(self) -> str:
+        """Prometheus text format (version 0.0.4)."""
+        lines = []
+        for m in sorted(self.metrics(), key=lambda m: m.name):
+            lines.append(f"# HELP {m.name} {_escape(m.help, quote=False)}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            for name, pairs, v in m.collect():
+                labels = ",".join(f'{k}="{_escape(str(x))}"' for k, x in pairs)
+                lines.append(f"{name}{{{labels}}} {_number(v)}" if labels else f"{name} {_number(v)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        out = {}
+        for m in self.metrics():
+            for name, pairs, v in m.collect():
+                out[name + ("{" + ",".join(f"{k}={x}" for k, x in pairs) + "}" if pairs else "")] = v
+        return out
+
+def _escape(s: str, quote: bool = True) -> str:
+    s = s.replace("\\", "\\\\").replace("\n", "\\n")
+    return s.replace('"', '\\"') if quote else s
+
+def _number(v: float) -> str:
+    if v != v:
+        return "NaN"
+    if v in (float("inf"), float("-inf")):
+        return "+Inf" if v > 0 else "-Inf"
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+registry = Registry()
@@ -0,0 +1,189 @@
+import functools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.config import settings
+from core.telemetry.logger import logger
+
+# Nested spans per chat turn. The current span lives in a ContextVar, so it
+# follows the call graph through awaits and into tasks (which copy the context
+# when created) and asyncio.to_thread; plain thread pools need
+# contextvars.copy_context().run. Spans outside a trace cost one ContextVar read.
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "_t0", "duration_s", "attrs", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start = time.time()
+        self._t0 = perf_counter()
+        self.duration_s: Optional[float] = None
+        self.attrs = attrs
+        self.status = "ok"
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin: float) -> dict:
+        return {"name": self.name, "span_id": self.span_id,
+                "start_ms": round((self.start - origin) * 1000, 3),
+                "duration_ms": round(self.duration_s * 1000, 3) if self.duration_s is not None else None,
+                "status": self.status, "attrs": self.attrs, "children": []}
+
+class _NoSpan:
+    def set(self, **attrs: Any) -> None:
+        pass
+
+NO_SPAN = _NoSpan()
+
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+class TraceBuffer:
+    """The last `max_traces` traces, at most `max_spans` spans each."""
+
+    def __init__(self, max_traces: int = 256, max_spans: int = 1000):
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, root: Span) -> None:
+        # the root is stored up front so a trace over the span cap keeps it
+        with self._lock:
+            self._traces[root.trace_id] = [root]
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+    def add(self, s: Span) -> None:
+        with self._lock:
+            spans = self._traces.get(s.trace_id)
+            if spans is not None and s.parent_id is not None and len(spans) < self.max_spans:
+                spans.append(s)
+
+    def spans(self, trace_id: str) -> Optional[List[Span]]:
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            return list(spans) if spans is not None else None
+
+    def tree(self, trace_id: str) -> Optional[dict]:
+        """Span tree with durations; spans whose parent was dropped hang off the root."""
+        spans = self.spans(trace_id)
+        if not spans:
+            return None
+        root = next((s for s in spans if s.parent_id is None), None)
+        if root is None:
+            return None
+        nodes = {s.span_id: s.to_dict(root.start) for s in spans}
+        for s in sorted(spans, key=lambda s: s.start):
+            if s is not root:
+                nodes.get(s.parent_id, nodes[root.span_id])["children"].append(nodes[s.span_id])
+        return {"trace_id": trace_id, "root": nodes[root.span_id], "spans": len(spans)}
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        with self._lock:
+            items = list(self._traces.items())[-limit:]
+        out = []
+        for trace_id, spans in reversed(items):
+            root = next((s for s in spans if s.parent_id is None), None)
+            if root is not None:
+                out.append({"trace_id": trace_id, "name": root.name, "start": root.start,
+                            "duration_ms": round(root.duration_s * 1000, 3) if root.duration_s is not None else None,
+                            "status": root.status, "spans": len(spans)})
+        return out
+
+buffer = TraceBuffer(settings.TRACE_BUFFER_SIZE, settings.TRACE_MAX_SPANS)
+_exporter = None
+
+@contextmanager
+def _run(s: Span) -> Iterator[Span]:
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = "error"
+        s.attrs.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current.reset(token)
+        s.duration_s = perf_counter() - s._t0
+        buffer.add(s)
+
+@contextmanager
+def trace(name: str, trace_id: Optional[str] = None, **attrs: Any) -> Iterator[Span]:
+    """Start a new trace with `name` as its root span."""
+    root = Span(name, trace_id or uuid.uuid4().hex, None, attrs)
+    buffer.open(root)
+    try:
+        with _run(root):
+            yield root
+    finally:
+        if _exporter is not None:
+            try:
+                _exporter.export(buffer.spans(root.trace_id) or [])
+            except Exception:
+                logger.exception("trace export failed")
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Any]:
+    """Child of the current span; a no-op outside a trace."""
+    parent = _current.get()
+    if parent is None:
+        yield NO_SPAN
+        return
+    with _run(Span(name, parent.trace_id, parent.span_id, attrs)) as s:
+        yield s
+
+def current_trace_id() -> Optional[str]:
+    s = _current.get()
+    return s.trace_id if s is not None else None
+
+def traced(name: str):
+    """Run an async function inside span(`name`)."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        async def inner(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+        return inner
+    return wrap
+
+class OTelExporter:
+    """Replays finished traces into OpenTelemetry (needs opentelemetry-sdk and
+    whatever exporter the process configures as the tracer provider)."""
+
+    def __init__(self):
+        from opentelemetry import trace as otel_trace
+        self._otel = otel_trace
+        self._tracer = otel_trace.get_tracer("debate-coach")
+
+    def export(self, spans: List[Span]) -> None:
+        made = {}
+        for s in sorted(spans, key=lambda s: s.start):
+            parent = made.get(s.parent_id)
+            ctx = self._otel.set_span_in_context(parent) if parent is not None else None
+            attrs = {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in s.attrs.items()}
+            attrs["debate.trace_id"] = s.trace_id
+            o = self._tracer.start_span(s.name, context=ctx, attributes=attrs, start_time=int(s.start * 1e9))
+            if s.status == "error":
+                o.set_status(self._otel.Status(self._otel.StatusCode.ERROR))
+            o.end(end_time=int((s.start + (s.duration_s or 0)) * 1e9))
+            made[s.span_id] = o
+
+def set_exporter(exporter) -> None:
+    global _exporter
+    _exporter = exporter
+
+if settings.TRACE_OTEL_ENABLED:
+    try:
+        set_exporter(OTelExporter())
+    except ImportError:
+        logger.warning("TRACE_OTEL_ENABLED is set but opentelemetry is not installed; traces stay in-process")
@@ -0,0 +1,61 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class TurnContext:
+    """Artifacts computed during one chat turn (extracted claim, triage,
+    fallacies for a claim), shared by chat_loop, the supervisor and the
+    executors so each one is computed at most once per turn.
+
+    Concurrent requests for the same artifact await the same in-flight task.
+
+    `emit(event, data)`, when given, receives progress events as the turn
+    runs (PRO captured, supervisor decision, generation deltas, score);
+    the SSE chat endpoint forwards them to the client.
+    """
+
+    def __init__(self, emit: Optional[Callable[[str, dict], None]] = None):
+        self._memo: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._deferred: Dict[Tuple[str, Hashable], Tuple[Callable[..., Awaitable[Any]], tuple]] = {}
+        self._emit = emit
+        self.computed: Counter = Counter()
+        self.avoided: Counter = Counter()
+
+    @property
+    def streaming(self) -> bool:
+        return self._emit is not None
+
+    def emit(self, event: str, data: dict) -> None:
+        if self._emit is not None:
+            self._emit(event, data)
+
+    async def once(self, kind: str, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        k = (kind, key)
+        fut = self._memo.get(k)
+        if fut is None:
+            fn, args = self._deferred.pop(k, (fn, args))
+            fut = self._memo[k] = asyncio.ensure_future(fn(*args))
+            self.computed[kind] += 1
+        else:
+            self.avoided[kind] += 1
+        try:
+            # shield: one cancelled waiter must not cancel the shared call
+            return await asyncio.shield(fut)
+        except Exception:
+            if self._memo.get(k) is fut:
+                del self._memo[k]  # let a later caller retry
+            raise
+
+    def provide(self, kind: str, key: Hashable, value: Awaitable[Any]) -> None:
+        """Seed an artifact computed elsewhere (e.g. a packed bulk call), so
+        `once` for (kind, key) awaits it instead of computing it."""
+        self._memo[(kind, key)] = asyncio.ensure_future(value)
+
+    def defer(self, kind: str, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        """Like `provide`, but `fn(*args)` only runs if the turn asks for
+        (kind, key), in place of the caller's own fn."""
+        self._deferred[(kind, key)] = (fn, args)
+
+    def stats(self) -> dict:
+        return {"computed": dict(self.computed), "avoided": dict(self.avoided),
+                "calls_avoided": sum(self.avoided.values())}
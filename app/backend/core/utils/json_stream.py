@@ -0,0 +1,147 @@
+
+# core/utils/json_stream.py
+import json
+import re
+from typing import Any, List, Optional
+
+_STR_SPECIAL = re.compile(r'["\\]')
+
+class JsonArrayStream:
+    """Incremental extractor for the elements of one JSON array in a streamed reply.
+
+    Feed completion deltas; each call returns the array elements that closed
+    in that delta, already decoded. With `key` it follows `{"<key>": [...]}`
+    at the top level of the first object that has it, without it the first
+    top-level array. Text before the JSON (prose, ```json fences) is skipped, elements
+    that fail to decode are dropped, and an unterminated tail simply never
+    yields. Every character is scanned once and only the element being read
+    is buffered, so cost is linear in the reply.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._done = False
+        self._in_str = False
+        self._esc = False
+        self._str_start = -1
+        self._last_key: Optional[str] = None
+        self._await_value = False
+        self._array_depth = -1
+        self._elem_start = -1
+        self.items: List[Any] = []
+
+    def feed(self, delta: str) -> List[Any]:
+        if self._done or not delta:
+            return []
+        self._text += delta
+        out: List[Any] = []
+        text, i, n = self._text, self._pos, len(self._text)
+        while i < n:
+            c = text[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                    i += 1
+                    continue
+                # jump straight to the next quote or backslash
+                m = _STR_SPECIAL.search(text, i)
+                if m is None:
+                    i = n
+                    break
+                i = m.start()
+                if text[i] == "\\":
+                    self._esc = True
+                    i += 1
+                    continue
+                self._in_str = False
+                if self._str_start >= 0:
+                    try:
+                        self._last_key = json.loads(text[self._str_start:i + 1])
+                    except ValueError:
+                        self._last_key = None
+                    self._str_start = -1
+                i += 1
+                continue
+
+            if not self._started:
+                if c == "{" or (c == "[" and self.key is None):
+                    self._started = True
+                    self._depth = 1
+                    if c == "[":
+                        self._open_array()
+                i += 1
+                continue
+
+            if c == '"':
+                self._in_str = True
+                # a string directly inside the top-level object may be a key
+                if self._depth == 1 and self._array_depth < 0 and not self._await_value:
+                    self._str_start = i
+                if self._elem_start < 0 and self._depth == self._array_depth:
+                    self._elem_start = i
+            elif c == ":" and self._depth == 1:
+                self._await_value = True
+            elif c in "{[":
+                if (c == "[" and self._depth == 1 and self._array_depth < 0
+                        and self._await_value and self._last_key == self.key):
+                    self._depth += 1
+                    self._open_array()
+                else:
+                    if self._elem_start < 0 and self._depth == self._array_depth:
+                        self._elem_start = i
+                    self._depth += 1
+            elif c in "}]":
+                if self._depth == self._array_depth and c == "]":
+                    self._close_elem(text, i, out)
+                    self._array_depth = -1
+                    self._done = True
+                    i += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    # closed without our array (e.g. "{draft}" in leading prose):
+                    # keep looking for the next top-level object
+                    self._started = False
+                    self._await_value = False
+                    self._last_key = None
+            elif c == ",":
+                if self._depth == self._array_depth:
+                    self._close_elem(text, i, out)
+                elif self._depth == 1:
+                    self._await_value = False
+                    self._last_key = None
+            elif not c.isspace() and self._elem_start < 0 and self._depth == self._array_depth:
+                self._elem_start = i  # number / true / false / null
+            i += 1
+        self._pos = i
+        self._compact()
+        self.items.extend(out)
+        return out
+
+    def _compact(self) -> None:
+        # keep only the text an open key/element still needs, so the buffer
+        # stays the size of one element however long the reply gets
+        keep = min(x for x in (self._elem_start, self._str_start, self._pos) if x >= 0)
+        if keep:
+            self._text = self._text[keep:]
+            self._pos -= keep
+            if self._elem_start >= 0:
+                self._elem_start -= keep
+            if self._str_start >= 0:
+                self._str_start -= keep
+
+    def _open_array(self) -> None:
+        self._array_depth = self._depth
+        self._elem_start = -1
+
+    def _close_elem(self, text: str, end: int, out: List[Any]) -> None:
+        if self._elem_start >= 0:
+            try:
+                out.append(json.loads(text[self._elem_start:end]))
+            except ValueError:
+                pass  # malformed element: skip it, keep streaming
+        self._elem_start = -1
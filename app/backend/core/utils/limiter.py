@@ -0,0 +1,100 @@
+# core/utils/limiter.py
+import asyncio
+from time import monotonic
+from typing import Callable, Optional
+
+def _status(e: BaseException):
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status
+
+def is_rate_limited(e: BaseException) -> bool:
+    """Provider throttling: HTTP 429 from openai/httpx-style errors."""
+    return _status(e) == 429 or type(e).__name__ == "RateLimitError"
+
+def is_transient(e: BaseException) -> bool:
+    """Worth retrying: throttling, 5xx, timeouts and dropped connections."""
+    status = _status(e)
+    return (is_rate_limited(e) or (isinstance(status, int) and status >= 500)
+            or isinstance(e, (asyncio.TimeoutError, ConnectionError))
+            or type(e).__name__ in ("APIConnectionError", "APITimeoutError"))
+
+def retry_after_s(e: BaseException) -> Optional[float]:
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """`rate` tokens per second, up to `capacity`. `take(n)` waits its turn
+    (FIFO); a request larger than the bucket waits for a full bucket."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._stamp = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    async def take(self, n: float = 1) -> float:
+        """Returns the seconds spent waiting."""
+        n = min(n, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return waited
+                delay = (n - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts AIMD-style to provider throttling.
+
+    Each success adds 1/limit (about +1 per window of `limit` calls), each
+    throttle halves the limit and each slow call (latency over target) trims
+    it by `slow_factor`. Cuts within `cooldown_s` of the last one count once,
+    since a burst of 429s answers the same overload.
+    """
+
+    def __init__(self, initial: int, max_limit: int, min_limit: int = 1, cooldown_s: float = 1.0,
+                 slow_factor: float = 0.9, on_change: Optional[Callable[[float], None]] = None, clock: Callable[[], float] = monotonic):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.cooldown_s = cooldown_s
+        self.slow_factor = slow_factor
+        self.inflight = 0
+        self._on_change = on_change
+        self._clock = clock
+        self._last_cut = float("-inf")
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+
+    async def release(self, throttled: bool = False, slow: bool = False) -> None:
+        async with self._cond:
+            self.inflight -= 1
+            if throttled or slow:
+                now = self._clock()
+                if now - self._last_cut >= self.cooldown_s:
+                    self._last_cut = now
+                    self.limit = max(self.min_limit, self.limit * (0.5 if throttled else self.slow_factor))
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if self._on_change is not None:
+                self._on_change(self.limit)
+            self._cond.notify_all()
@@ -0,0 +1,100 @@
+
+# core/utils/scheduler.py
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from core.telemetry.tracing import span
+
+StepFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+class StepGraph:
+    """Dependency-aware runner for the async steps of one turn.
+
+    Each step is `fn(deps) -> awaitable`, where `deps` maps the names it
+    declared to their results. A step starts as soon as its own deps are
+    done, so independent LLM calls overlap and the turn costs roughly its
+    critical path instead of the sum of all calls.
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, Tuple[StepFn, Tuple[str, ...]]] = {}
+        self._t0: float | None = None
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def add(self, name: str, fn: StepFn, deps: Iterable[str] = ()) -> "StepGraph":
+        deps = tuple(deps)
+        missing = [d for d in deps if d not in self._steps]
+        if name in self._steps:
+            raise ValueError(f"duplicate step: {name}")
+        if missing:
+            # declaring deps first also rules out cycles
+            raise ValueError(f"step {name} depends on unknown steps: {missing}")
+        self._steps[name] = (fn, deps)
+        return self
+
+    def _needed(self, targets: Iterable[str]) -> List[str]:
+        order, seen = [], set()
+        def visit(n: str):
+            if n in seen:
+                return
+            seen.add(n)
+            for d in self._steps[n][1]:
+                visit(d)
+            order.append(n)
+        for t in targets:
+            visit(t)
+        return order
+
+    async def run(self, *targets: str) -> Dict[str, Any]:
+        """Run `targets` (default: every step) plus whatever they depend on."""
+        names = self._needed(targets or self._steps)
+        self._t0 = perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def _run_step(name: str):
+            fn, deps = self._steps[name]
+            if deps:
+                await asyncio.gather(*(tasks[d] for d in deps))
+            start = perf_counter()
+            try:
+                with span(f"step:{name}"):
+                    return await fn({d: self.results[d] for d in deps})
+            finally:
+                self.timings[name] = (start - self._t0, perf_counter() - self._t0)
+
+        async def _store(name: str):
+            self.results[name] = await _run_step(name)
+
+        for name in names:
+            tasks[name] = asyncio.ensure_future(_store(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for t in tasks.values():
+                t.cancel()
+            raise
+        return self.results
+
+    def critical_path(self) -> List[str]:
+        """Chain of steps, ending at the last one to finish, that bounded the run."""
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        path = [name]
+        while True:
+            deps = [d for d in self._steps[name][1] if d in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda d: self.timings[d][1])
+            path.append(name)
+        return path[::-1]
+
+    def report(self) -> Dict[str, Any]:
+        steps = {
+            n: {"start_ms": round(s * 1000, 1), "end_ms": round(e * 1000, 1), "ms": round((e - s) * 1000, 1)}
+            for n, (s, e) in sorted(self.timings.items(), key=lambda kv: kv[1][0])
+        }
+        total = max((e for _, e in self.timings.values()), default=0.0)
+        return {"total_ms": round(total * 1000, 1), "critical_path": self.critical_path(), "steps": steps}
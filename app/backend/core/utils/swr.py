@@ -0,0 +1,85 @@
+# core/utils/swr.py
+import asyncio
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set
+
+from core.telemetry.logger import logger
+from core.telemetry.metrics import registry
+from core.utils.lru import TTLLRU
+
+SWR_LOOKUPS = registry.counter("swr_cache_lookups_total", "Stale-while-revalidate cache lookups",
+                               labels=("cache", "result"))
+
+class SWRCache:
+    """Async stale-while-revalidate cache over a bounded TTLLRU.
+
+    Entries younger than `fresh_s` are served as hits. Entries older than
+    that but younger than `stale_s` are served right away, and one
+    background refresh replaces them. Anything older is recomputed. Concurrent
+    misses for a key share one computation. `keep(value)` decides what is
+    worth storing, so a deadline-truncated empty result is not pinned.
+    """
+
+    def __init__(self, name: str, max_entries: int, fresh_s: float, stale_s: float,
+                 keep: Callable[[Any], bool] = bool, clock: Callable[[], float] = monotonic):
+        self.name = name
+        self.fresh_s = fresh_s
+        self.stale_s = max(stale_s, fresh_s)
+        self._keep = keep
+        self._clock = clock
+        self._data = TTLLRU(max_entries=max_entries)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        item = self._data.get(key)
+        if item is not None and self._clock() - item[0] < self.stale_s:
+            stored_at, value = item
+            if self._clock() - stored_at < self.fresh_s:
+                SWR_LOOKUPS.inc(cache=self.name, result="hit")
+                return value
+            SWR_LOOKUPS.inc(cache=self.name, result="stale")
+            if key not in self._inflight:
+                task = asyncio.ensure_future(self._compute(key, compute))
+                self._refreshing.add(task)
+                task.add_done_callback(self._refreshed)
+            return value
+        SWR_LOOKUPS.inc(cache=self.name, result="miss")
+        return await asyncio.shield(self._compute(key, compute))
+
+    def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> "asyncio.Future":
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = self._inflight[key] = asyncio.ensure_future(self._run(key, compute))
+        return fut
+
+    async def _run(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            if self._keep(value):
+                self._data.set(key, (self._clock(), value))
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refreshed(self, task: asyncio.Task) -> None:
+        self._refreshing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("%s refresh failed: %r", self.name, task.exception())
+
+    async def drain(self) -> None:
+        """Wait for background refreshes (tests, shutdown)."""
+        while self._refreshing:
+            await asyncio.gather(*list(self._refreshing), return_exceptions=True)
+
+    def stats(self) -> dict:
+        counts = {r: SWR_LOOKUPS.value(cache=self.name, result=r) for r in ("hit", "stale", "miss")}
+        total = sum(counts.values())
+        return {"entries": len(self), **counts,
+                "hit_rate": round((counts["hit"] + counts["stale"]) / total, 4) if total else None}
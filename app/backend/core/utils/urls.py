@@ -0,0 +1,26 @@
+# core/utils/urls.py
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+                    "_ga", "_gl", "ref", "ref_src", "ref_url", "cmpid", "spm"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def canonical_url(url: str) -> str:
+    """Identity of a source URL: scheme/host casefolded, default port, fragment,
+    tracking params (utm_*, fbclid, ...) and trailing slash dropped, query sorted."""
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.hostname:
+        return url
+    scheme = parts.scheme.casefold()
+    host = parts.hostname.casefold()
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not (k.casefold().startswith("utm_") or k.casefold() in _TRACKING_PARAMS))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
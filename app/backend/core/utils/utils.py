@@ -4,20 +4,26 @@ import json, re
 from typing import Iterable, List, Union
 from core.schemas import Fallacy
 
+_FENCE_OPEN = re.compile(r"```(?:json)?\s*", re.IGNORECASE)
+_BULLET_MARKS = ("- ", "• ", "* ", "– ", "— ")
+_BULLET_HEADS = frozenset(m[0] for m in _BULLET_MARKS)
+
 def json_load_safe(s: str) -> Union[dict, list]:
     """Best-effort JSON extractor:
     - strips ```json fences
-    - extracts first {...} or [...] block
+    - extracts the span from the first { or [ to the last matching closer
     - returns {} if all attempts fail
     """
     if not s:
         return {}
     t = s.strip()
 
-    # remove common code fences
+    # remove common code fences: ```json\n ... \n```
     if t.startswith("```"):
-        # drop ```json\n ... \n```
-        t = re.sub(r"^```(?:json)?\s*|\s*```$", "", t, flags=re.IGNORECASE | re.DOTALL).strip()
+        t = t[_FENCE_OPEN.match(t).end():]
+        if t.endswith("```"):
+            t = t[:-3]
+        t = t.strip()
 
     # direct load
     try:
@@ -25,20 +31,28 @@ def json_load_safe(s: str) -> Union[dict, list]:
     except Exception:
         pass
 
-    # extract first top-level JSON object/array
-    m = re.search(r"(\{.*\}|\[.*\])", t, flags=re.DOTALL)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except Exception:
-            return {}
-    return {}
+    # first { (or [) that has a } (or ]) after it, through the last one; two
+    # scans instead of a backtracking regex that is quadratic on unclosed braces
+    span = None
+    for opener, closer in ("{}", "[]"):
+        end = t.rfind(closer)
+        start = t.find(opener, 0, end) if end != -1 else -1
+        if start != -1 and (span is None or start < span[0]):
+            span = (start, end + 1)
+    if span is None or span == (0, len(t)):  # the whole text already failed to load
+        return {}
+    try:
+        return json.loads(t[span[0]:span[1]])
+    except Exception:
+        return {}
 
 def _clean_bullet_text(text: str) -> str:
     if not text:
         return ""
     t = text.strip()
-    for prefix in ("- ", "• ", "* ", "– ", "— "):
+    if t[:1] not in _BULLET_HEADS:
+        return t
+    for prefix in _BULLET_MARKS:
         if t.startswith(prefix):
             t = t[len(prefix):].lstrip()
     return t
@@ -46,20 +60,20 @@ def _clean_bullet_text(text: str) -> str:
 def format_bullets(bullets: Iterable[str]) -> str:
     if not bullets:
         return ""
-    cleaned = [_clean_bullet_text(b) for b in bullets if _clean_bullet_text(b)]
+    cleaned = [b for b in map(_clean_bullet_text, bullets) if b]
     if not cleaned:
         return ""
-    return "".join(f"- {b}\n" for b in cleaned)
+    return "- " + "\n- ".join(cleaned) + "\n"
 
 def format_ranked(ranked: List[dict]) -> str:
-    text = ""
+    lines = []
     for c in ranked or []:
         title = (c.get("title") or "").strip()
         why   = (c.get("why") or "").strip()
         if not (title or why):
             continue
-        text += f"{title}: {why}\n" if title and why else f"{why}\n"
-    return text
+        lines.append(f"{title}: {why}\n" if title and why else f"{why}\n")
+    return "".join(lines)
 
 def format_fallacies(models: List[Fallacy]) -> str:
     if not models:
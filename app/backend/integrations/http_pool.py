@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared keep-alive connection pools for the research integrations, so a
+# turn's Tavily/Wikipedia calls reuse TCP+TLS connections instead of paying
+# a handshake per request.
+
+POOL_SIZE = 16
+
+_sync_lock = threading.Lock()
+_sync_session: requests.Session | None = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def sync_session() -> requests.Session:
+    global _sync_session
+    if _sync_session is None:
+        with _sync_lock:
+            if _sync_session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _sync_session = s
+    return _sync_session
+
+def async_client() -> httpx.AsyncClient:
+    # an AsyncClient's pool is bound to the loop it first ran on
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+        client = _async_clients[loop] = httpx.AsyncClient(limits=limits, follow_redirects=True)
+    return client
+
+async def aclose() -> None:
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
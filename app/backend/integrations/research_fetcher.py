@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+from concurrent import futures
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from core.config import settings
+from core.telemetry.logger import logger
+from core.telemetry.metrics import registry
+from core.telemetry.tracing import traced
+from integrations import tavily_client, wikipedia_client
+from integrations.http_pool import POOL_SIZE
+
+# Runs Tavily alongside the Wikipedia opensearch + batched summary query
+# under one deadline. Whatever has arrived by the deadline is returned; slow or
+# failing providers cost at most the deadline and contribute nothing.
+
+FETCH_SECONDS = registry.histogram("research_fetch_seconds", "Research provider call latency", labels=("provider",))
+FETCH_TOTAL = registry.counter("research_fetch_total", "Research provider calls by outcome", labels=("provider", "outcome"))
+FETCH_DROPPED = registry.counter("research_fetch_dropped_total", "Provider calls cut off by the fetch deadline",
+                                 labels=("provider",))
+
+_MIN_IO_TIMEOUT_S = 0.05
+_pool = futures.ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="research")
+
+def _merge(tavily: List[Dict[str, Any]], wiki: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    seen = set()
+    merged = []
+    for it in (tavily + wiki):
+        url = it.get("url")
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        merged.append(it)
+    return merged
+
+def _record(provider: str, t0: float, outcome: str) -> None:
+    FETCH_SECONDS.observe(perf_counter() - t0, provider=provider)
+    FETCH_TOTAL.inc(provider=provider, outcome=outcome)
+
+async def _timed(provider: str, fn: Callable, empty, *args, **kwargs):
+    t0 = perf_counter()
+    try:
+        out = await fn(*args, **kwargs)
+    except asyncio.CancelledError:
+        FETCH_DROPPED.inc(provider=provider)
+        raise
+    except Exception as e:
+        _record(provider, t0, "error")
+        logger.warning("research %s failed: %r", provider, e)
+        return empty
+    _record(provider, t0, "ok")
+    return out
+
+def _timed_sync(provider: str, fn: Callable, empty, *args, **kwargs):
+    t0 = perf_counter()
+    try:
+        out = fn(*args, **kwargs)
+    except Exception as e:
+        _record(provider, t0, "error")
+        logger.warning("research %s failed: %r", provider, e)
+        return empty
+    _record(provider, t0, "ok")
+    return out
+
+@traced("fetch_sources")
+async def fetch_sources(query: str, max_results: int = 8,
+                        deadline_s: Optional[float] = None) -> List[Dict[str, Any]]:
+    if not query:
+        return []
+    deadline_s = settings.RESEARCH_DEADLINE_S if deadline_s is None else deadline_s
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline_s
+    io_timeout = lambda: max(_MIN_IO_TIMEOUT_S, end - loop.time())
+    tavily: List[Dict[str, Any]] = []
+    wiki: List[Dict[str, Any]] = []
+
+    async def _tavily():
+        tavily.extend(await _timed("tavily", tavily_client.asearch, [], query, max_results // 2, timeout=io_timeout()))
+
+    async def _wikipedia():
+        titles = await _timed("wikipedia_search", wikipedia_client.asearch_titles, [], query, max_results // 2,
+                              timeout=io_timeout())
+        if titles:
+            found = await _timed("wikipedia_summary", wikipedia_client.aget_summaries, {}, titles,
+                                 timeout=io_timeout())
+            wiki.extend(found.get(t) for t in titles)
+
+    tasks = [asyncio.create_task(_tavily()), asyncio.create_task(_wikipedia())]
+    _, pending = await asyncio.wait(tasks, timeout=deadline_s)
+    for t in pending:
+        t.cancel()
+    if pending:
+        await asyncio.wait(pending)
+    return _merge(tavily, [w for w in wiki if w])
+
+def fetch_sources_sync(query: str, max_results: int = 8,
+                       deadline_s: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Blocking twin of `fetch_sources` for callers without an event loop."""
+    if not query:
+        return []
+    deadline_s = settings.RESEARCH_DEADLINE_S if deadline_s is None else deadline_s
+    end = monotonic() + deadline_s
+    left = lambda: max(0.0, end - monotonic())
+    io_timeout = lambda: max(_MIN_IO_TIMEOUT_S, left())
+
+    # each task runs in a copy of the caller's context so its spans join the caller's trace
+    submit = lambda *a, **kw: _pool.submit(contextvars.copy_context().run, *a, **kw)
+    tav = submit(_timed_sync, "tavily", tavily_client.search, [], query, max_results // 2, timeout=io_timeout())
+    search = submit(_timed_sync, "wikipedia_search", wikipedia_client.search_titles, [], query,
+                    max_results // 2, timeout=io_timeout())
+    try:
+        titles = search.result(timeout=left())
+    except futures.TimeoutError:
+        FETCH_DROPPED.inc(provider="wikipedia_search")
+        titles = []
+    summaries = [submit(_timed_sync, "wikipedia_summary", wikipedia_client.get_summaries, {}, titles,
+                        timeout=io_timeout())] if titles else []
+    futures.wait([tav, *summaries], timeout=left())
+    # threads cannot be interrupted; late calls finish in the background and are ignored
+    for provider, fs in (("tavily", [tav]), ("wikipedia_summary", summaries)):
+        late = sum(not f.done() for f in fs)
+        if late:
+            FETCH_DROPPED.inc(late, provider=provider)
+    found = summaries[0].result() if summaries and summaries[0].done() else {}
+    return _merge(tav.result() if tav.done() else [], [w for w in (found.get(t) for t in titles) if w])
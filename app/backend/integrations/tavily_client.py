@@ -1,22 +1,20 @@
-import os, requests
 from typing import List, Dict, Any
 from core.config import settings
+from core.telemetry.calls import instrument
+from integrations.http_pool import sync_session, async_client
 
-API_URL = "https://api.tavily.com/search"
+TIMEOUT_S = 20
 
-def search(query: str, max_results: int = 6) -> List[Dict[str, Any]]:
-    if not settings.TAVILY_API_KEY:
-        return []
-    payload = {
+def _payload(query: str, max_results: int) -> Dict[str, Any]:
+    return {
         "api_key": settings.TAVILY_API_KEY,
         "query": query,
         "search_depth": "advanced",
         "include_answer": False,
         "max_results": max_results,
     }
-    r = requests.post(API_URL, json=payload, timeout=20)
-    r.raise_for_status()
-    data = r.json()
+
+def _parse(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     results = data.get("results", [])
     out = []
     for it in results:
@@ -26,3 +24,19 @@ def search(query: str, max_results: int = 6) -> List[Dict[str, Any]]:
             "snippet": it.get("content") or it.get("snippet") or "",
         })
     return out
+
+def search(query: str, max_results: int = 6, timeout: float = TIMEOUT_S) -> List[Dict[str, Any]]:
+    if not settings.TAVILY_API_KEY:
+        return []
+    with instrument("tavily"):
+        r = sync_session().post(settings.TAVILY_API_URL, json=_payload(query, max_results), timeout=timeout)
+        r.raise_for_status()
+    return _parse(r.json())
+
+async def asearch(query: str, max_results: int = 6, timeout: float = TIMEOUT_S) -> List[Dict[str, Any]]:
+    if not settings.TAVILY_API_KEY:
+        return []
+    with instrument("tavily"):
+        r = await async_client().post(settings.TAVILY_API_URL, json=_payload(query, max_results), timeout=timeout)
+        r.raise_for_status()
+    return _parse(r.json())
@@ -1,31 +1,134 @@
-import requests
-from typing import List, Dict
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import quote
+from core.config import settings
+from core.telemetry.calls import instrument
+from core.utils.lru import TTLLRU
+from integrations.http_pool import sync_session, async_client
 
-SEARCH_URL = "https://en.wikipedia.org/w/api.php"
-SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/{title}"
+TIMEOUT_S = 15
+BATCH_SIZE = 20  # MediaWiki serves intro extracts for at most 20 pages per query
 
-def search_titles(query: str, limit: int = 3) -> List[str]:
-    params = {
+# title -> summary ({} for a missing page) and (query, limit) -> titles
+_summary_cache = TTLLRU(max_entries=settings.WIKIPEDIA_CACHE_SIZE, ttl_s=settings.WIKIPEDIA_CACHE_TTL_S)
+_titles_cache = TTLLRU(max_entries=settings.WIKIPEDIA_CACHE_SIZE, ttl_s=settings.WIKIPEDIA_CACHE_TTL_S)
+
+def clear_caches() -> None:
+    _summary_cache.clear()
+    _titles_cache.clear()
+
+def _search_params(query: str, limit: int) -> Dict:
+    return {
         "action": "opensearch",
         "search": query,
         "limit": limit,
         "namespace": 0,
         "format": "json"
     }
-    r = requests.get(SEARCH_URL, params=params, timeout=15)
-    r.raise_for_status()
-    data = r.json()
-    titles = data[1] if isinstance(data, list) and len(data) > 1 else []
-    return titles
-
-def get_summary(title: str) -> Dict:
-    url = SUMMARY_URL.format(title=title.replace(" ", "_"))
-    r = requests.get(url, timeout=15)
-    if r.status_code != 200:
-        return {}
-    data = r.json()
+
+def _parse_titles(data) -> List[str]:
+    return data[1] if isinstance(data, list) and len(data) > 1 else []
+
+def _summary_url(title: str) -> str:
+    return settings.WIKIPEDIA_REST_URL.rstrip("/") + "/page/summary/" + quote(title.replace(" ", "_"), safe="")
+
+def _parse_summary(data: Dict, title: str) -> Dict:
     return {
         "title": data.get("title", title),
         "url": data.get("content_urls", {}).get("desktop", {}).get("page", ""),
         "snippet": data.get("extract", ""),
     }
+
+def _query_params(titles: List[str]) -> Dict:
+    return {
+        "action": "query",
+        "prop": "extracts|info",
+        "exintro": 1,
+        "explaintext": 1,
+        "exlimit": "max",
+        "inprop": "url",
+        "redirects": 1,
+        "titles": "|".join(titles),
+        "format": "json",
+        "formatversion": 2,
+    }
+
+def _parse_pages(data: Dict, titles: List[str]) -> Dict[str, Dict]:
+    q = data.get("query", {})
+    # requested title -> normalized -> redirect target
+    alias = {m["from"]: m["to"] for m in q.get("normalized", []) + q.get("redirects", [])}
+    pages = {p["title"]: p for p in q.get("pages", []) if not p.get("missing") and not p.get("invalid")}
+    out = {}
+    for t in titles:
+        final = t
+        for _ in range(3):
+            final = alias.get(final, final)
+        p = pages.get(final)
+        out[t] = {"title": p["title"], "url": p.get("fullurl", ""), "snippet": p.get("extract", "")} if p else {}
+    return out
+
+def _titles_key(query: str, limit: int) -> Tuple[str, int]:
+    return " ".join(query.lower().split()), limit
+
+def _split_cached(titles: Iterable[str]) -> Tuple[Dict[str, Dict], List[str]]:
+    hits, misses = {}, []
+    for t in dict.fromkeys(titles):
+        s = _summary_cache.get(t)
+        if s is None:
+            misses.append(t)
+        else:
+            hits[t] = s
+    return hits, [misses[i:i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+
+def _store(fetched: Dict[str, Dict]) -> Dict[str, Dict]:
+    for t, s in fetched.items():
+        _summary_cache.set(t, s)
+    return fetched
+
+def search_titles(query: str, limit: int = 3, timeout: float = TIMEOUT_S) -> List[str]:
+    key = _titles_key(query, limit)
+    titles = _titles_cache.get(key)
+    if titles is None:
+        with instrument("wiki"):
+            r = sync_session().get(settings.WIKIPEDIA_API_URL, params=_search_params(query, limit), timeout=timeout)
+            r.raise_for_status()
+        titles = _parse_titles(r.json())
+        _titles_cache.set(key, titles)
+    return list(titles)
+
+def get_summaries(titles: List[str], timeout: float = TIMEOUT_S) -> Dict[str, Dict]:
+    """Summaries for many titles: cache first, then one `action=query` request per 20 misses."""
+    out, batches = _split_cached(titles)
+    for batch in batches:
+        with instrument("wiki"):
+            r = sync_session().get(settings.WIKIPEDIA_API_URL, params=_query_params(batch), timeout=timeout)
+            r.raise_for_status()
+        out.update(_store(_parse_pages(r.json(), batch)))
+    return out
+
+# One REST call per title: the pre-batching path, kept as the baseline for bench/wiki_batch.py.
+def get_summary(title: str, timeout: float = TIMEOUT_S) -> Dict:
+    with instrument("wiki"):
+        r = sync_session().get(_summary_url(title), timeout=timeout)
+    if r.status_code != 200:
+        return {}
+    return _parse_summary(r.json(), title)
+
+async def asearch_titles(query: str, limit: int = 3, timeout: float = TIMEOUT_S) -> List[str]:
+    key = _titles_key(query, limit)
+    titles = _titles_cache.get(key)
+    if titles is None:
+        with instrument("wiki"):
+            r = await async_client().get(settings.WIKIPEDIA_API_URL, params=_search_params(query, limit), timeout=timeout)
+            r.raise_for_status()
+        titles = _parse_titles(r.json())
+        _titles_cache.set(key, titles)
+    return list(titles)
+
+async def aget_summaries(titles: List[str], timeout: float = TIMEOUT_S) -> Dict[str, Dict]:
+    out, batches = _split_cached(titles)
+    for batch in batches:
+        with instrument("wiki"):
+            r = await async_client().get(settings.WIKIPEDIA_API_URL, params=_query_params(batch), timeout=timeout)
+            r.raise_for_status()
+        out.update(_store(_parse_pages(r.json(), batch)))
+    return out
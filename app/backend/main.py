@@ -1,10 +1,17 @@
 # app/backend/main.py
 import os
 import uuid
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers import session, chat, columns
+from api.routers import session, chat, columns, batch
 from core.config import settings
+from core.llm.cache import llm_cache
+from core.llm.prompts import prompt_report
+from core.llm.tiers import tier_report
+from agents.tools.research import cache_stats as research_cache_stats
+from core.telemetry.metrics import registry
+from core.telemetry.tracing import buffer as trace_buffer
 from fastapi.routing import APIRoute
 
 app = FastAPI(title="Debate Coach", version="0.1.0")
@@ -20,6 +27,7 @@ app.add_middleware(
 app.include_router(session.router, prefix="/api")
 app.include_router(chat.router,    prefix="/api")
 app.include_router(columns.router, prefix="/api")
+app.include_router(batch.router,   prefix="/api")
 
 
 @app.get("/health")
@@ -30,6 +38,11 @@ def health():
 def healthz():
     return "ok"
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus scrape target
+    return PlainTextResponse(registry.exposition(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 def api_health():
     return {"status": "ok"}
@@ -40,4 +53,35 @@ def _list_routes():
     for r in app.routes:
         if isinstance(r, APIRoute) and r.path.startswith("/api/"):
             routes.append({"path": r.path, "methods": list(r.methods)})
-    return {"routes": routes}
\ No newline at end of file
+    return {"routes": routes}
+
+@app.get("/api/_debug/llm_cache")
+def _llm_cache_stats():
+    return llm_cache.stats()
+
+@app.get("/api/_debug/llm_tiers")
+def _llm_tier_report():
+    return tier_report()
+
+@app.get("/api/_debug/prompts")
+def _prompt_report():
+    return prompt_report()
+
+@app.get("/api/_debug/research_cache")
+def _research_cache_stats():
+    return research_cache_stats()
+
+@app.get("/api/_debug/traces")
+def _recent_traces(limit: int = 50):
+    return {"traces": trace_buffer.recent(limit)}
+
+@app.get("/api/_debug/traces/{turn_id}")
+def _trace(turn_id: str):
+    tree = trace_buffer.tree(turn_id)
+    if tree is None:
+        raise HTTPException(status_code=404, detail="Trace not found (unknown or already evicted)")
+    return tree
+
+@app.get("/api/_debug/metrics")
+def _metrics_snapshot():
+    return registry.snapshot()
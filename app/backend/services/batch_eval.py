@@ -0,0 +1,151 @@
+import asyncio
+import random
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from agents.executors import debate_executor, pitch_executor
+from agents.tools.fallacies import detect_fallacies_many
+from agents.tools.scoring import score_claims
+from core.config import settings
+from core.schemas import BatchItem, Mode
+from core.telemetry.logger import logger
+from core.telemetry.metrics import registry
+from core.turn import TurnContext
+from core.utils.limiter import AdaptiveLimiter, is_rate_limited
+
+BATCH_ITEMS = registry.counter("batch_items_total", "Batch evaluation items by outcome", labels=("outcome",))
+BATCH_LIMIT = registry.gauge("batch_concurrency_limit", "Current adaptive concurrency of the last batch")
+
+class _PackedFallacies:
+    """Fallacy checks for a batch, LLM_PACK_SIZE claims per request. A pack is
+    requested when its first item gets a concurrency slot, so packed calls
+    stay within the batch's limiter."""
+
+    def __init__(self, texts: List[str], k: int):
+        self.texts = texts
+        self.k = max(1, k)
+        self._packs: Dict[int, asyncio.Task] = {}
+
+    async def get(self, index: int) -> list:
+        p = index // self.k
+        task = self._packs.get(p)
+        if task is None:
+            task = self._packs[p] = asyncio.ensure_future(
+                detect_fallacies_many(self.texts[p * self.k:(p + 1) * self.k], self.k))
+        return (await asyncio.shield(task))[index % self.k]
+
+    def cancel(self) -> None:
+        for t in self._packs.values():
+            t.cancel()
+
+class _PackedScores:
+    """Backup scores for items whose evaluation came back without one. The
+    first claim goes out alone; claims that need a score while a request is
+    in flight queue up and go out together, LLM_PACK_SIZE per request."""
+
+    def __init__(self, k: int):
+        self.k = max(1, k)
+        self._queue: List[Tuple[str, asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+
+    async def get(self, text: str) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.append((text, fut))
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._drain())
+        return await asyncio.shield(fut)
+
+    async def _drain(self) -> None:
+        while self._queue:
+            pack, self._queue = self._queue[:self.k], self._queue[self.k:]
+            try:
+                scores = await score_claims([text for text, _ in pack], self.k)
+            except Exception as e:
+                scores = [e] * len(pack)
+            for (_, fut), s in zip(pack, scores):
+                if fut.done():
+                    continue
+                if isinstance(s, Exception):
+                    fut.set_exception(s)
+                else:
+                    fut.set_result(s)
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+async def _evaluate_one(mode: Mode, text: str, fallacy_check: bool, ctx: TurnContext | None = None) -> Dict[str, Any]:
+    # straight to the evaluation executor: no triage / supervisor / planner
+    if mode == Mode.debate_counter:
+        result = await debate_executor.execute(intent="evaluate_argument", claim=text, need_fallacy=fallacy_check,
+                                               ctx=ctx)
+    else:
+        result = await pitch_executor.execute(intent="ruthless_impression", pitch_text=text, need_fallacy=False,
+                                              ctx=ctx)
+    score = result.get("score")
+    return {
+        "score": score.model_dump() if score is not None else None,
+        "con": [ev.payload for ev in result.get("events", [])],
+        "fallacies": result.get("fallacies") or [],
+    }
+
+async def _run_item(limiter: AdaptiveLimiter, mode: Mode, index: int, item: BatchItem,
+                    fallacy_check: bool, packed: _PackedFallacies | None,
+                    scores: _PackedScores | None) -> Dict[str, Any]:
+    t0 = perf_counter()
+    out: Dict[str, Any] = {"index": index, "id": item.id}
+    for attempt in range(settings.BATCH_MAX_ATTEMPTS):
+        await limiter.acquire()
+        throttled = False
+        try:
+            ctx = TurnContext()
+            if packed is not None and attempt == 0:
+                # the executor's fallacy step picks this item out of its pack
+                ctx.provide("fallacies", item.text, packed.get(index))
+            if scores is not None:
+                # only asked for when the evaluation reply has no usable score
+                ctx.defer("score", item.text, scores.get, item.text)
+            out.update(await _evaluate_one(mode, item.text, fallacy_check, ctx), ok=True)
+            break
+        except Exception as e:
+            throttled = is_rate_limited(e)
+            if not throttled or attempt == settings.BATCH_MAX_ATTEMPTS - 1:
+                logger.warning("batch item %s failed: %r", index, e)
+                out.update(ok=False, error=f"{type(e).__name__}: {e}")
+                break
+        finally:
+            await limiter.release(throttled=throttled)
+        # throttled: back off with jitter; the limiter has already shrunk
+        await asyncio.sleep(settings.BATCH_BACKOFF_S * (2 ** attempt) * random.uniform(0.5, 1.5))
+    out["ms"] = round((perf_counter() - t0) * 1000, 1)
+    BATCH_ITEMS.inc(outcome="ok" if out.get("ok") else "error")
+    return out
+
+async def evaluate_batch(mode: Mode, items: List[BatchItem], fallacy_check: bool = True,
+                         concurrency: int | None = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one result per item as it completes, then a summary line."""
+    t0 = perf_counter()
+    limit = min(concurrency or settings.BATCH_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    limiter = AdaptiveLimiter(initial=limit, max_limit=settings.BATCH_MAX_CONCURRENCY, on_change=BATCH_LIMIT.set)
+    BATCH_LIMIT.set(limiter.limit)
+    packed = None
+    if mode == Mode.debate_counter and fallacy_check and settings.LLM_PACK_SIZE > 1:
+        packed = _PackedFallacies([it.text for it in items], settings.LLM_PACK_SIZE)
+    scores = _PackedScores(settings.LLM_PACK_SIZE) if settings.LLM_PACK_SIZE > 1 else None
+    tasks = [asyncio.create_task(_run_item(limiter, mode, i, it, fallacy_check, packed, scores))
+             for i, it in enumerate(items)]
+    ok = 0
+    try:
+        for fut in asyncio.as_completed(tasks):
+            res = await fut
+            ok += bool(res.get("ok"))
+            yield res
+    finally:
+        for t in tasks:
+            t.cancel()  # client went away: stop spending tokens
+        if packed is not None:
+            packed.cancel()
+        if scores is not None:
+            scores.cancel()
+    yield {"done": True, "total": len(items), "ok": ok, "failed": len(items) - ok,
+           "ms": round((perf_counter() - t0) * 1000, 1), "final_concurrency": round(limiter.limit, 2)}
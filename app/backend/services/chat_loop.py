@@ -1,16 +1,22 @@
 from typing import List
 from core.schemas import ChatIn, ChatOut, Event, Column, Intent, Mode, Source, Score
 from core.state import SessionStore
-from agents.supervisor.supervisor_agent import decide
+from core.telemetry.logger import logger
+from core.telemetry.tracing import trace
+from core.turn import TurnContext
+from core.utils.scheduler import StepGraph
+from agents.supervisor.supervisor_agent import decide, advisory_claim
+from agents.triage.triage_agent import classify_intent
+from agents.triage.fast_path import fast_decide
 from agents.executors import debate_executor, pitch_executor
 from agents.tools.parsing import extract_claim_or_empty
+from agents.tools.research import to_sources
 
 def _reply(chat_reply: str, events: List[Event], score, fallacies) -> ChatOut:
     return ChatOut(chat_reply=chat_reply, events=events, score=score, fallacies=fallacies or [])
 
-def _persist_pro_if_any(user_text: str, st, store: SessionStore, session_id: str) -> List[Event]:
+def _persist_pro_if_any(extracted: dict, st, store: SessionStore, session_id: str) -> List[Event]:
     events: List[Event] = []
-    extracted = extract_claim_or_empty(user_text)
     if extracted:
         normalized = (extracted.get("normalized") or "").strip()
         original = (extracted.get("original_text") or "").strip()
@@ -39,8 +45,18 @@ def _intent_override(user_text: str) -> str | None:
         return "research"
     return None
 
-def run_chat_turn(payload: ChatIn, store: SessionStore) -> ChatOut:
+async def run_chat_turn(payload: ChatIn, store: SessionStore, ctx: TurnContext | None = None) -> ChatOut:
     st = store.get(payload.session_id)
+    try:
+        with trace("turn", session_id=payload.session_id, mode=st.mode.value) as root:
+            out = await _run_turn(payload, store, st, ctx or TurnContext())
+            out.turn_id = root.trace_id
+            return out
+    finally:
+        # hand the turn's scalar updates (last claim, intent, flags) back to the backend
+        store.save(payload.session_id, st)
+
+async def _run_turn(payload: ChatIn, store: SessionStore, st, ctx: TurnContext) -> ChatOut:
     mode = st.mode
     user_text = payload.user_text
 
@@ -48,21 +64,44 @@ def run_chat_turn(payload: ChatIn, store: SessionStore) -> ChatOut:
     fallacies = []
     score = None
 
-    # 1) Extract & persist PRO
-    events_to_return.extend(_persist_pro_if_any(user_text, st, store, payload.session_id))
-
-    # 2) Supervisor + local override
-    flags = {
-        "did_fallacy_on_this_claim": st.did_fallacy_on_this_claim,
-        "last_intent": st.last_intent.value if st.last_intent else None,
-        "has_new_claim": st.has_new_claim_this_turn,
-        "has_last_claim": bool(st.last_user_claim_raw),
-    }
-    cmd = decide(mode, user_text, flags)
+    # 1) Extract & persist PRO, 2) Supervisor. Extraction and triage don't
+    # depend on each other, so they run concurrently; the supervisor's
+    # advisory extraction reuses this turn's extraction via ctx.
+    async def _persist(r):
+        pro = _persist_pro_if_any(r["extract"], st, store, payload.session_id)
+        events_to_return.extend(pro)
+        if pro:
+            ctx.emit("pro", {"events": [ev.model_dump(mode="json") for ev in pro]})
+
+    async def _decide(r):
+        flags = {
+            "did_fallacy_on_this_claim": st.did_fallacy_on_this_claim,
+            "last_intent": st.last_intent.value if st.last_intent else None,
+            "has_new_claim": st.has_new_claim_this_turn,
+            "has_last_claim": bool(st.last_user_claim_raw),
+        }
+        return await decide(mode, user_text, flags, tri=r["triage"], claim=r["claim"], ctx=ctx)
+
+    # A bare command ("evaluate", "objections please") carries no claim and
+    # needs no triage/supervisor/planner: resolve it locally.
+    cmd = fast_decide(user_text)
+    if cmd:
+        _persist_pro_if_any({}, st, store, payload.session_id)
+    else:
+        graph = StepGraph()
+        graph.add("extract", lambda _: ctx.once("extract", user_text, extract_claim_or_empty, user_text))
+        graph.add("triage", lambda _: ctx.once("triage", (mode.value, user_text), classify_intent, mode.value, user_text))
+        graph.add("claim", lambda r: advisory_claim(r["triage"], user_text, ctx), deps=("triage",))
+        graph.add("persist", _persist, deps=("extract",))
+        graph.add("decide", _decide, deps=("persist", "triage", "claim"))
+        cmd = (await graph.run("decide"))["decide"]
+        logger.info("turn steps: %s memo: %s", graph.report(), ctx.stats())
+
+    # Local override
     intent = cmd.get("intent", "none")
 
     # Hard override: if user explicitly asked, trust the user
-    override = _intent_override(user_text)
+    override = cmd.get("intent") if cmd.get("fast_path") else _intent_override(user_text)
     if override:
         intent = override
         cmd["command"] = "RUN_PIPELINE"
@@ -73,6 +112,7 @@ def run_chat_turn(payload: ChatIn, store: SessionStore) -> ChatOut:
         st.last_intent = Intent(intent)
 
     command = cmd.get("command")
+    ctx.emit("decision", {"command": command, "intent": intent, "plan_steps": cmd.get("plan_steps")})
 
     # If a new PRO just arrived, do NOT run pipeline automatically: always nudge
     if st.has_new_claim_this_turn and command == "RUN_PIPELINE" and intent != "research" and not override:
@@ -118,27 +158,30 @@ def run_chat_turn(payload: ChatIn, store: SessionStore) -> ChatOut:
         else:
             claim = st.last_user_claim_raw or user_text
 
-        if intent == "research":
-            return _reply("I can't do research yet, sorry!.", events_to_return, score, fallacies)
-
         if mode == Mode.debate_counter:
-            result = debate_executor.execute(intent=intent, claim=claim, need_fallacy=need_fallacy)
+            result = await debate_executor.execute(intent=intent, claim=claim, need_fallacy=need_fallacy, ctx=ctx)
         else:
             pin = intent
             if intent == "give_objections":
                 pin = "objections"
             if intent == "evaluate_argument":
                 pin = "ruthless_impression"
-            result = pitch_executor.execute(intent=pin, pitch_text=claim, need_fallacy=False)
+            result = await pitch_executor.execute(intent=pin, pitch_text=claim, need_fallacy=False, ctx=ctx)
 
-        # Persist CON events; append to return list
+        # Persist CON events and merge researched sources; append to return list
         for ev in result.get("events", []):
             if ev.column == Column.CON:
                 store.append_event(payload.session_id, ev)
+            elif ev.column == Column.SOURCES and isinstance(ev.payload, dict):
+                store.add_sources(payload.session_id, to_sources(ev.payload.get("added") or []))
             events_to_return.append(ev)
 
         fallacies = result.get("fallacies") or []
         score = result.get("score")
+        ctx.emit("con", {"events": [ev.model_dump(mode="json") for ev in result.get("events", [])]})
+        if score is not None:
+            ctx.emit("score", score.model_dump())
+        logger.info("executor steps: %s", result.get("timings"))
 
         # Optional: cache score in session (if field exists)
         try:
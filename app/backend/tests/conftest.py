@@ -1,11 +1,15 @@
+import os
 import json
 import pytest
 from fastapi.testclient import TestClient
 import importlib
 
+# The LLM client is built at import time; tests never reach the provider.
+os.environ.setdefault("AIML_API_KEY", "test-key")
+
 # --- Deterministic stubs for LLM and research ---
 
-def _triage_stub(mode: str, user_text: str):
+async def _triage_stub(mode: str, user_text: str):
     txt = user_text.lower()
     if "evaluate_argument" in txt or "ruthless_impression" in txt:
         return {"intent": "evaluate_argument", "has_new_claim": False}
@@ -17,7 +21,7 @@ def _triage_stub(mode: str, user_text: str):
     has_claim = any(k in txt for k in ["my claim:", "pitch:"])
     return {"intent": "none", "has_new_claim": has_claim}
 
-def _planner_stub(mode: str, intent: str, flags: dict):
+async def _planner_stub(mode: str, intent: str, flags: dict):
     # Always insert FALLACY before critique/objections
     if intent in ("evaluate_argument", "give_objections"):
         return ["FALLACY_CHECK", "EXECUTOR:" + intent, "SCORE", "SUGGEST_NEXT"]
@@ -25,7 +29,7 @@ def _planner_stub(mode: str, intent: str, flags: dict):
         return ["EXECUTOR:research", "SUGGEST_NEXT"]
     return ["EXECUTOR:offer_actions"]
 
-def _supervisor_stub(system: str, user: str, temperature: float = 0.0, max_tokens: int = 300):
+async def _supervisor_stub(system: str, user: str, temperature: float = 0.0, max_tokens: int = 300, site: str = "supervisor"):
     # Read session flags from user content (we know our prompt shape)
     # Simplify: if has_new_claim -> UPDATE_PRO_ONLY; if intent present -> RUN_PIPELINE; else OFFER_ACTIONS
     # This is a crude but deterministic parser over the JSON embedded in the user message.
@@ -46,7 +50,7 @@ def _supervisor_stub(system: str, user: str, temperature: float = 0.0, max_token
         return json.dumps({"command": "RUN_PIPELINE", "reason": "do action"})
     return json.dumps({"command": "OFFER_ACTIONS", "reason": "no intent"})
 
-def _extract_claim_stub(user_text: str):
+async def _extract_claim_stub(user_text: str):
     txt = user_text.strip()
     if txt.lower().startswith("my claim:"):
         return {"original_text": txt, "normalized": "banning cash will reduce crime"}
@@ -54,16 +58,19 @@ def _extract_claim_stub(user_text: str):
         return {"original_text": txt, "normalized": "drone grocery delivery cuts times by 80%"}
     return {}
 
-def _fallacies_stub(text: str):
+async def _fallacies_stub(text: str):
     # Return one fallacy for visibility
     return [{"code": "appeal_to_authority", "label": "Appeal to authority", "emoji": "🎓", "why": "Cites authority without evidence."}]
 
-def _score_stub(claim: str, context_hint: str = ""):
+async def _fallacies_many_stub(texts, k=None):
+    return [await _fallacies_stub(t) for t in texts]
+
+async def _score_stub(claim: str, context_hint: str = ""):
     return {"bullets": ["Clarity is moderate", "Evidence is limited"], "score": {"value": 67, "reasons": ["baseline stub"]}}
 
-def _main_chat_eval_stub(system: str, user: str, temperature: float = 0.3, max_tokens: int = 900):
+async def _main_chat_eval_stub(system: str, user: str, temperature: float = 0.3, max_tokens: int = 900, cache: bool | None = None):
     # Executors expect JSON for evaluation and objections
-    if "generate top objections" in system.lower() or "ranked counter-arguments" in system.lower():
+    if any(k in system.lower() for k in ("generate top objections", "ranked counter-arguments", "ranked objections")):
         payload = {"ranked": [
             {"title": "Displacement effect", "why": "Crime shifts to digital methods"},
             {"title": "Unbanked population", "why": "Harms those without access to banking"},
@@ -76,13 +83,19 @@ def _main_chat_eval_stub(system: str, user: str, temperature: float = 0.3, max_t
     ], "score": {"value": 62, "reasons": ["logic gaps", "weak evidence"]}}
     return json.dumps(payload)
 
-def _research_gather_stub(query: str, max_results: int = 8):
+async def _main_chat_stream_stub(system: str, user: str, on_delta, temperature: float = 0.3, max_tokens: int = 900):
+    out = await _main_chat_eval_stub(system, user, temperature, max_tokens)
+    for i in range(0, len(out), 16):
+        on_delta(out[i:i + 16])
+    return out
+
+async def _research_gather_stub(query: str, max_results: int = 8):
     return [
         {"title": "UN report on cash and crime", "url": "https://example.org/un-cash", "snippet": "Mixed evidence"},
         {"title": "Academic study on cashless and crime", "url": "https://example.org/paper-cashless", "snippet": "Shows displacement"},
     ]
 
-def _research_classify_stub(claim: str, sources):
+async def _research_classify_stub(claim: str, sources):
     return [
         {"url":"https://example.org/un-cash", "title":"UN report on cash and crime", "supports":"neutral", "reliability":"high", "tag":"⚠️", "note":"Evidence mixed."},
         {"url":"https://example.org/paper-cashless", "title":"Academic study on cashless and crime", "supports":"undermines", "reliability":"high", "tag":"❌", "note":"Suggests displacement."}
@@ -90,34 +103,38 @@ def _research_classify_stub(claim: str, sources):
 
 @pytest.fixture(autouse=True)
 def patch_llm_and_tools(monkeypatch):
+    # Agents import their collaborators by name, so stubs go where they are used.
+    from agents.supervisor import supervisor_agent
+    from agents.executors import common, debate_executor, pitch_executor
+    from services import chat_loop, batch_eval
+
     # TRIAGE & PLANNER
-    from agents.triage import triage_agent
-    from agents.planner import planner_agent
-    monkeypatch.setattr(triage_agent, "classify_intent", _triage_stub)
-    monkeypatch.setattr(planner_agent, "plan_steps", _planner_stub)
+    monkeypatch.setattr(supervisor_agent, "classify_intent", _triage_stub)
+    monkeypatch.setattr(chat_loop, "classify_intent", _triage_stub)
+    monkeypatch.setattr(supervisor_agent, "plan_steps", _planner_stub)
 
-    # SUPERVISOR (smol client chat)
-    from core.llm import smol_client
-    monkeypatch.setattr(smol_client, "chat", _supervisor_stub)
+    # SUPERVISOR (raw command chat)
+    monkeypatch.setattr(supervisor_agent, "chat", _supervisor_stub)
 
     # Parsing (claim extractor)
-    from agents.tools import parsing as parsing_tool
-    monkeypatch.setattr(parsing_tool, "extract_claim_or_empty", _extract_claim_stub)
-
-    # Fallacies + Scoring
-    from agents.tools import fallacies as fall_tool
-    from agents.tools import scoring as score_tool
-    monkeypatch.setattr(fall_tool, "detect_fallacies", _fallacies_stub)
-    monkeypatch.setattr(score_tool, "score_claim", _score_stub)
-
-    # Executors main chat (evaluation/objections JSON)
-    from core.llm import main_client
-    monkeypatch.setattr(main_client, "chat", _main_chat_eval_stub)
-
-    # Research
-    from agents.tools import research as research_tool
-    monkeypatch.setattr(research_tool, "gather_sources", _research_gather_stub)
-    monkeypatch.setattr(research_tool, "classify_sources", _research_classify_stub)
+    monkeypatch.setattr(supervisor_agent, "extract_claim_or_empty", _extract_claim_stub)
+    monkeypatch.setattr(chat_loop, "extract_claim_or_empty", _extract_claim_stub)
+
+    # Packed bulk fallacy checks
+    monkeypatch.setattr(batch_eval, "detect_fallacies_many", _fallacies_many_stub)
+
+    for executor in (debate_executor, pitch_executor):
+        # Fallacies + Scoring
+        monkeypatch.setattr(executor, "detect_fallacies", _fallacies_stub)
+        monkeypatch.setattr(executor, "score_claim", _score_stub)
+
+        # Research
+        monkeypatch.setattr(executor, "gather_sources", _research_gather_stub)
+        monkeypatch.setattr(executor, "classify_sources", _research_classify_stub)
+
+    # Executors main chat (evaluation/objections JSON), streamed or not
+    monkeypatch.setattr(common, "main_chat", _main_chat_eval_stub)
+    monkeypatch.setattr(common, "main_chat_stream", _main_chat_stream_stub)
 
     yield
 
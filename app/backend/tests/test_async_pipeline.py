@@ -0,0 +1,34 @@
+import asyncio
+import json
+import time
+
+from core.schemas import ChatIn, Mode
+from core.state import InMemorySessionStore
+from services.chat_loop import run_chat_turn
+
+def test_concurrent_turns_share_one_event_loop(monkeypatch):
+    from agents.executors import common
+
+    latency = 0.2
+
+    async def slow_eval(system: str, user: str, temperature: float = 0.3, max_tokens: int = 900):
+        await asyncio.sleep(latency)
+        return json.dumps({"bullets": ["ok"], "score": {"value": 50, "reasons": ["stub"]}})
+
+    monkeypatch.setattr(common, "main_chat", slow_eval)
+
+    store = InMemorySessionStore()
+    sids = [store.create(mode=Mode.debate_counter) for _ in range(20)]
+
+    async def run_all():
+        return await asyncio.gather(*[
+            run_chat_turn(ChatIn(session_id=sid, user_text="evaluate_argument"), store) for sid in sids
+        ])
+
+    t0 = time.perf_counter()
+    outs = asyncio.run(run_all())
+    elapsed = time.perf_counter() - t0
+
+    assert all(o.score is not None and o.score.value == 50 for o in outs)
+    # 20 sequential turns would take 4s; concurrent ones overlap on the sleep
+    assert elapsed < latency * 5
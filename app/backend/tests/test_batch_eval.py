@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from core.config import settings
+from core.utils.limiter import AdaptiveLimiter
+from services import batch_eval
+
+class _Throttled(Exception):
+    status_code = 429
+
+def _lines(r):
+    return [json.loads(ln) for ln in r.text.splitlines() if ln.strip()]
+
+def test_batch_streams_ndjson_per_item(client):
+    items = [{"id": f"s{i}", "text": f"Claim {i}: cash causes crime."} for i in range(5)]
+    r = client.post("/api/batch/evaluate", json={"mode": "debate_counter", "items": items})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(r)
+    results, summary = lines[:-1], lines[-1]
+    assert sorted(x["index"] for x in results) == list(range(5))
+    assert all(x["ok"] and x["score"]["value"] == 62 and x["id"] == f"s{x['index']}" for x in results)
+    assert summary["done"] and summary["ok"] == 5 and summary["failed"] == 0
+
+def test_pitch_batch_and_validation(client):
+    r = client.post("/api/batch/evaluate", json={"mode": "pitch_objections", "items": [{"text": "Drones for farms"}]})
+    assert _lines(r)[0]["ok"]
+    assert client.post("/api/batch/evaluate", json={"mode": "debate_counter", "items": []}).status_code == 422
+
+def test_concurrency_is_bounded_and_throttles_are_retried(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_BACKOFF_S", 0.001)
+    state = {"inflight": 0, "peak": 0, "calls": 0}
+
+    async def fake_eval(mode, text, fallacy_check, ctx=None):
+        state["calls"] += 1
+        n = state["calls"]
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        try:
+            await asyncio.sleep(0.005)
+            if n in (3, 4):
+                raise _Throttled("slow down")
+            if text == "bad":
+                raise ValueError("boom")
+            return {"score": {"value": 1, "reasons": []}, "con": [], "fallacies": []}
+        finally:
+            state["inflight"] -= 1
+
+    monkeypatch.setattr(batch_eval, "_evaluate_one", fake_eval)
+    items = [batch_eval.BatchItem(text="bad" if i == 7 else f"c{i}") for i in range(12)]
+
+    async def run():
+        return [x async for x in batch_eval.evaluate_batch("debate_counter", items, concurrency=4)]
+
+    out = asyncio.run(run())
+    summary = out[-1]
+    assert state["peak"] <= 4
+    assert state["calls"] == 14  # two throttled attempts retried
+    assert (summary["ok"], summary["failed"]) == (11, 1)
+    assert next(x for x in out if x.get("index") == 7)["error"] == "ValueError: boom"
+
+def test_limiter_is_aimd():
+    clock = [0.0]
+    lim = AdaptiveLimiter(initial=8, max_limit=10, cooldown_s=1.0, clock=lambda: clock[0])
+
+    async def run():
+        for _ in range(3):  # a burst of 429s is one cut
+            await lim.acquire()
+            await lim.release(throttled=True)
+        assert lim.limit == 4
+        clock[0] = 2.0
+        await lim.acquire()
+        await lim.release(throttled=True)
+        assert lim.limit == 2
+        for _ in range(20):
+            await lim.acquire()
+            await lim.release()
+        return lim.limit
+
+    assert 6 < asyncio.run(run()) <= 10
+
+def test_debate_batch_packs_fallacy_checks(client, monkeypatch):
+    packs = []
+
+    async def many(texts, k=None):
+        packs.append(list(texts))
+        return [[{"code": "false_cause", "label": "False cause", "emoji": "🔗", "why": t}] for t in texts]
+
+    monkeypatch.setattr(batch_eval, "detect_fallacies_many", many)
+    monkeypatch.setattr(settings, "LLM_PACK_SIZE", 4)
+    items = [{"text": f"claim {i}"} for i in range(10)]
+    results = _lines(client.post("/api/batch/evaluate", json={"mode": "debate_counter", "items": items}))[:-1]
+    assert sorted(len(p) for p in packs) == [2, 4, 4]
+    assert all(r["fallacies"][0]["why"] == f"claim {r['index']}" for r in results)
+
+def test_backup_scores_are_packed(client, monkeypatch):
+    from agents.executors import common
+    packs = []
+    good = common.main_chat
+
+    async def chat(system, user, **kw):
+        return "no json here" if "garbled" in user else await good(system, user, **kw)
+
+    async def score_claims(claims, k=None):
+        packs.append(list(claims))
+        await asyncio.sleep(0.01)
+        return [{"bullets": [], "score": {"value": 40, "reasons": [c]}} for c in claims]
+
+    monkeypatch.setattr(common, "main_chat", chat)
+    monkeypatch.setattr(batch_eval, "score_claims", score_claims)
+    monkeypatch.setattr(settings, "LLM_PACK_SIZE", 4)
+    items = [{"text": f"garbled claim {i}" if i % 3 else f"claim {i}"} for i in range(9)]
+    results = _lines(client.post("/api/batch/evaluate", json={"mode": "debate_counter", "items": items}))[:-1]
+    by_index = {r["index"]: r["score"] for r in results}
+    assert all(by_index[i]["value"] == 62 for i in (0, 3, 6))
+    assert all(by_index[i] == {"value": 40, "reasons": [items[i]["text"]]} for i in by_index if i % 3)
+    # six backup scores in fewer than six requests, none larger than the pack size
+    assert sorted(c for p in packs for c in p) == sorted(it["text"] for it in items if "garbled" in it["text"])
+    assert len(packs) < 6 and max(map(len, packs)) <= 4
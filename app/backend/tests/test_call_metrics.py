@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from bench.fake_llm import FakeAsyncLLM
+from core.llm import main_client
+from core.llm.tiers import route
+from core.telemetry.calls import CALL_RETRIES, CALL_SECONDS, CALL_TOKENS, PARSE_FAILURES, instrument
+from core.telemetry.metrics import Registry
+from agents.planner import planner_agent
+from agents.triage import triage_agent
+
+def test_llm_calls_are_recorded_per_site_and_model(monkeypatch):
+    fake = FakeAsyncLLM(latency_s=0, fail_first=1)
+    monkeypatch.setattr(main_client, "client", fake)
+    monkeypatch.setattr(main_client.gateway, "backoff_s", 0)
+    model = route("triage").model
+    seconds = CALL_SECONDS.count(site="triage", model=model, outcome="ok")
+    throttled = CALL_SECONDS.count(site="triage", model=model, outcome="throttled")
+    retries = CALL_RETRIES.value(site="triage", reason="429")
+    tokens = CALL_TOKENS.value(site="triage", model=model, kind="prompt")
+
+    asyncio.run(triage_agent.classify_intent("debate_counter", "evaluate it, site metrics"))
+    assert CALL_SECONDS.count(site="triage", model=model, outcome="ok") == seconds + 1
+    assert CALL_SECONDS.count(site="triage", model=model, outcome="throttled") == throttled + 1
+    assert CALL_RETRIES.value(site="triage", reason="429") == retries + 1
+    assert CALL_TOKENS.value(site="triage", model=model, kind="prompt") > tokens
+
+def test_parse_failures_are_counted(monkeypatch):
+    async def prose(**kwargs):
+        return "Sure! Here is the plan you asked for."
+    monkeypatch.setattr(planner_agent, "chat", prose)
+    before = PARSE_FAILURES.value(site="planner")
+    assert asyncio.run(planner_agent.plan_steps("debate_counter", "evaluate_argument", {})) == ["EXECUTOR:offer_actions"]
+    assert PARSE_FAILURES.value(site="planner") == before + 1
+
+def test_http_errors_are_labelled():
+    before = CALL_SECONDS.count(site="wiki", model="", outcome="error")
+    with pytest.raises(ConnectionError):
+        with instrument("wiki"):
+            raise ConnectionError("down")
+    assert CALL_SECONDS.count(site="wiki", model="", outcome="error") == before + 1
+
+def test_prometheus_exposition_format():
+    reg = Registry()
+    reg.counter("jobs_total", "Jobs done", labels=("kind",)).inc(3, kind='say "hi"\n')
+    reg.gauge("temp", "Temperature").set(21.5)
+    reg.histogram("lat_seconds", "Latency", buckets=(0.1, 1)).observe(0.5)
+    text = reg.exposition()
+    assert text.splitlines() == [
+        "# HELP jobs_total Jobs done",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="say \\"hi\\"\\n"} 3',
+        "# HELP lat_seconds Latency",
+        "# TYPE lat_seconds histogram",
+        'lat_seconds_bucket{le="0.1"} 0',
+        'lat_seconds_bucket{le="1"} 1',
+        'lat_seconds_bucket{le="+Inf"} 1',
+        "lat_seconds_count 1",
+        "lat_seconds_sum 0.5",
+        "# HELP temp Temperature",
+        "# TYPE temp gauge",
+        "temp 21.5",
+    ]
+
+def test_metrics_endpoint(client):
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE call_seconds histogram" in r.text and "sessions_live " in r.text
@@ -0,0 +1,60 @@
+import json
+
+def _events(client, sid, text):
+    out = []
+    with client.stream("POST", "/api/chat/stream", json={"session_id": sid, "user_text": text}) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        event = None
+        for line in r.iter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                out.append((event, json.loads(line[len("data: "):])))
+    return out
+
+def test_stream_emits_progress_then_chatout(client):
+    sid = client.post("/api/session?mode=debate_counter").json()["session_id"]
+
+    first = _events(client, sid, "My claim: banning cash will reduce crime.")
+    assert [e for e, _ in first][0] == "pro"
+    assert first[-1][0] == "chat" and len(first[-1][1]["events"]) == 1
+
+    second = _events(client, sid, "evaluate it")
+    names = [e for e, _ in second]
+    assert names[0] == "decision" and names[-1] == "chat"
+    assert names.index("delta") < names.index("item") < names.index("con") < names.index("score") < names.index("chat")
+    bullets = [d["value"] for e, d in second if e == "item"]
+    assert bullets == ["Assumes cash is main driver of crime", "Overlooks laundering via crypto and prepaid cards"]
+    streamed = "".join(d["text"] for e, d in second if e == "delta")
+    assert json.loads(streamed)["score"]["value"] == 62
+    final = second[-1][1]
+    assert final["score"]["value"] == 62 and final["events"][0]["column"] == "CON"
+
+def test_stream_unknown_session_is_404(client):
+    r = client.post("/api/chat/stream", json={"session_id": "nope", "user_text": "hi"})
+    assert r.status_code == 404
+
+def test_retried_reply_resets_streamed_items(client, monkeypatch):
+    from agents.executors import common
+    good, calls = common.main_chat_stream, []
+
+    async def flaky(system, user, on_delta, **kw):
+        calls.append(kw)
+        if len(calls) == 1:
+            out = '{"bullets": ["stale bullet"], "score": '  # cut off: fails the JSON check
+            on_delta(out)
+            return out
+        return await good(system, user, on_delta, **kw)
+
+    monkeypatch.setattr(common, "main_chat_stream", flaky)
+    sid = client.post("/api/session?mode=debate_counter").json()["session_id"]
+    _events(client, sid, "My claim: banning cash will reduce crime.")
+    events = _events(client, sid, "evaluate it")
+    names = [e for e, _ in events]
+    assert names.index("item") < names.index("reset") < names.index("con")
+    assert events[names.index("reset")][1] == {"key": "bullets"}
+    after = [d["value"] for e, d in events[names.index("reset"):] if e == "item"]
+    assert after == ["Assumes cash is main driver of crime", "Overlooks laundering via crypto and prepaid cards"]
+    con = events[names.index("con")][1]
+    assert "stale bullet" not in json.dumps(con) and len(calls) == 2 and calls[1]["temperature"] == 0.0
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from api.routers.columns import column_updates
+from core.pubsub import SessionHub
+from core.schemas import Column, Event, Mode, Source
+from core.state import InMemorySessionStore
+
+def _data(frame):
+    assert frame.startswith("event: columns\n")
+    return json.loads(frame.split("data: ", 1)[1])
+
+def _store(queue_size=256):
+    store = InMemorySessionStore()
+    store.hub = SessionHub(queue_size=queue_size)
+    sid = store.create(mode=Mode.debate_counter)
+    store.append_event(sid, Event(column=Column.PRO, payload="claim"))
+    return store, sid
+
+def test_every_viewer_gets_each_change():
+    store, sid = _store()
+
+    async def run():
+        viewers = [column_updates(store, store.hub, sid) for _ in range(3)]
+        first = [_data(await v.__anext__()) for v in viewers]
+        store.append_event(sid, Event(column=Column.CON, payload="critique"))
+        store.add_sources(sid, [Source(title="A", url="https://e.org/a")])
+        pushed = [[_data(await v.__anext__()), _data(await v.__anext__())] for v in viewers]
+        for v in viewers:
+            await v.aclose()
+        return first, pushed
+
+    first, pushed = asyncio.run(run())
+    assert all(f["seq"] == 1 and [e["payload"] for e in f["PRO"]] == ["claim"] for f in first)
+    for con, src in pushed:
+        assert (con["since"], con["seq"], [e["payload"] for e in con["CON"]]) == (1, 2, ["critique"])
+        assert (src["seq"], [s["url"] for s in src["SOURCES"]]) == (3, ["https://e.org/a"])
+    assert not store.hub.has_subscribers(sid)
+
+def test_slow_viewer_is_resynced_not_buffered():
+    store, sid = _store(queue_size=4)
+
+    async def run():
+        viewer = column_updates(store, store.hub, sid, since=1)
+        await viewer.__anext__()
+        for i in range(20):  # viewer reads nothing meanwhile
+            store.append_event(sid, Event(column=Column.CON, payload=str(i)))
+        sub = next(iter(store.hub._subs[sid]))
+        assert sub._queue.qsize() == 1  # backlog dropped for a single resync marker
+        catch_up = _data(await viewer.__anext__())
+        store.append_event(sid, Event(column=Column.CON, payload="live"))
+        live = _data(await viewer.__anext__())
+        await viewer.aclose()
+        return catch_up, live
+
+    catch_up, live = asyncio.run(run())
+    assert catch_up["since"] == 1 and [e["payload"] for e in catch_up["CON"]] == [str(i) for i in range(20)]
+    assert [e["payload"] for e in live["CON"]] == ["live"]
+
+def test_publish_from_another_thread():
+    store, sid = _store()
+
+    async def run():
+        viewer = column_updates(store, store.hub, sid)
+        await viewer.__anext__()
+        await asyncio.to_thread(store.append_event, sid, Event(column=Column.CON, payload="threaded"))
+        got = _data(await asyncio.wait_for(viewer.__anext__(), 1))
+        await viewer.aclose()
+        return got
+
+    assert [e["payload"] for e in asyncio.run(run())["CON"]] == ["threaded"]
+
+def test_stream_unknown_session_is_404(client):
+    assert client.get("/api/columns/stream?session_id=nope").status_code == 404
+
+def test_sqlite_pushes_after_the_flush_numbers_writes(tmp_path):
+    from core.session_sqlite import SqliteSessionStore
+    store = SqliteSessionStore(str(tmp_path / "s.sqlite"), flush_interval_s=0.01)
+    store.hub = SessionHub()
+    sid = store.create(mode=Mode.debate_counter)
+
+    async def run():
+        viewer = column_updates(store, store.hub, sid)
+        await viewer.__anext__()
+        store.append_event(sid, Event(column=Column.CON, payload="critique"))
+        pushed = _data(await asyncio.wait_for(viewer.__anext__(), 2))
+        await viewer.aclose()
+        return pushed
+
+    pushed = asyncio.run(run())
+    assert (pushed["since"], pushed["seq"], [e["seq"] for e in pushed["CON"]]) == (0, 1, [1])
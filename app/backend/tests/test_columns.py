@@ -0,0 +1,43 @@
+from core.schemas import Column, Event, Mode, Source
+from core.state import session_store
+
+def _session_with_history():
+    sid = session_store.create(mode=Mode.debate_counter)
+    session_store.append_event(sid, Event(column=Column.PRO, payload="claim"))
+    session_store.append_event(sid, Event(column=Column.CON, payload="critique 1"))
+    session_store.add_sources(sid, [Source(title="A", url="https://e.org/a")])
+    return sid
+
+def test_full_snapshot_then_only_new_items(client):
+    sid = _session_with_history()
+    full = client.get(f"/api/columns?session_id={sid}").json()
+    assert (len(full["PRO"]), len(full["CON"]), len(full["SOURCES"])) == (1, 1, 1)
+    assert full["seq"] == 3 and full["since"] == 0
+
+    session_store.append_event(sid, Event(column=Column.CON, payload="critique 2"))
+    session_store.add_sources(sid, [Source(title="A", url="https://e.org/a/", note="refined"),
+                                    Source(title="B", url="https://e.org/b")])
+    delta = client.get(f"/api/columns?session_id={sid}&since={full['seq']}").json()
+    assert delta["since"] == 3 and delta["seq"] == 6
+    assert delta["PRO"] == []
+    assert [e["payload"] for e in delta["CON"]] == ["critique 2"]
+    assert [(s["url"], s["note"]) for s in delta["SOURCES"]] == [("https://e.org/a", "refined"),
+                                                                ("https://e.org/b", None)]
+
+    empty = client.get(f"/api/columns?session_id={sid}&since=6").json()
+    assert (empty["PRO"], empty["CON"], empty["SOURCES"]) == ([], [], [])
+    # a cursor from another history gets the full snapshot back
+    ahead = client.get(f"/api/columns?session_id={sid}&since=99").json()
+    assert ahead["since"] == 0 and len(ahead["CON"]) == 2
+
+def test_etag_revalidation(client):
+    sid = _session_with_history()
+    r = client.get(f"/api/columns?session_id={sid}")
+    etag = r.headers["etag"]
+    assert client.get(f"/api/columns?session_id={sid}", headers={"If-None-Match": etag}).status_code == 304
+    session_store.append_event(sid, Event(column=Column.PRO, payload="new claim"))
+    r2 = client.get(f"/api/columns?session_id={sid}", headers={"If-None-Match": etag})
+    assert r2.status_code == 200 and r2.headers["etag"] != etag
+
+def test_unknown_session_is_404(client):
+    assert client.get("/api/columns?session_id=nope").status_code == 404
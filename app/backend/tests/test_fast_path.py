@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import pytest
+
+from agents.triage.fast_path import fast_intent
+from core.schemas import ChatIn, Mode
+from core.state import InMemorySessionStore
+from services.chat_loop import run_chat_turn
+
+@pytest.mark.parametrize("text,intent", [
+    ("evaluate", "evaluate_argument"),
+    ("Critique it please", "evaluate_argument"),
+    ("ruthless_impression", "evaluate_argument"),
+    ("give objections", "give_objections"),
+    ("find sources", "research"),
+    ("look it up please", "research"),
+    ("find me some evidence", "research"),
+    ("look", None),
+    ("find it", None),
+    ("up to you", None),
+    ("My claim: banning cash will reduce crime.", None),
+    ("evaluate this: uniforms improve discipline", None),
+    ("Research funding should be tied to reproducibility.", None),
+    ("hi", None),
+])
+def test_fast_intent(text, intent):
+    assert fast_intent(text) == intent
+
+def test_corpus_has_no_wrong_fast_answers():
+    rows = [json.loads(ln) for ln in open("bench/data/triage_corpus.jsonl", encoding="utf-8")]
+    wrong = [r["text"] for r in rows if fast_intent(r["text"]) not in (None, r["intent"])]
+    assert wrong == []
+
+def test_bare_command_skips_llm_decision(monkeypatch):
+    from services import chat_loop
+
+    async def boom(*args, **kwargs):
+        raise AssertionError("LLM decision path should be skipped")
+
+    monkeypatch.setattr(chat_loop, "decide", boom)
+    monkeypatch.setattr(chat_loop, "classify_intent", boom)
+    monkeypatch.setattr(chat_loop, "extract_claim_or_empty", boom)
+
+    store = InMemorySessionStore()
+    sid = store.create(mode=Mode.debate_counter)
+    out = asyncio.run(run_chat_turn(ChatIn(session_id=sid, user_text="evaluate it"), store))
+    assert out.score is not None
+    assert store.get(sid).last_intent.value == "evaluate_argument"
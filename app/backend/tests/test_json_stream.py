@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from core.utils.json_stream import JsonArrayStream
+
+_REPLY = ('Sure, here you go:\n```json\n'
+          '{"score": {"value": 40, "reasons": ["weak ] link"]}, '
+          '"ranked": [{"title": "Cost", "why": "Drones are \\"expensive\\", {really}."}, '
+          '{"title": "Noise", "why": "Neighbours complain."}, 7, "plain"], "extra": true}\n```')
+
+@pytest.mark.parametrize("chunk", [1, 2, 5, 13, len(_REPLY)])
+def test_elements_match_full_parse_for_any_chunking(chunk):
+    p = JsonArrayStream("ranked")
+    got = []
+    for i in range(0, len(_REPLY), chunk):
+        got += p.feed(_REPLY[i:i + chunk])
+    expected = json.loads(_REPLY.split("```json\n")[1].rstrip("`\n"))["ranked"]
+    assert got == expected == p.items
+
+def test_elements_are_emitted_as_soon_as_they_close():
+    p = JsonArrayStream("bullets")
+    assert p.feed('{"bullets": ["first", "sec') == ["first"]
+    assert p.feed('ond"') == []
+    assert p.feed(']') == ["second"]
+
+def test_malformed_element_and_tail_are_tolerated():
+    p = JsonArrayStream()
+    assert p.feed('[{"ok": 1}, {oops}, {"ok": 2}, {"unterminated": "') == [{"ok": 1}, {"ok": 2}]
+    assert p.feed("and the model stopped") == []
+
+def test_other_keys_with_arrays_are_ignored():
+    p = JsonArrayStream("bullets")
+    assert p.feed('{"notes": ["x", "y"], "bullets": ["z"]}') == ["z"]
+
+def test_braces_in_leading_prose_do_not_end_the_search():
+    p = JsonArrayStream("bullets")
+    assert p.feed('My {draft} review: {"bullets": ["a", "b"]}') == ["a", "b"]
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from bench.fake_llm import FakeAsyncLLM
+from core.llm import main_client
+from core.llm.cache import LLMCache, MemoryBackend, SqliteBackend, cache_key
+from core.utils.lru import TTLLRU
+
+def test_lru_evicts_oldest_by_entries_and_bytes():
+    lru = TTLLRU(max_entries=3, max_bytes=10, sizeof=len)
+    for k in "abc":
+        lru.set(k, "xx")
+    lru.get("a")                      # a is now most recent
+    lru.set("d", "xx")                # over 3 entries -> b goes
+    assert lru.get("b") is None and lru.get("a") == "xx"
+    lru.set("e", "x" * 9)             # over 10 bytes -> c, a, d go
+    assert len(lru) == 1 and lru.bytes == 9
+
+def test_lru_ttl_expiry():
+    lru = TTLLRU(ttl_s=0.01)
+    lru.set("k", "v")
+    time.sleep(0.02)
+    assert lru.get("k") is None
+
+def test_sqlite_tier_survives_and_promotes(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    key = cache_key("m", "sys", "user", 0.0, 200)
+    asyncio.run(LLMCache([MemoryBackend(10, 10_000, 60), SqliteBackend(path, 60)]).set(key, "cached"))
+
+    # fresh process: empty memory tier, same disk file
+    mem = MemoryBackend(10, 10_000, 60)
+    cache = LLMCache([mem, SqliteBackend(path, 60)])
+    assert asyncio.run(cache.get(key)) == "cached"
+    assert mem.get(key) == "cached"
+    assert cache.stats()["counters"] == {"hit_sqlite": 1}
+
+def test_chat_caches_deterministic_calls_only(monkeypatch):
+    fake = FakeAsyncLLM(latency_s=0)
+    cache = LLMCache([MemoryBackend(10, 10_000, 60)])
+    monkeypatch.setattr(main_client, "client", fake)
+    monkeypatch.setattr(main_client, "llm_cache", cache)
+
+    async def run():
+        for _ in range(3):
+            await main_client.chat(system="You are TRIAGE.", user="USER:\nevaluate", temperature=0.0, max_tokens=300)
+        for _ in range(2):
+            await main_client.chat(system="critique", user="CLAIM:\nx", temperature=0.2, max_tokens=900)
+        await main_client.chat(system="You are TRIAGE.", user="USER:\nevaluate", temperature=0.0, max_tokens=300, cache=False)
+
+    asyncio.run(run())
+    assert fake.calls == 1 + 2 + 1
+    assert cache.counters["hit_memory"] == 2 and cache.counters["miss"] == 1
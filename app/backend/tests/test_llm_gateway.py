@@ -0,0 +1,113 @@
+import asyncio
+from time import perf_counter
+
+import pytest
+
+from bench.fake_llm import FakeAsyncLLM
+from core.llm.gateway import LLMGateway, StreamInterrupted
+from core.utils.limiter import TokenBucket
+
+def _msgs(user="claim: cash causes crime"):
+    return [{"role": "system", "content": "Evaluate the argument."}, {"role": "user", "content": user}]
+
+def test_identical_concurrent_requests_share_one_call():
+    fake = FakeAsyncLLM(latency_s=0.02)
+    gw = LLMGateway(lambda: fake)
+
+    async def run():
+        same = [gw.complete("m", _msgs(), 0.0, 100) for _ in range(5)]
+        other = gw.complete("m", _msgs("claim: other"), 0.0, 100)
+        return await asyncio.gather(*same, other)
+
+    out = asyncio.run(run())
+    assert fake.calls == 2 and len(set(out[:5])) == 1
+
+def test_429s_are_retried_and_shrink_concurrency():
+    fake = FakeAsyncLLM(latency_s=0.01, max_concurrency=3)
+    gw = LLMGateway(lambda: fake, initial_concurrency=12, max_concurrency=16, max_retries=8,
+                    backoff_s=0.001, backoff_max_s=0.01, cooldown_s=0.005)
+
+    async def run():
+        out = await asyncio.gather(*(gw.complete("m", _msgs(f"claim {i}"), 0.7, 50) for i in range(40)))
+        return out, gw.limiter.limit
+
+    out, limit = asyncio.run(run())
+    assert len(out) == 40 and all(out)
+    assert fake.throttled > 0 and fake.peak <= 3
+    assert limit < 12
+
+def test_retry_after_is_honored_and_non_transient_errors_are_not_retried():
+    fake = FakeAsyncLLM(latency_s=0, fail_first=1, retry_after_s=0.05)
+    gw = LLMGateway(lambda: fake, backoff_s=0, backoff_max_s=1)
+    t0 = perf_counter()
+    asyncio.run(gw.complete("m", _msgs(), 0.7, 50))
+    assert perf_counter() - t0 >= 0.05 and fake.calls == 2
+
+    class Boom(Exception):
+        status_code = 400
+
+    calls = []
+
+    class Broken:
+        class chat:
+            class completions:
+                @staticmethod
+                async def create(**kw):
+                    calls.append(kw)
+                    raise Boom()
+
+    with pytest.raises(Boom):
+        asyncio.run(LLMGateway(lambda: Broken, backoff_s=0).complete("m", _msgs(), 0.7, 50))
+    assert len(calls) == 1
+
+def test_stream_goes_through_the_gateway():
+    fake = FakeAsyncLLM(latency_s=0, fail_first=2)
+    gw = LLMGateway(lambda: fake, backoff_s=0.001)
+    deltas = []
+    out = asyncio.run(gw.stream("m", _msgs(), 0.7, 50, deltas.append))
+    assert out == "".join(deltas) and fake.calls == 3
+
+def test_stream_failing_mid_way_is_not_replayed():
+    class Unavailable(Exception):
+        status_code = 503
+
+    calls = []
+
+    class _Chunk:
+        def __init__(self, text):
+            self.usage = None
+            self.choices = [type("C", (), {"delta": type("D", (), {"content": text})()})()]
+
+    async def _stream():
+        yield _Chunk('{"bullets": ["a"')
+        raise Unavailable()
+
+    class Flaky:
+        class chat:
+            class completions:
+                @staticmethod
+                async def create(**kw):
+                    calls.append(kw)
+                    return _stream()
+
+    deltas = []
+    with pytest.raises(StreamInterrupted) as err:
+        asyncio.run(LLMGateway(lambda: Flaky, backoff_s=0).stream("m", _msgs(), 0.7, 50, deltas.append))
+    assert isinstance(err.value.__cause__, Unavailable)
+    assert deltas == ['{"bullets": ["a"'] and len(calls) == 1
+
+def test_token_bucket_paces_requests():
+    now = [0.0]
+    bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now[0])
+
+    async def run():
+        waited = [await bucket.take(1), await bucket.take(1)]
+        task = asyncio.ensure_future(bucket.take(1))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+        now[0] += 0.1
+        waited.append(await task)
+        return waited
+
+    waited = asyncio.run(run())
+    assert waited[:2] == [0, 0] and waited[2] > 0
@@ -0,0 +1,80 @@
+import asyncio
+import random
+
+import pytest
+from openai import AsyncOpenAI
+
+from bench.fake_openai import FakeOpenAIServer, Latency
+from bench.load import compare, drive, load_sessions, percentile, summarize
+from core.llm.gateway import LLMGateway
+
+def _msgs(user="CLAIM:\ncash causes crime"):
+    return [{"role": "system", "content": "You produce ranked counter-arguments."}, {"role": "user", "content": user}]
+
+@pytest.fixture
+def fake_openai():
+    srv = FakeOpenAIServer(seed=3).start()
+    yield srv
+    srv.stop()
+
+def test_latency_specs_are_seeded():
+    spec = Latency("lognormal:0.1,0.5")
+    assert [spec.sample(random.Random(1)) for _ in range(3)] == [spec.sample(random.Random(1))] * 3
+    assert 0.2 <= Latency("uniform:0.2,0.3").sample(random.Random(0)) <= 0.3
+    with pytest.raises(ValueError):
+        Latency("gauss:1")
+
+def test_fake_server_speaks_the_openai_protocol(fake_openai):
+    client = AsyncOpenAI(base_url=fake_openai.base_url, api_key="x", max_retries=0)
+
+    async def run():
+        r = await client.chat.completions.create(model="m", messages=_msgs())
+        stream = await client.chat.completions.create(model="m", messages=_msgs(), stream=True,
+                                                      stream_options={"include_usage": True})
+        parts, usage = [], None
+        async for chunk in stream:
+            if chunk.choices:
+                parts.append(chunk.choices[0].delta.content or "")
+            usage = chunk.usage or usage
+        return r, "".join(parts), usage
+
+    r, streamed, usage = asyncio.run(run())
+    assert '"ranked"' in r.choices[0].message.content and streamed == r.choices[0].message.content
+    assert r.usage.prompt_tokens_details.cached_tokens == 0
+    assert usage.prompt_tokens_details.cached_tokens > 0  # same system prompt the second time
+    assert fake_openai.calls == 2 and fake_openai.by_model == {"m": 2}
+
+def test_injected_429s_are_retried_by_the_gateway():
+    srv = FakeOpenAIServer(rate_limit_rate=0.5, seed=7).start()
+    client = AsyncOpenAI(base_url=srv.base_url, api_key="x", max_retries=0)
+    gw = LLMGateway(lambda: client, max_retries=10, backoff_s=0.001, backoff_max_s=0.005, cooldown_s=0.005)
+
+    async def run():
+        return await asyncio.gather(*(gw.complete("m", _msgs(f"claim {i}"), 0.0, 50) for i in range(6)))
+
+    try:
+        out = asyncio.run(run())
+    finally:
+        srv.stop()
+    assert all('"ranked"' in o for o in out)
+    assert srv.statuses[429] > 0 and srv.statuses[200] == 6
+
+def test_driver_reports_and_compares_against_a_baseline(client):
+    scripts = load_sessions()
+    run = asyncio.run(drive(client.app, scripts, sessions=6, concurrency=3, seed=1))
+    assert run["turns"] == sum(len(s["turns"]) for s in scripts for _ in range(run["mix"].get(s["name"], 0)))
+    assert run["errors"] == 0
+
+    metrics = summarize(run, llm_calls=run["turns"] * 2)
+    assert metrics["llm_calls_per_turn"] == 2.0 and metrics["rss_mb"] > 0
+    assert metrics["p50_s"] <= metrics["p95_s"] <= metrics["p99_s"]
+
+    base = {"metrics": dict(metrics)}
+    assert compare({"metrics": metrics}, base, tolerance=0.1) == []
+    slower = {"metrics": {**metrics, "p95_s": metrics["p95_s"] * 2 + 1, "turns_per_s": metrics["turns_per_s"] / 2}}
+    assert {k for k, *_ in compare(slower, base, tolerance=0.1)} == {"p95_s", "turns_per_s"}
+
+def test_percentile_is_nearest_rank():
+    xs = list(range(1, 101))
+    assert (percentile(xs, 50), percentile(xs, 95), percentile(xs, 99), percentile(xs, 100)) == (50, 95, 99, 100)
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,19 @@
+import pytest
+
+from core.telemetry.metrics import Registry
+
+def test_counters_gauges_and_snapshot():
+    reg = Registry()
+    c = reg.counter("evicted_total", labels=("reason",))
+    c.inc(reason="idle")
+    c.inc(2, reason="memory")
+    g = reg.gauge("live")
+    g.set_function(lambda: 7)
+    assert reg.counter("evicted_total", labels=("reason",)) is c
+    assert reg.snapshot() == {"evicted_total{reason=idle}": 1, "evicted_total{reason=memory}": 2, "live": 7}
+    with pytest.raises(ValueError):
+        c.inc(-1, reason="idle")
+    with pytest.raises(ValueError):
+        c.inc()
+    with pytest.raises(ValueError):
+        reg.gauge("evicted_total")
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+from bench.fake_llm import FakeAsyncLLM
+from core.config import settings
+from core.llm import main_client
+from core.llm.tiers import Tier, route, tier_report
+
+class _Recorder(FakeAsyncLLM):
+    def __init__(self):
+        super().__init__(latency_s=0)
+        self.seen = []
+        create = self.chat.completions.create
+
+        async def record(**kw):
+            self.seen.append(kw)
+            return await create(**kw)
+        self.chat.completions.create = record
+
+def test_sites_route_to_tiers(monkeypatch):
+    monkeypatch.setattr(settings, "SMOL_MODEL", "nano")
+    monkeypatch.setattr(settings, "CHEAP_MODEL", None)
+    monkeypatch.setattr(settings, "MAIN_MODEL", "heavy")
+    assert route("triage", 300)[1:] == (Tier.smol, "nano", 300, settings.SMOL_TIMEOUT_S)
+    assert route("planner", 4000).max_tokens == settings.SMOL_MAX_TOKENS
+    # no cheap model configured: cheap sites run on main
+    assert route("classify").model == "heavy"
+    assert route("executor").tier == Tier.main and route("unknown").tier == Tier.main
+    monkeypatch.setattr(settings, "LLM_SITE_TIERS", "executor=smol")
+    assert route("executor").model == "nano"
+
+def test_chat_uses_tier_model_and_report_shows_savings(monkeypatch):
+    fake = _Recorder()
+    monkeypatch.setattr(main_client, "client", fake)
+    monkeypatch.setattr(settings, "SMOL_MODEL", "nano")
+    monkeypatch.setattr(settings, "MAIN_MODEL", "heavy")
+    monkeypatch.setattr(settings, "LLM_PRICES", json.dumps({"nano": [0.1, 0.4], "heavy": [2.5, 10]}))
+    before = tier_report()["tiers"]["smol"]["calls"]
+
+    async def run():
+        await main_client.chat("Triage the message.", "USER: evaluate", 0.7, 300, site="triage")
+        await main_client.chat("Write the evaluation.", "CLAIM: x", 0.7, 900)
+
+    asyncio.run(run())
+    assert [(c["model"], c["max_tokens"]) for c in fake.seen] == [("nano", 300), ("heavy", 900)]
+    assert fake.seen[0]["timeout"] == settings.SMOL_TIMEOUT_S
+    smol = tier_report()["tiers"]["smol"]
+    assert smol["calls"] == before + 1 and smol["prompt_tokens"] > 0
+    assert smol["savings_usd"] > 0
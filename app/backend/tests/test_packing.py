@@ -0,0 +1,76 @@
+import asyncio
+import json
+import re
+
+from agents.tools import fallacies, scoring
+from agents.tools.packing import unpack_results
+
+_RULES = {"everyone": ("bandwagon", "Bandwagon"), "expert": ("appeal_to_authority", "Appeal to authority"),
+          "therefore": ("false_cause", "False cause")}
+
+def _judge(text):
+    return [{"code": c, "label": l, "emoji": "!", "why": w} for w, (c, l) in _RULES.items() if w in text.lower()]
+
+def _score(text):
+    return {"bullets": [f"{len(text)} chars"], "score": {"value": len(text) % 101, "reasons": ["len"]}}
+
+class _Model:
+    """Deterministic stand-in: answers single and packed prompts with the
+    same per-claim judgement; `drop` makes packed replies omit those texts."""
+
+    def __init__(self, drop=()):
+        self.calls = []
+        self.drop = set(drop)
+
+    async def __call__(self, system, user, temperature=0.0, max_tokens=400, cache=None, site=None):
+        packed = "(JSON, keyed by i):" in user
+        self.calls.append("packed" if packed else "single")
+        if packed:
+            items = json.loads(user.split("(JSON, keyed by i):\n", 1)[1])
+            if "fallac" in system:
+                rows = [{"i": it["i"], "fallacies": _judge(it["text"])} for it in items if it["text"] not in self.drop]
+            else:
+                rows = [{"i": it["i"], **_score(it["text"])} for it in items if it["text"] not in self.drop]
+            return json.dumps({"results": rows})
+        text = re.split(r"(?:^|\n\n)(?:TEXT|CLAIM):\n", user, 1)[1].split("\n\nCONTEXT:", 1)[0]
+        return json.dumps(_judge(text) if "fallac" in system else _score(text))
+
+_CLAIMS = [f"Claim {i}: " + ("everyone agrees " if i % 2 else "") + ("an expert said so, " if i % 3 == 0 else "")
+           + ("therefore crime falls" if i % 4 == 0 else "cash is bad") for i in range(10)]
+
+def test_packed_fallacies_match_single_claim_path(monkeypatch):
+    model = _Model()
+    monkeypatch.setattr(fallacies, "chat", model)
+
+    async def run():
+        single = [await fallacies.detect_fallacies(c) for c in _CLAIMS]
+        model.calls.clear()
+        return single, await fallacies.detect_fallacies_many(_CLAIMS, k=5)
+
+    single, packed = asyncio.run(run())
+    assert packed == single
+    assert model.calls == ["packed", "packed"]  # 10 claims, K=5
+
+def test_packed_scores_match_single_claim_path(monkeypatch):
+    model = _Model()
+    monkeypatch.setattr(scoring, "main_chat", model)
+
+    async def run():
+        single = [await scoring.score_claim(c) for c in _CLAIMS]
+        model.calls.clear()
+        return single, await scoring.score_claims(_CLAIMS, k=4)
+
+    single, packed = asyncio.run(run())
+    assert packed == single
+    assert model.calls == ["packed"] * 3
+
+def test_only_dropped_items_are_retried_alone(monkeypatch):
+    model = _Model(drop={_CLAIMS[2], _CLAIMS[7]})
+    monkeypatch.setattr(fallacies, "chat", model)
+    out = asyncio.run(fallacies.detect_fallacies_many(_CLAIMS, k=5))
+    assert out == [_judge(c) for c in _CLAIMS]
+    assert sorted(model.calls) == ["packed", "packed", "single", "single"]
+
+def test_unpack_ignores_bad_rows():
+    out = '```json\n{"results": [{"i": 1, "x": 1}, {"i": 9}, {"i": "0"}, "junk", {"i": 1, "x": 2}]}\n```'
+    assert unpack_results(out, 3) == [None, {"i": 1, "x": 1}, None]
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import pytest
+
+from agents.planner.plan_table import PLAN_RULES, PlanRule, compile_plan_table, lookup_plan
+from core.schemas import Intent, Mode
+
+def test_every_action_intent_has_a_static_plan():
+    for mode in Mode:
+        for intent in (Intent.evaluate_argument, Intent.give_objections, Intent.research):
+            steps = lookup_plan(mode.value, intent.value, {})
+            assert steps and sum(s.startswith("EXECUTOR:") for s in steps) == 1
+    assert lookup_plan("debate_counter", "none", {}) is None
+
+def test_flag_specific_rule_shadows_default():
+    rules = PLAN_RULES + [PlanRule(Mode.debate_counter, Intent.research, ["EXECUTOR:research"],
+                                   when={"did_fallacy_on_this_claim": True})]
+    table = compile_plan_table(rules)
+    bucket = table[("debate_counter", "research")]
+    assert bucket[0].when == {"did_fallacy_on_this_claim": True}
+    with pytest.raises(TypeError):
+        bucket[1].when["did_fallacy_on_this_claim"] = True  # the shared default is read-only
+
+@pytest.mark.parametrize("steps", [
+    ["EXECUTOR:evaluate_argument"],                              # fallacy check must come first
+    ["FALLACY_CHECK", "EXECUTOR:evaluate_argument", "EXECUTOR:research"],
+    ["FALLACY_CHECK", "EXECUTOR:ruthless_impression"],           # pitch executor in debate mode
+    ["FALLACY_CHECK", "EXECUTOR:evaluate_argument", "DANCE"],
+])
+def test_invalid_rules_fail_at_compile_time(steps):
+    with pytest.raises(ValueError):
+        compile_plan_table([PlanRule(Mode.debate_counter, Intent.evaluate_argument, steps)])
+
+def test_decide_skips_llm_planner_for_covered_combinations(monkeypatch):
+    from agents.supervisor import supervisor_agent
+
+    async def no_planner(*args, **kwargs):
+        raise AssertionError("planner LLM should not be called")
+
+    async def supervisor(system, user, temperature=0.0, max_tokens=300, site=None):
+        return json.dumps({"command": "RUN_PIPELINE", "reason": "x"})
+
+    monkeypatch.setattr(supervisor_agent, "plan_steps", no_planner)
+    monkeypatch.setattr(supervisor_agent, "chat", supervisor)
+
+    cmd = asyncio.run(supervisor_agent.decide(Mode.pitch_objections, "what are the objections",
+                                              {}, tri={"intent": "give_objections", "has_new_claim": False}))
+    assert cmd["plan_steps"] == ["FALLACY_CHECK", "EXECUTOR:objections", "SUGGEST_NEXT"]
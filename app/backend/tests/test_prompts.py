@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from bench.fake_llm import FakeAsyncLLM
+from core.llm import main_client
+from core.llm.prompts import get, prompt_report, register
+from agents.tools import parsing, research
+from agents.triage import triage_agent
+
+def test_static_instructions_are_a_stable_system_prefix():
+    p = get("triage")
+    assert p.system.startswith("You are TRIAGE. Reply JSON ONLY.\n\n")
+    assert "classify intent" in p.system
+    user = p.user(MODE="debate_counter", USER="evaluate it")
+    assert user == "MODE:\ndebate_counter\n\nUSER:\nevaluate it"
+    assert "classify intent" not in user
+    # re-registering the same text is a no-op, different text is an error
+    assert register("triage", "You are TRIAGE. Reply JSON ONLY.", "triage.txt") == p
+    with pytest.raises(ValueError):
+        register("triage", "You are someone else.", "triage.txt")
+
+def test_every_call_sends_the_same_prefix_and_reports_cached_tokens(monkeypatch):
+    fake = FakeAsyncLLM(latency_s=0)
+    seen = []
+    create = fake.chat.completions.create
+
+    async def record(**kw):
+        seen.append(kw["messages"])
+        return await create(**kw)
+    fake.chat.completions.create = record
+    monkeypatch.setattr(main_client, "client", fake)
+    before = prompt_report()["sites"].get("extract", {}).get("cached", 0)
+
+    async def run():
+        for text in ("My claim: cash causes crime.", "My claim: homework should be banned."):
+            await parsing.extract_claim_or_empty(text)
+        await triage_agent.classify_intent("debate_counter", "evaluate it")
+        await research._classify("cash causes crime", [{"url": "https://x.org", "title": "X", "snippet": "y"}])
+
+    asyncio.run(run())
+    assert seen[0][0] == seen[1][0] and seen[0][1] != seen[1][1]
+    assert seen[0][1]["content"] == "USER:\nMy claim: cash causes crime."
+    assert seen[3][1]["content"].startswith("CLAIM:\ncash causes crime\n\nSOURCES:\n")
+    row = prompt_report()["sites"]["extract"]
+    assert row["cached"] - before == len(seen[0][0]["content"]) // 4
+    assert 0 < row["prefix_share"] < 1 and row["billed"] > 0
@@ -0,0 +1,85 @@
+import asyncio
+
+from agents.tools import research
+from agents.tools.research import normalize_query
+from core.utils.swr import SWRCache
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+    def __call__(self):
+        return self.t
+
+def test_normalize_query():
+    assert normalize_query("Cash should be BANNED!") == normalize_query("banned cash") == "banned cash"
+    assert normalize_query("the of and") == ""
+
+def test_fresh_stale_and_expired():
+    clock = _Clock()
+    cache = SWRCache("t_swr", max_entries=8, fresh_s=10, stale_s=100, clock=clock)
+    calls = []
+
+    async def compute():
+        calls.append(clock.t)
+        await asyncio.sleep(0.01)
+        return f"v{len(calls)}"
+
+    async def run():
+        seen = [await cache.get("k", compute)]      # miss
+        clock.t = 5
+        seen.append(await cache.get("k", compute))  # hit
+        clock.t = 50
+        seen.append(await cache.get("k", compute))  # stale: old value now, refresh behind
+        seen.append(await cache.get("k", compute))  # refresh still running: no second one
+        await cache.drain()
+        seen.append(await cache.get("k", compute))  # refreshed value
+        clock.t = 200
+        seen.append(await cache.get("k", compute))  # expired: recomputed inline
+        return seen
+
+    assert asyncio.run(run()) == ["v1", "v1", "v1", "v1", "v2", "v3"]
+    assert calls == [0, 50, 200]
+    assert cache.stats() == {"entries": 1, "hit": 2, "stale": 2, "miss": 2, "hit_rate": 0.6667}
+
+def test_concurrent_misses_share_one_call_and_empty_is_not_kept():
+    cache = SWRCache("t_swr_miss", max_entries=8, fresh_s=10, stale_s=100)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return []
+
+    async def run():
+        await asyncio.gather(*(cache.get("k", compute) for _ in range(5)))
+        await cache.get("k", compute)
+
+    asyncio.run(run())
+    assert len(calls) == 2 and len(cache) == 0
+
+def test_research_reuses_sources_and_classification(monkeypatch):
+    fetches, classified = [], []
+
+    async def fetch(query, max_results):
+        fetches.append(query)
+        return [{"url": "https://e.org/a", "title": "A", "snippet": "s"}]
+
+    async def chat(system, user, **kw):
+        classified.append(user)
+        return '[{"url": "https://e.org/a", "tag": "corroborated"}]'
+
+    monkeypatch.setattr(research, "fetch_sources", fetch)
+    monkeypatch.setattr(research, "main_chat", chat)
+    research._raw_cache.clear()
+    research._classified_cache.clear()
+
+    async def turn(claim):
+        return await research.classify_sources(claim, await research.gather_sources(claim))
+
+    async def run():
+        return [await turn(c) for c in ("We should ban cash.", "ban cash", "Ban nuclear power")]
+
+    a, b, c = asyncio.run(run())
+    assert a == b == c
+    assert fetches == ["We should ban cash.", "Ban nuclear power"]
+    assert len(classified) == 2
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from concurrent import futures
+
+import pytest
+
+from bench.fake_research import FakeResearchServer, page_url
+from core.config import settings
+from integrations import research_fetcher, wikipedia_client
+from integrations.research_fetcher import FETCH_DROPPED, FETCH_SECONDS, fetch_sources, fetch_sources_sync
+
+@pytest.fixture
+def stub(monkeypatch):
+    srv = FakeResearchServer().start()
+    for name in ("TAVILY_API_KEY", "TAVILY_API_URL", "WIKIPEDIA_API_URL", "WIKIPEDIA_REST_URL"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+    # a pool per test: calls left running past a deadline are drained before
+    # the next test reads the (process-wide) fetch metrics
+    pool = futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="research-test")
+    monkeypatch.setattr(research_fetcher, "_pool", pool)
+    srv.configure(settings)
+    wikipedia_client.clear_caches()
+    yield srv
+    srv.release()
+    pool.shutdown(wait=True)
+    wikipedia_client.clear_caches()
+    srv.stop()
+
+_EXPECTED = ["https://t.example/1", page_url("Alpha"), page_url("Beta"), page_url("Gamma")]
+
+def test_providers_run_concurrently(stub):
+    for fetch in (lambda: asyncio.run(fetch_sources("q", 8, deadline_s=5)),
+                  lambda: fetch_sources_sync("q", 8, deadline_s=5)):
+        wikipedia_client.clear_caches()
+        stub.arrived.clear()
+        # tavily only answers once the wikipedia summary query is in flight,
+        # which run one after another could not happen before the deadline
+        stub.gates["tavily"] = stub.arrived["query"]
+        out = fetch()
+        assert [s["url"] for s in out] == _EXPECTED
+        assert out[1]["snippet"] == "tavily copy"  # tavily wins the duplicate URL
+
+def test_deadline_returns_partial_results(stub):
+    stub.gates["tavily"] = threading.Event()  # held until teardown: only the deadline can end the fetch
+    for fetch in (lambda: asyncio.run(fetch_sources("q", 8, deadline_s=1.0)),
+                  lambda: fetch_sources_sync("q", 8, deadline_s=1.0)):
+        wikipedia_client.clear_caches()
+        dropped = FETCH_DROPPED.value(provider="tavily")
+        out = fetch()
+        assert [s["url"] for s in out] == _EXPECTED[1:]
+        assert FETCH_DROPPED.value(provider="tavily") == dropped + 1
+
+def test_two_wikipedia_requests_per_turn_and_none_when_cached(stub):
+    before = {p: FETCH_SECONDS.count(provider=p) for p in ("tavily", "wikipedia_search", "wikipedia_summary")}
+
+    async def twice():
+        first = await fetch_sources("Q", 8, deadline_s=5)
+        second = await fetch_sources(" q ", 8, deadline_s=5)
+        return first, second
+
+    first, second = asyncio.run(twice())
+    assert second[1:] == first[1:]  # wikipedia part served from cache
+    assert sorted(stub.routes()) == ["opensearch", "query", "tavily", "tavily"]
+    assert FETCH_SECONDS.count(provider="tavily") == before["tavily"] + 2
+    assert FETCH_SECONDS.count(provider="wikipedia_summary") == before["wikipedia_summary"] + 2  # the second one a cache hit
+    peers = [p for _, p in stub.requests]
+    assert len(set(peers)) < len(peers)  # keep-alive connections were reused
+
+def test_batch_query_follows_normalization_and_redirects():
+    data = {"query": {
+        "normalized": [{"from": "alpha", "to": "Alpha"}],
+        "redirects": [{"from": "Alpha", "to": "Alpha (letter)"}],
+        "pages": [
+            {"title": "Alpha (letter)", "extract": "first letter", "fullurl": page_url("Alpha (letter)")},
+            {"title": "Nope", "missing": True},
+        ],
+    }}
+    out = wikipedia_client._parse_pages(data, ["alpha", "Nope"])
+    assert out == {"alpha": {"title": "Alpha (letter)", "url": page_url("Alpha (letter)"), "snippet": "first letter"},
+                   "Nope": {}}
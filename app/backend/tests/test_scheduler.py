@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+
+from core.utils.scheduler import StepGraph
+
+def _sleep(sec: float, value):
+    async def step(_deps):
+        await asyncio.sleep(sec)
+        return value
+    return step
+
+def test_independent_steps_overlap_and_report_critical_path():
+    async def decide(r):
+        await asyncio.sleep(0.05)
+        return r["extract"], r["triage"]
+
+    g = StepGraph()
+    g.add("extract", _sleep(0.10, "claim"))
+    g.add("triage", _sleep(0.05, "intent"))
+    g.add("decide", decide, deps=("extract", "triage"))
+
+    results = asyncio.run(g.run())
+    assert results["decide"] == ("claim", "intent")
+
+    report = g.report()
+    # critical path is extract -> decide (0.15s), not the 0.20s sum
+    assert report["critical_path"] == ["extract", "decide"]
+    assert report["total_ms"] < 190
+    assert set(report["steps"]) == {"extract", "triage", "decide"}
+
+def test_run_targets_only_needed_steps():
+    ran = []
+    def mark(name):
+        async def step(_deps):
+            ran.append(name)
+            return name
+        return step
+
+    g = StepGraph()
+    g.add("a", mark("a"))
+    g.add("b", mark("b"), deps=("a",))
+    g.add("unused", mark("unused"))
+    asyncio.run(g.run("b"))
+    assert sorted(ran) == ["a", "b"]
+
+def test_unknown_dependency_is_rejected():
+    g = StepGraph()
+    with pytest.raises(ValueError):
+        g.add("x", _sleep(0, None), deps=("missing",))
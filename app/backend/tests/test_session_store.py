@@ -0,0 +1,213 @@
+import sqlite3
+import time
+
+import pytest
+
+from core.schemas import Column, Event, Intent, Mode, Source
+from core.session_sqlite import SqliteSessionStore
+from core.state import InMemorySessionStore, SESSIONS_EVICTED, SESSION_BYTES
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.sqlite")
+
+@pytest.mark.parametrize("make", [lambda p: InMemorySessionStore(), lambda p: SqliteSessionStore(p)])
+def test_backends_share_the_contract(make, db_path):
+    store = make(db_path)
+    sid = store.create(mode=Mode.debate_counter)
+    store.append_event(sid, Event(column=Column.PRO, payload="claim"))
+    store.append_event(sid, Event(column=Column.CON, payload="critique"))
+    store.add_sources(sid, [Source(title="t", url="https://example.org/a")])
+    cols = store.export_columns(sid)
+    assert [e.payload for e in cols.PRO] == ["claim"]
+    assert [e.payload for e in cols.CON] == ["critique"]
+    assert [s.url for s in cols.SOURCES] == ["https://example.org/a"]
+    with pytest.raises(KeyError):
+        store.get("missing")
+
+def test_sqlite_survives_restart(db_path):
+    a = SqliteSessionStore(db_path)
+    sid = a.create(mode=Mode.pitch_objections)
+    st = a.get(sid)
+    a.append_event(sid, Event(column=Column.PRO, payload="pitch"))
+    st.last_user_claim_raw = "Pitch: drones"
+    st.last_intent = Intent.give_objections
+    a.save(sid, st)
+    a.close()
+
+    st2 = SqliteSessionStore(db_path).get(sid)
+    assert st2.mode == Mode.pitch_objections
+    assert [e.payload for e in st2.pro] == ["pitch"]
+    assert st2.last_user_claim_raw == "Pitch: drones"
+    assert st2.last_intent == Intent.give_objections
+
+def test_two_workers_serve_the_same_session(db_path):
+    a = SqliteSessionStore(db_path, flush_interval_s=0.01)
+    b = SqliteSessionStore(db_path, flush_interval_s=0.01)
+    sid = a.create(mode=Mode.debate_counter)
+
+    st_b = b.get(sid)  # b now holds a hot copy
+    a.append_event(sid, Event(column=Column.PRO, payload="from a"))
+    a.flush()
+    assert [e.payload for e in b.get(sid).pro] == ["from a"]
+
+    b.append_event(sid, Event(column=Column.CON, payload="from b"))
+    b.flush()
+    st_a = a.get(sid)
+    assert [e.payload for e in st_a.pro] == ["from a"]      # own event not replayed twice
+    assert [e.payload for e in st_a.con] == ["from b"]
+    assert b.get(sid) is st_b                                # hot copy updated in place
+
+def test_two_workers_never_share_a_seq(db_path):
+    # long intervals: the test decides when each worker flushes
+    a = SqliteSessionStore(db_path, flush_interval_s=30)
+    b = SqliteSessionStore(db_path, flush_interval_s=30)
+    sid = a.create(mode=Mode.debate_counter)
+    b.get(sid)
+
+    a.append_event(sid, Event(column=Column.CON, payload="a1"))
+    b.append_event(sid, Event(column=Column.CON, payload="b1"))
+    a.append_event(sid, Event(column=Column.CON, payload="a2"))
+    b.add_sources(sid, [Source(title="B", url="https://e.org/b")])
+    b.flush()
+    seen = b.export_columns(sid)  # a client of b: b1 and the source, before a's writes land
+    assert [e.payload for e in seen.CON] == ["b1"] and seen.seq == 2
+    a.flush()
+    a.add_sources(sid, [Source(title="A", url="https://e.org/a")])
+
+    for store in (a, b):
+        cols = store.export_columns(sid)
+        assert [(e.payload, e.seq) for e in cols.CON] == [("b1", 1), ("a1", 3), ("a2", 4)]
+        assert [(s.url, s.seq) for s in cols.SOURCES] == [("https://e.org/b", 2), ("https://e.org/a", 5)]
+        assert cols.seq == 5 and store.settled(sid).seq == 5  # same seq, same history: one ETag
+        delta = store.export_columns(sid, since=seen.seq)
+        assert [e.payload for e in delta.CON] == ["a1", "a2"]
+        assert [s.url for s in delta.SOURCES] == ["https://e.org/a"]
+
+def test_writes_are_batched_behind(db_path):
+    store = SqliteSessionStore(db_path, flush_interval_s=0.05)
+    sid = store.create(mode=Mode.debate_counter)
+    for i in range(50):
+        store.append_event(sid, Event(column=Column.CON, payload=str(i)))
+    assert len(store._pending_log) == 50   # nothing hit the disk yet
+    deadline = time.time() + 2
+    while store._pending_log and time.time() < deadline:
+        time.sleep(0.01)
+    assert store._pending_log == []
+    assert len(SqliteSessionStore(db_path).get(sid).con) == 50
+
+@pytest.mark.parametrize("error", [sqlite3.OperationalError("database is locked"), ValueError("bad row")])
+def test_failed_flush_is_retried_without_new_writes(db_path, error):
+    store = SqliteSessionStore(db_path, flush_interval_s=0.01)
+    real_flush, calls = store.flush, []
+
+    def flaky_flush():
+        calls.append(1)
+        if len(calls) == 1:
+            raise error
+        return real_flush()
+
+    store.flush = flaky_flush
+    sid = store.create(mode=Mode.debate_counter)
+    store.append_event(sid, Event(column=Column.CON, payload="kept"))
+    deadline = time.time() + 2
+    while store._pending_log and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) >= 2 and store._pending_log == []
+    assert [e.payload for e in SqliteSessionStore(db_path).get(sid).con] == ["kept"]
+
+def test_request_path_never_waits_on_the_write_lock(db_path):
+    store = SqliteSessionStore(db_path, flush_interval_s=0.01, max_batch=2, settle_timeout_s=0.2)
+    sid = store.create(mode=Mode.debate_counter)
+    other = sqlite3.connect(db_path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another worker holds the write lock
+    try:
+        t0 = time.time()
+        for i in range(3):  # past max_batch
+            store.append_event(sid, Event(column=Column.CON, payload=str(i)))
+        store._hot.pop(sid)  # evicted with its writes still queued
+        assert [e.payload for e in store.get(sid).con] == ["0", "1", "2"]
+        assert [e.payload for e in store.export_columns(sid).CON] == ["0", "1", "2"]
+        assert time.time() - t0 < 2
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    deadline = time.time() + 5
+    while store._dirty and time.time() < deadline:
+        time.sleep(0.01)
+    assert [e.payload for e in SqliteSessionStore(db_path).get(sid).con] == ["0", "1", "2"]
+
+def test_failed_push_is_not_a_failed_flush(db_path):
+    store = SqliteSessionStore(db_path, flush_interval_s=0.01)
+
+    def broken_push(sids, before):
+        raise RuntimeError("loop closed")
+
+    store._push = broken_push
+    sid = store.create(mode=Mode.debate_counter)
+    store.append_event(sid, Event(column=Column.CON, payload="a"))
+    assert store.flush() == 1 and store._pending_log == []
+    store.append_event(sid, Event(column=Column.CON, payload="b"))
+    deadline = time.time() + 2
+    while store._dirty and time.time() < deadline:
+        time.sleep(0.01)
+    assert [e.payload for e in SqliteSessionStore(db_path).get(sid).con] == ["a", "b"]
+
+class _Clock:
+    def __init__(self):
+        self.t = 1000.0
+    def __call__(self):
+        return self.t
+
+def test_idle_sessions_expire():
+    clock = _Clock()
+    store = InMemorySessionStore(idle_ttl_s=60, clock=clock)
+    old = store.create(mode=Mode.debate_counter)
+    clock.t += 50
+    fresh = store.create(mode=Mode.debate_counter)
+    store.get(old)  # touching keeps it alive
+    clock.t += 59
+    assert store.sweep() == 0
+    clock.t += 2
+    evicted = SESSIONS_EVICTED.value(reason="idle")
+    assert store.sweep() == 2
+    assert SESSIONS_EVICTED.value(reason="idle") == evicted + 2
+    assert len(store) == 0
+    with pytest.raises(KeyError):
+        store.get(fresh)
+
+def test_lru_sessions_go_over_the_byte_budget():
+    clock = _Clock()
+    store = InMemorySessionStore(max_bytes=20_000, clock=clock)
+    sids = []
+    for i in range(4):
+        clock.t += 1
+        sid = store.create(mode=Mode.debate_counter)
+        store.append_event(sid, Event(column=Column.CON, payload="x" * 3000))
+        sids.append(sid)
+    clock.t += 1
+    store.get(sids[0])  # most recently used now
+    assert store.bytes > 20_000
+    assert store.sweep() == 1
+    assert set(store._by_id) == {sids[0], sids[2], sids[3]}
+    assert store.bytes <= 20_000
+    assert SESSION_BYTES.value() == store.bytes
+
+def test_growth_during_a_sweep_is_not_lost():
+    clock = _Clock()
+    store = InMemorySessionStore(max_bytes=10_000, clock=clock)
+    old = store.create(mode=Mode.debate_counter)
+    store.append_event(old, Event(column=Column.CON, payload="x" * 3000))
+    clock.t += 1
+    live = store.create(mode=Mode.debate_counter)
+    store.append_event(live, Event(column=Column.CON, payload="x" * 3000))
+    evict = store._evict
+
+    def evict_while_a_request_writes(sid, e, reason):
+        # lands after the sweeper has totalled the live sessions
+        store.append_event(live, Event(column=Column.CON, payload="y" * 5000))
+        return evict(sid, e, reason)
+
+    store._evict = evict_while_a_request_writes
+    assert store.sweep() == 1 and old not in store._by_id
+    assert store.bytes >= store._by_id[live].bytes
@@ -0,0 +1,61 @@
+import pytest
+
+from agents.tools.research import to_sources
+from core.schemas import EvidenceTag, Mode, Source, SourceReliability
+from core.session_sqlite import SqliteSessionStore
+from core.state import InMemorySessionStore
+from core.utils.urls import canonical_url
+
+def test_canonical_url():
+    assert canonical_url("HTTPS://Example.ORG:443/a/b/?utm_source=x&b=2&a=1&fbclid=z#top") == \
+        "https://example.org/a/b?a=1&b=2"
+    assert canonical_url("http://example.org/") == canonical_url("http://EXAMPLE.org") == "http://example.org"
+    assert canonical_url("http://example.org:8080/x") == "http://example.org:8080/x"
+    assert canonical_url("not a url") == "not a url"
+
+@pytest.mark.parametrize("make", [lambda p: InMemorySessionStore(), lambda p: SqliteSessionStore(p)])
+def test_sources_are_merged_by_canonical_url(make, tmp_path):
+    store = make(str(tmp_path / "s.sqlite"))
+    sid = store.create(mode=Mode.debate_counter)
+    first = store.add_sources(sid, [Source(title="A", url="https://example.org/a"),
+                                    Source(title="B", url="https://example.org/b")])
+    again = store.add_sources(sid, [Source(title="A again", url="https://EXAMPLE.org/a/?utm_medium=mail",
+                                           tag=EvidenceTag.refuted),
+                                    Source(title="C", url="https://example.org/c")])
+    assert again[0] == first[0]
+    cols = store.export_columns(sid)
+    assert [s.url for s in cols.SOURCES] == ["https://example.org/a", "https://example.org/b", "https://example.org/c"]
+    merged = store.get_source(sid, first[0])
+    assert merged.title == "A" and merged.tag == EvidenceTag.refuted
+    assert merged.reliability == SourceReliability.medium
+    assert store.get_source(sid, "S-missing") is None
+
+def test_sqlite_replay_keeps_the_registry(tmp_path):
+    path = str(tmp_path / "s.sqlite")
+    a = SqliteSessionStore(path)
+    sid = a.create(mode=Mode.debate_counter)
+    sids = a.add_sources(sid, [Source(title="A", url="https://example.org/a")])
+    a.add_sources(sid, [Source(title="A", url="https://example.org/a/", note="later")])
+    a.close()
+    b = SqliteSessionStore(path)
+    assert [s.sid for s in b.export_columns(sid).SOURCES] == sids
+    assert b.get_source(sid, sids[0]).note == "later"
+
+def test_classifier_output_to_sources():
+    out = to_sources([{"url": "https://e.org/x", "supports": "supports", "reliability": "high", "tag": "✅",
+                       "note": "n"}, {"url": ""}, "junk"])
+    assert len(out) == 1
+    assert (out[0].reliability, out[0].tag, out[0].note) == (SourceReliability.high, EvidenceTag.corroborated, "n")
+
+def test_sqlite_replay_keeps_sequence_numbers(tmp_path):
+    from core.schemas import Column, Event
+    path = str(tmp_path / "s.sqlite")
+    a = SqliteSessionStore(path)
+    sid = a.create(mode=Mode.debate_counter)
+    a.append_event(sid, Event(column=Column.PRO, payload="claim"))
+    a.add_sources(sid, [Source(title="A", url="https://example.org/a")])
+    a.add_sources(sid, [Source(title="A", url="https://example.org/a", note="later")])
+    a.close()
+    delta = SqliteSessionStore(path).export_columns(sid, since=1)
+    assert delta.seq == 3 and delta.PRO == []
+    assert [(s.seq, s.note) for s in delta.SOURCES] == [(3, "later")]
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from bench.text_utils import (BULLETS, RANKED, REPLIES, legacy_format_bullets, legacy_format_ranked,
+                              legacy_json_load_safe)
+from core.utils.utils import format_bullets, format_ranked, json_load_safe
+
+_FUZZ_ALPHABET = ['{', '}', '[', ']', '"', '`', '```', '```json', '```JSON', ':', ',', ' ', '\n', '\t', '1', 'a',
+                  'json', '{"a": 1}', '[1, 2]', '- ', '• ', '* ', '– ', '— ', 'null', '\\', ' ']
+
+def _fuzz(seed: int, n: int = 2000):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield "".join(rng.choice(_FUZZ_ALPHABET) for _ in range(rng.randint(0, 24)))
+
+@pytest.mark.parametrize("name", list(REPLIES))
+def test_json_load_safe_matches_previous_implementation(name):
+    text = REPLIES[name]
+    assert repr(json_load_safe(text)) == repr(legacy_json_load_safe(text))
+
+def test_json_load_safe_matches_on_fuzzed_replies():
+    for text in _fuzz(0):
+        assert repr(json_load_safe(text)) == repr(legacy_json_load_safe(text)), text
+
+def test_json_load_safe_extracts_first_opener_to_last_closer():
+    assert json_load_safe("```json\n{\"a\": [1]}\n```") == {"a": [1]}
+    assert json_load_safe("Sure! [1, 2] done") == [1, 2]
+    assert json_load_safe("note {x} then {\"a\": 1}") == {}  # span starts at {x}
+    assert json_load_safe("[ then {\"a\": 1}") == {"a": 1}  # the [ has no closer
+    assert json_load_safe("") == {} and json_load_safe("{" * 10_000) == {}
+
+@pytest.mark.parametrize("name", list(BULLETS))
+def test_format_bullets_is_byte_identical(name):
+    assert format_bullets(BULLETS[name]) == legacy_format_bullets(BULLETS[name])
+
+def test_format_bullets_is_byte_identical_on_fuzzed_bullets():
+    rng = random.Random(1)
+    fuzz = list(_fuzz(1, 400))
+    for _ in range(200):
+        bullets = rng.sample(fuzz, rng.randint(0, 6))
+        assert format_bullets(bullets) == legacy_format_bullets(bullets)
+        assert format_bullets(iter(bullets)) == legacy_format_bullets(iter(bullets))
+    assert format_bullets([]) == "" and format_bullets(None) == ""
+
+@pytest.mark.parametrize("name", list(RANKED))
+def test_format_ranked_is_byte_identical(name):
+    assert format_ranked(RANKED[name]) == legacy_format_ranked(RANKED[name])
+    assert format_ranked(None) == legacy_format_ranked(None) == ""
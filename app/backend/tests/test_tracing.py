@@ -0,0 +1,77 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from core.telemetry import tracing
+from core.telemetry.tracing import TraceBuffer, span, trace, traced
+
+def _names(node):
+    return [node["name"]] + [n for c in node["children"] for n in _names(c)]
+
+def _find(node, name):
+    if node["name"] == name:
+        return node
+    return next((f for c in node["children"] if (f := _find(c, name))), None)
+
+def test_turn_trace_is_served_as_a_span_tree(client):
+    sid = client.post("/api/session?mode=debate_counter").json()["session_id"]
+    client.post("/api/chat", json={"session_id": sid, "user_text": "My claim: banning cash will reduce crime."})
+    out = client.post("/api/chat", json={"session_id": sid, "user_text": "evaluate it"}).json()
+    r = client.get(f"/api/_debug/traces/{out['turn_id']}")
+    assert r.status_code == 200
+    root = r.json()["root"]
+    assert root["name"] == "turn" and root["attrs"]["session_id"] == sid and root["duration_ms"] > 0
+    executor = _find(root, "executor")
+    assert {c["name"] for c in executor["children"]} == {"step:fallacies", "step:work"}
+    assert all(c["duration_ms"] <= executor["duration_ms"] for c in executor["children"])
+    assert out["turn_id"] in {t["trace_id"] for t in client.get("/api/_debug/traces").json()["traces"]}
+    assert client.get("/api/_debug/traces/nope").status_code == 404
+
+def test_spans_follow_tasks_and_threads():
+    pool = ThreadPoolExecutor(1)
+
+    def blocking(name):
+        with span(name):
+            pass
+
+    @traced("child")
+    async def child():
+        await asyncio.gather(asyncio.to_thread(blocking, "to_thread"),
+                             asyncio.get_running_loop().run_in_executor(
+                                 pool, contextvars.copy_context().run, blocking, "pool"))
+
+    async def run():
+        with trace("root") as root:
+            await asyncio.gather(child(), asyncio.create_task(child()))
+        return root.trace_id
+
+    tree = tracing.buffer.tree(asyncio.run(run()))
+    root = tree["root"]
+    assert [c["name"] for c in root["children"]] == ["child", "child"]
+    assert all(sorted(_names(c)) == ["child", "pool", "to_thread"] for c in root["children"])
+    # outside a trace spans are free no-ops
+    with span("orphan") as s:
+        s.set(x=1)
+    assert tracing.current_trace_id() is None
+
+def test_errors_mark_spans_and_buffer_is_bounded():
+    buf = TraceBuffer(max_traces=2, max_spans=3)
+    tracing_buffer, tracing.buffer = tracing.buffer, buf
+    try:
+        ids = []
+        for i in range(3):
+            try:
+                with trace("t") as root:
+                    ids.append(root.trace_id)
+                    for _ in range(5):
+                        with span("s"):
+                            pass
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+    finally:
+        tracing.buffer = tracing_buffer
+    assert buf.tree(ids[0]) is None
+    tree = buf.tree(ids[2])
+    assert tree["spans"] == 3 and _names(tree["root"]) == ["t", "s", "s"]
+    assert tree["root"]["status"] == "error" and tree["root"]["attrs"]["error"] == "RuntimeError: boom"
@@ -0,0 +1,86 @@
+import asyncio
+
+from core.schemas import ChatIn, Mode
+from core.state import InMemorySessionStore
+from core.turn import TurnContext
+from services.chat_loop import run_chat_turn
+
+def test_concurrent_requests_share_one_call():
+    calls = []
+
+    async def extract(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return {"original_text": text, "normalized": text}
+
+    async def run():
+        ctx = TurnContext()
+        a, b = await asyncio.gather(ctx.once("extract", "x", extract, "x"), ctx.once("extract", "x", extract, "x"))
+        return ctx, a, b
+
+    ctx, a, b = asyncio.run(run())
+    assert a == b and calls == ["x"]
+    assert ctx.stats() == {"computed": {"extract": 1}, "avoided": {"extract": 1}, "calls_avoided": 1}
+
+def test_failed_artifact_is_not_memoized():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("provider hiccup")
+        return "ok"
+
+    async def run():
+        ctx = TurnContext()
+        try:
+            await ctx.once("triage", "k", flaky)
+        except RuntimeError:
+            pass
+        return await ctx.once("triage", "k", flaky)
+
+    assert asyncio.run(run()) == "ok"
+    assert len(attempts) == 2
+
+def test_deferred_artifact_runs_only_when_asked():
+    calls = []
+
+    async def packed(key):
+        calls.append(("packed", key))
+        return "from pack"
+
+    async def own(key):
+        calls.append(("own", key))
+        return "own"
+
+    async def run():
+        ctx = TurnContext()
+        ctx.defer("score", "a", packed, "a")
+        ctx.defer("score", "b", packed, "b")
+        await asyncio.sleep(0)
+        return await ctx.once("score", "a", own, "a"), await ctx.once("score", "c", own, "c")
+
+    assert asyncio.run(run()) == ("from pack", "own")
+    assert calls == [("packed", "a"), ("own", "c")]
+
+def test_new_claim_is_extracted_once_per_turn(monkeypatch):
+    from services import chat_loop
+    from agents.supervisor import supervisor_agent
+
+    calls = []
+
+    async def extract(user_text):
+        calls.append(user_text)
+        return {"original_text": user_text, "normalized": "banning cash will reduce crime"}
+
+    monkeypatch.setattr(chat_loop, "extract_claim_or_empty", extract)
+    monkeypatch.setattr(supervisor_agent, "extract_claim_or_empty", extract)
+
+    store = InMemorySessionStore()
+    sid = store.create(mode=Mode.debate_counter)
+    ctx = TurnContext()
+    out = asyncio.run(run_chat_turn(ChatIn(session_id=sid, user_text="My claim: banning cash will reduce crime."), store, ctx))
+
+    assert len(out.events) == 1
+    assert len(calls) == 1
+    assert ctx.avoided["extract"] == 1
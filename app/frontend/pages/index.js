@@ -65,6 +65,22 @@ export default function Home() {
     if (newId) await refreshColumns(newId);
   }
 
+  // Column deltas pushed by /columns/stream: since=0 is a full snapshot,
+  // otherwise new PRO/CON events and added/updated sources (by sid).
+  const liveColumns = useRef(false);
+  const mergeColumns = (prev, d) => {
+    if (!d.since) {
+      return { PRO: d.PRO || [], CON: d.CON || [], SOURCES: d.SOURCES || [] };
+    }
+    const bySid = new Map(prev.SOURCES.map((s) => [s.sid, s]));
+    for (const s of d.SOURCES || []) bySid.set(s.sid, s);
+    return {
+      PRO: [...prev.PRO, ...(d.PRO || [])],
+      CON: [...prev.CON, ...(d.CON || [])],
+      SOURCES: [...bySid.values()],
+    };
+  };
+
   async function refreshColumns(forId) {
     const id = forId ?? sessionId;
     if (!id) return;
@@ -115,13 +131,43 @@ export default function Home() {
         reply = `⚠️ Chat failed: ${await response.text()}`;
       }
       setChat((prev) => [...prev, { role: "assistant", text: reply }]);
-      await refreshColumns();
+      if (!liveColumns.current) await refreshColumns();
     } catch (e) {
       setChat((prev) => [...prev, { role: "assistant", text: `⚠️ Chat error: ${String(e)}` }]);
-      await refreshColumns();
+      if (!liveColumns.current) await refreshColumns();
     }
   }
 
+  // Subscribe to column updates for the current session; fall back to
+  // refreshing after each reply while the stream is down.
+  useEffect(() => {
+    if (!sessionId || typeof EventSource === "undefined") return;
+    let seq = 0;
+    let es = null;
+    let closed = false;
+    const open = () => {
+      es = new EventSource(`${API}/columns/stream?session_id=${encodeURIComponent(sessionId)}&since=${seq}`);
+      es.addEventListener("columns", (msg) => {
+        const d = JSON.parse(msg.data);
+        liveColumns.current = true;
+        seq = d.seq;
+        setColumns((prev) => mergeColumns(prev, d));
+      });
+      es.onerror = () => {
+        liveColumns.current = false;
+        es.close();
+        if (!closed) setTimeout(open, 2000); // resume from the last seq we saw
+      };
+    };
+    open();
+    return () => {
+      closed = true;
+      liveColumns.current = false;
+      if (es) es.close();
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [sessionId]);
+
   // Start session once
   useEffect(() => {
     newSession(mode);